@@ -17,6 +17,7 @@ from utils.valorant.local import LocalErrorResponse
 from utils.valorant.useful import JSON
 from utils import locale_v2
 from utils.valorant.cache import get_cache
+from utils.valorant.emojis import registry as emoji_registry
 import utils.config as Config
 
 load_dotenv()
@@ -65,6 +66,9 @@ class ValorantBot(commands.Bot):
         print(f"[{datetime.datetime.now()}] Valorant Bot is ready !")
         print(f"[{datetime.datetime.now()}] Version: {self.bot_version}")
 
+        # guild emojis are only known once the bot is ready
+        emoji_registry.invalidate()
+
         config = Config.LoadConfig()
 
         # bot presence
@@ -83,6 +87,9 @@ class ValorantBot(commands.Bot):
             ).set_author(icon_url=self.user.display_avatar.url, name = self.user)
             await owner.send(embed=embed)
 
+    async def on_guild_emojis_update(self, guild: discord.Guild, before, after) -> None:
+        emoji_registry.invalidate()
+    
     async def setup_hook(self) -> None:
         if self.session is None:
             self.session = aiohttp.ClientSession()
@@ -111,9 +118,8 @@ class ValorantBot(commands.Bot):
     
     @staticmethod
     def setup_cache() -> None:
-        try:
-            open('data/cache.json')
-        except FileNotFoundError:
+        # a shipped catalog snapshot is enough to start serving, the cache is refreshed in the background
+        if not os.path.exists('data/cache.json') and not os.path.exists('data/catalog/snapshot.bin'):
             get_cache(bot_option["version"])
         
         try:
@@ -14,10 +14,10 @@ from utils.checks import owner_only
 from utils.valorant.embed import GetEmbed, Embed
 from utils.valorant.local import ResponseLanguage
 from bot import bot_option
-from utils.valorant.useful import JSON, GetFormat, load_file, GetEmoji, format_relative
+from utils.valorant.useful import JSON, GetFormat, load_file, format_relative
 import utils.config as Config
 
-clocal = ResponseLanguage("", JSON.read("config", dir="config").get("command-description-language", "en-US"))
+clocal = ResponseLanguage("", Config.LoadConfig().get("command-description-language", "en-US"))
 
 if TYPE_CHECKING:
     from bot import ValorantBot
@@ -262,7 +262,7 @@ class Admin(commands.Cog):
         embed = Embed(title=response.get("TITLE"))
         description = ""
         for name in emojis.keys():
-            e: discord.Emoji = GetEmoji.get(name, self.bot)
+            e: discord.Emoji = discord.utils.get(self.bot.emojis, name=name)
             if len(description)!=0:
                 description+="\n"
             d = response.get("RESPONSE").format(name=e.name, emoji=e, date=format_relative(e.created_at), server=e.guild.name, id=e.id)
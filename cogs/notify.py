@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import traceback
 from datetime import datetime, time, timedelta, timezone
 import dateutil.parser
-from difflib import get_close_matches
-from typing import Literal, Tuple, Any, TYPE_CHECKING
+from typing import Literal, Dict, List, Optional, Tuple, Any, TYPE_CHECKING
 
 # Standard
 import discord
@@ -15,142 +15,220 @@ from utils.errors import (
     ValorantBotError,
     AuthenticationError
 )
+import utils.config as Config
 from utils.config import GetColor
 from utils.locale_v2 import ValorantTranslator
-from utils.valorant import view as View
+from utils.valorant import search as Search, view as View
+from utils.valorant.articles import ArticlePoller, article_locales, locale_shards
 from utils.valorant.cache import create_json
+from utils.valorant.catalog import get_catalog
 from utils.valorant.db import DATABASE
 from utils.valorant.embed import Embed, GetEmbed
 from utils.valorant.endpoint import API_ENDPOINT
+from utils.valorant.fanout import Fanout, record_run
+from utils.valorant.outbox import Dispatcher, Outbox, global_rate, outbox
 from utils.valorant.local import ResponseLanguage, LocalErrorResponse
+from utils.valorant.resources import region_shard_override
 from utils.valorant.useful import (format_relative, GetEmoji, GetItems, JSON, load_file)
 
 VLR_locale = ValorantTranslator()
-clocal = ResponseLanguage("", JSON.read("config", dir="config").get("command-description-language", "en-US"))
+clocal = ResponseLanguage("", Config.LoadConfig().get("command-description-language", "en-US"))
 
 if TYPE_CHECKING:
     from bot import ValorantBot
 
 
 class Notify(commands.Cog):
-    def __init__(self, bot: ValorantBot) -> None:
+    def __init__(self, bot: ValorantBot, shards: Optional[List[str]] = None, box: Outbox = outbox, rate: float = global_rate) -> None:
         self.bot: ValorantBot = bot
         self.endpoint: API_ENDPOINT = None
         self.db: DATABASE = None
-        self.notifys.start()
+        self.dispatcher: Dispatcher = None
+        
+        # riot shards handled here, None for all of them
+        self.shards: Optional[List[str]] = shards
+        self.outbox: Outbox = box
+        self.rate: float = rate
+        self.article_poller: ArticlePoller = ArticlePoller([locale for locale in article_locales if self.owns(locale_shards[locale])])
+    
+    async def cog_load(self) -> None:
+        # notifications may come from a notifier worker, their buttons are answered here
+        self.bot.add_dynamic_items(View.RemoveNotifyButton)
     
     def cog_unload(self) -> None:
+        self.bot.remove_dynamic_items(View.RemoveNotifyButton)
         self.notifys.cancel()
         self.reload_article.cancel()
         self.check_auth.cancel()
+        if self.dispatcher is not None:
+            self.dispatcher.stop()
     
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         self.db = DATABASE()
         self.endpoint = API_ENDPOINT()
-        self.reload_article.start()
-        self.check_auth.start()
+        
+        # a notifier worker runs the pipelines instead
+        if not Config.LoadConfig().get("notify", {}).get("worker", False):
+            self.start_pipelines()
+    
+    def start_pipelines(self) -> None:
+        """ Start the notify, auth check and article pipelines and the delivery of their messages """
+        if self.db is None:
+            self.db = DATABASE()
+        if self.endpoint is None:
+            self.endpoint = API_ENDPOINT()
+        if self.dispatcher is None:
+            self.dispatcher = Dispatcher(self.bot, self.outbox, rate=self.rate)
+            self.dispatcher.views["notify"] = self.notify_view
+            self.dispatcher.start()
+        for loop in (self.notifys, self.reload_article, self.check_auth):
+            if not loop.is_running():
+                loop.start()
+    
+    def owns(self, region: Optional[str]) -> bool:
+        """ Whether a region or shard is handled by this process """
+        if self.shards is None:
+            return True
+        return region_shard_override.get(region, region) in self.shards
     
-    async def get_endpoint_and_data(self, user_id: int) -> Tuple[API_ENDPOINT, Any]:
+    def owns_user(self, user: Dict[str, Any]) -> bool:
+        """ Whether the active account of a user is handled by this process """
+        return self.owns(user.get("auth", {}).get(user.get("active"), {}).get("region"))
+    
+    @staticmethod
+    def notify_view(spec: Dict[str, Any]) -> View.NotifyView:
+        """ Rebuild the remove button of a queued skin notification """
+        return View.NotifyView(spec["user_id"], spec["uuid"], spec["name"], ResponseLanguage('notify_add', spec["locale"]))
+    
+    async def get_endpoint_and_data(self, user_id: int, endpoint: API_ENDPOINT = None) -> Tuple[API_ENDPOINT, Any]:
         data = await self.db.is_data(user_id, 'en-US')
-        endpoint = self.endpoint
+        endpoint = endpoint or self.endpoint
         endpoint.activate(data)
         return endpoint, data
     
+    @staticmethod
+    def notify_error(user_id: str, e: Exception) -> str:
+        """ Log a failed notification, returns its failure category """
+        if isinstance(e, (KeyError, FileNotFoundError)):
+            print(f'{user_id} is not in notify list')
+            return "not_registered"
+        if isinstance(e, Forbidden):
+            print("Bot don't have perm send notification message.")
+            return "forbidden"
+        if isinstance(e, HTTPException):
+            print("Bot Can't send notification message.")
+            return "http"
+        print(e)
+        traceback.print_exception(type(e), e, e.__traceback__)
+        return type(e).__name__
+    
     async def send_notify(self) -> None:
-        notify_users = self.db.get_user_is_notify()
         user_data = JSON.read('users')
+        notify_users = [user_id for user_id in self.db.get_user_is_notify() if self.owns_user(user_data.get(user_id, {}))]
         notify_data = JSON.read('notifys')
+        config = Config.LoadConfig()
+        default_language = config.get("default-language", "en-US")
+        notify_config = config.get("notify", {})
+        
+        watched: Dict[str, List[str]] = {}
+        for skin in notify_data:
+            watched.setdefault(skin['id'], [])
+            if skin['uuid'] not in watched[skin['id']]:
+                watched[skin['id']].append(skin['uuid'])
+        
+        async def prepare(user_id: str) -> Optional[Tuple[int, Any]]:
+            # endpoint, one per user as users are prepared side by side
+            endpoint, data = await self.get_endpoint_and_data(int(user_id), API_ENDPOINT())
+            
+            # offer
+            loop = asyncio.get_running_loop()
+            offer = await loop.run_in_executor(None, endpoint.store_fetch_storefront)
+            skin_offer_list = offer["SkinsPanelLayout"]["SingleItemOffers"]
+            
+            # users whose watched skins are in the store go first
+            if data['notify_mode'] == 'Specified':
+                skin_notify_list = [uuid for uuid in watched.get(str(user_id), []) if uuid in skin_offer_list]
+                if len(skin_notify_list) == 0:
+                    return None
+                return 0, (endpoint, data, offer, skin_notify_list)
+            elif data['notify_mode'] == 'All':
+                return 1, (endpoint, data, offer, None)
+            return None
         
-        for user_id in notify_users:
-            try:
-                
-                # endpoint
-                endpoint, data = await self.get_endpoint_and_data(int(user_id))
-                
-                # offer
-                offer = endpoint.store_fetch_storefront()
-                skin_offer_list = offer["SkinsPanelLayout"]["SingleItemOffers"]
-                duration = offer["SkinsPanelLayout"]["SingleItemOffersRemainingDurationInSeconds"]
-                
-                # author
-                author = self.bot.get_user(int(user_id)) or await self.bot.fetch_user(int(user_id))
-                channel_send = author if data['dm_message'] else self.bot.get_channel(int(data['notify_channel']))
-                
-                # get guild language
-                default_language = JSON.read("config", dir="config").get("default-language", "en-US")
-                guild_locale = user_data.get(user_id, {}).get("lang", default_language)
-                #get_guild_locale = [guild.preferred_locale for guild in self.bot.guilds if channel_send in guild.channels]
-                #if len(get_guild_locale) > 0:
-                #    guild_locale = guild_locale[0]
-                response = ResponseLanguage('notify_send', guild_locale)
-                
-                user_skin_list = [skin for skin in notify_data if skin['id'] == str(user_id)]
-                user_skin_list_uuid = [skin['uuid'] for skin in notify_data if skin['id'] == str(user_id)]
-                
-                if data['notify_mode'] == 'Specified':
-                    skin_notify_list = list(set(skin_offer_list).intersection(set(user_skin_list_uuid)))
-                    for noti in user_skin_list:
-                        if noti['uuid'] in skin_notify_list:
-                            uuid = noti['uuid']
-                            skin = GetItems.get_skin(uuid)
-                            name = skin['names'][guild_locale]
-                            icon = skin['icon']
-                            emoji = GetEmoji.tier_by_bot(uuid, self.bot)
-                            
-                            notify_send: str = response.get('RESPONSE_SPECIFIED')
-                            duration = format_relative(datetime.utcnow() + timedelta(seconds=duration))
-                            
-                            embed = Embed(notify_send.format(emoji=emoji, name=name, duration=duration))
-                            embed.set_thumbnail(url=icon)
-                            view = View.NotifyView(user_id, uuid, name, ResponseLanguage('notify_add', guild_locale))
-                            view.message = await channel_send.send(content=f'||{author.mention}||', embed=embed, view=view)
-                
-                elif data['notify_mode'] == 'All':
-                    embeds = GetEmbed.notify_all_send(endpoint.player, offer, response, guild_locale, self.bot)
-                    await channel_send.send(content=f'||{author.mention}||', embeds=embeds)
+        async def deliver(user_id: str, payload: Tuple[API_ENDPOINT, Any, Dict, Optional[List[str]]]) -> None:
+            endpoint, data, offer, skin_notify_list = payload
+            duration = offer["SkinsPanelLayout"]["SingleItemOffersRemainingDurationInSeconds"]
             
-            except (KeyError, FileNotFoundError):
-                print(f'{user_id} is not in notify list')
-            except Forbidden:
-                print("Bot don't have perm send notification message.")
-                continue
-            except HTTPException:
-                print("Bot Can't send notification message.")
-                continue
-            except Exception as e:
-                print(e)
-                traceback.print_exception(type(e), e, e.__traceback__)
-                continue
+            # destination, sent later by the dispatcher
+            target = dict(dm=bool(data['dm_message']), channel_id=None if data['dm_message'] else int(data['notify_channel']))
+            mention = f'||<@{user_id}>||'
+            
+            # get guild language
+            guild_locale = user_data.get(user_id, {}).get("lang", default_language)
+            #get_guild_locale = [guild.preferred_locale for guild in self.bot.guilds if channel_send in guild.channels]
+            #if len(get_guild_locale) > 0:
+            #    guild_locale = guild_locale[0]
+            response = ResponseLanguage('notify_send', guild_locale)
+            
+            if skin_notify_list is not None:
+                for uuid in skin_notify_list:
+                    skin = GetItems.get_skin(uuid)
+                    name = skin['names'][guild_locale]
+                    icon = skin['icon']
+                    emoji = GetEmoji.tier_by_bot(uuid, self.bot)
+                    
+                    notify_send: str = response.get('RESPONSE_SPECIFIED')
+                    relative = format_relative(datetime.utcnow() + timedelta(seconds=duration))
+                    
+                    embed = Embed(notify_send.format(emoji=emoji, name=name, duration=relative))
+                    embed.set_thumbnail(url=icon)
+                    view = dict(type="notify", user_id=user_id, uuid=uuid, name=name, locale=guild_locale)
+                    self.outbox.enqueue(user_id, f"notify:{uuid}", content=mention, embeds=[embed], view=view, priority=0, **target)
+            else:
+                embeds = GetEmbed.notify_all_send(endpoint.player, offer, response, guild_locale, self.bot)
+                self.outbox.enqueue(user_id, "notify", content=mention, embeds=embeds, **target)
+        
+        fanout = Fanout(
+            "notify",
+            concurrency=notify_config.get("concurrency", 8),
+            window=notify_config.get("spread-window", 300),
+            salt=datetime.utcnow().strftime("%Y-%m-%d")
+        )
+        # users who may have a watched skin in the store are checked first and their messages sent first
+        def urgent(user_id: str) -> bool:
+            return user_data.get(user_id, {}).get("notify_mode") == "Specified" and len(watched.get(str(user_id), [])) > 0
+        
+        run = await fanout.run(notify_users, prepare, deliver, self.notify_error, urgent)
+        record_run(run)
     
-    async def send_article(self, notify_list: list, language: str) -> None:
+    async def send_article(self, notify_list: list, article: Dict[str, Any]) -> None:
         user_data = JSON.read('users')
-        cache = JSON.read("article")
+        default_language = Config.LoadConfig().get("default-language", "en-US")
+
+        # fetch and summarize the article once, every recipient gets a copy
+        await asyncio.get_running_loop().run_in_executor(None, GetEmbed.article_template, article)
+
         for user_id in notify_list:
             try:
                 # language
-                default_language = JSON.read("config", dir="config").get("default-language", "en-US")
                 guild_locale = user_data[user_id].get("lang", default_language)
                 response = ResponseLanguage('notify_article', guild_locale)
 
-                # author
-                author = self.bot.get_user(int(user_id)) or await self.bot.fetch_user(int(user_id))
-                channel_send = author if user_data[user_id]['DM_Message'] else self.bot.get_channel(int(user_data[user_id]['notify_channel']))
+                # destination
+                dm = bool(user_data[user_id]['DM_Message'])
+                channel_id = None if dm else int(user_data[user_id]['notify_channel'])
 
                 # embed
-                article = cache[language][0]
                 embed = GetEmbed.article_embed(article, response)
 
-                await channel_send.send(embed=embed, content=f'||{author.mention}||')
+                self.outbox.enqueue(
+                    user_id, f"article:{article.get('url')}", dm=dm, channel_id=channel_id, content=f'||<@{user_id}>||', embeds=[embed],
+                    group=f"article:{article.get('url')}:{guild_locale}"
+                )
 
             except (KeyError, FileNotFoundError):
                 print(f'{user_id} is not in notify list')
-            except Forbidden:
-                print("Bot don't have perm send notification message.")
-                continue
-            except HTTPException:
-                print("Bot Can't send notification message.")
-                continue
             except Exception as e:
                 print(e)
                 traceback.print_exception(type(e), e, e.__traceback__)
@@ -165,24 +243,20 @@ class Notify(commands.Cog):
     
     @tasks.loop(minutes=20)
     async def reload_article(self) -> None:
-        cache = JSON.read("article")
-        languages_list = ["en-us", "en-gb", "de-de", "es-es", "es-mx", "fr-fr", "it-it", "ja-jp", "ko-kr", "pt-br", "ru-ru", "tr-tr", "vi-vn"]
+        new_articles = await self.article_poller.poll(self.bot.session)
 
-        for article_lang in languages_list:
-            data = API_ENDPOINT().fetch_article(country_code = article_lang)
-            if data!=None and type(data[0])==type({}):
-                if data[0].get("url") != cache.get(article_lang, [{}])[0].get("url"): # Is Update
-                    cache[article_lang] = data
-                    JSON.save("article", cache)
-                    
-                    userdata = JSON.read("users")
-                    notify_list = []
+        if new_articles:
+            userdata = JSON.read("users")
+            for article_lang, articles in new_articles.items():
+                subscribers = {
+                    user_id: values.get("ignore_article_category", []) for user_id, values in userdata.items()
+                    if values.get("lang", "en-US").lower() == article_lang and values.get("article", False)
+                }
+                for article in articles:
+                    notify_list = [user_id for user_id, ignored in subscribers.items() if article.get("category") not in ignored]
+                    await self.send_article(notify_list, article)
 
-                    for user_id,values in userdata.items():
-                        if values.get("lang", "en-US").lower() == article_lang and values.get("article", False) and (not data[0].get("category") in values.get("ignore_article_category", [])):
-                            notify_list.append(user_id)
-                    
-                    await self.send_article(notify_list, article_lang)
+        self.reload_article.change_interval(seconds=self.article_poller.next_interval())
     
     @tasks.loop(minutes=20)
     async def check_auth(self) -> None:
@@ -190,17 +264,18 @@ class Notify(commands.Cog):
 
         for user_id, user in users.items():
             if user.get("auth_notify", False):
-                author = self.bot.get_user(int(user_id)) or await self.bot.fetch_user(int(user_id))
                 local = LocalErrorResponse("AUTH", user.get("lang", "en-US"))
                 for uuid, account in user.get("auth", {}).items():
-                    if not account.get("notified_expire", False):
+                    if not account.get("notified_expire", False) and self.owns(account.get("region")):
                         cookie = account.get("cookie", {}).get("ssid")
                         try:
                             await self.db.auth.login_with_cookie(cookie)
                         except Exception as e:
-                            users[str(user_id)]["auth"][str(uuid)]["notified_expire"] = True
-                            self.db.insert_user(users)
-                            await author.send(embed=Embed(description=local.get("AUTO_CHECK").format(name=account.get("username"))))
+                            # other processes write users.json too, update the latest copy
+                            latest = self.db.read_db()
+                            latest.get(str(user_id), {}).get("auth", {}).get(str(uuid), {})["notified_expire"] = True
+                            self.db.insert_user(latest)
+                            self.outbox.enqueue(user_id, f"auth:{uuid}", embeds=[Embed(description=local.get("AUTO_CHECK").format(name=account.get("username")))])
         
     @notifys.before_loop
     async def before_daily_send(self) -> None:
@@ -231,17 +306,14 @@ class Notify(commands.Cog):
         create_json('notifys', [])
         
         # get cache
-        skin_data = self.db.read_cache()
+        skin_data = get_catalog()
         
         # find skin
-        skin_list = [skin_data['skins'][x]['names'][str(VLR_locale)] for x in skin_data['skins']]  # get skin list
-        skin_name = get_close_matches(skin, skin_list, 1)  # get skin close match
+        skin_uuid = Search.find_closest('skins', skin, str(VLR_locale))  # get skin close match
         
-        if skin_name:
+        if skin_uuid:
             notify_data = JSON.read('notifys')
             
-            find_skin = [x for x in skin_data['skins'] if skin_data['skins'][x]['names'][str(VLR_locale)] == skin_name[0]]
-            skin_uuid = find_skin[0]
             skin_source = skin_data['skins'][skin_uuid]
             
             name = skin_source['names'][str(VLR_locale)]
@@ -282,6 +354,10 @@ class Notify(commands.Cog):
         
         raise ValorantBotError(response.get('NOT_FOUND'))
     
+    @notify_add.autocomplete('skin')
+    async def notify_add_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return Search.choices('skins', current, str(VLR_locale))
+    
     @notify.command(name='list', description=clocal.get("notify_list", {}).get("DESCRIPTION", ""))
     # @dynamic_cooldown(cooldown_5s)
     async def notify_list(self, interaction: Interaction) -> None:
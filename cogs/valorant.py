@@ -1,22 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import datetime
 import dateutil.parser
-import math, os
+import math, os, time
 from difflib import SequenceMatcher
-from typing import Literal, TYPE_CHECKING  # noqa: F401
+from typing import Any, Dict, List, Literal, Optional, TYPE_CHECKING  # noqa: F401
 
 from discord import app_commands, Interaction, ui, File
 from discord.ext import commands, tasks
-from discord.utils import MISSING
+from discord.utils import format_dt, MISSING
 
 from utils.checks import owner_only
 from utils.errors import (
     AuthenticationError,
     ValorantBotError
 )
-from utils.valorant import cache as Cache, useful, view as View
+from utils.valorant import cache as Cache, pipeline, search as Search, useful, view as View
+from utils.valorant.catalog import get_catalog
 from utils.valorant.db import DATABASE
 from utils.valorant.embed import Embed, GetEmbed
 from utils.valorant.endpoint import API_ENDPOINT
@@ -28,7 +30,10 @@ import utils.config as Config
 from utils.drive import Drive
 
 VLR_locale = ValorantTranslator()
-clocal = ResponseLanguage("", JSON.read("config", dir="config").get("command-description-language", "en-US"))
+clocal = ResponseLanguage("", Config.LoadConfig().get("command-description-language", "en-US"))
+
+# seconds between updates of a /career message while matches come in
+career_edit_interval = 1.0
 
 if TYPE_CHECKING:
     from bot import ValorantBot
@@ -41,7 +46,6 @@ class ValorantCog(commands.Cog, name='Valorant'):
         self.bot: ValorantBot = bot
         self.endpoint: API_ENDPOINT = None
         self.db: DATABASE = None
-        self.config = Config.LoadConfig()
         Drive.download("data/users.json")
         Drive.download("data/notifys.json")
         Drive.download("data/emoji.json")
@@ -52,28 +56,65 @@ class ValorantCog(commands.Cog, name='Valorant'):
     def cog_unload(self) -> None:
         self.reload_cache.cancel()
     
-    def funtion_reload_cache(self, force=False) -> None:
-        """ Reload the cache """
+    @property
+    def config(self) -> Config.Settings:
+        return Config.LoadConfig()
+    
+    def funtion_reload_cache(self, force=False) -> Optional[List[str]]:
+        """ Reload the cache, returns the changed sections or None when nothing was checked """
+        cache = self.db.read_cache()
+        valorant_version = Cache.get_valorant_version()
+        bot_version = self.bot.bot_version
+        bot_updated = bot_version != cache.get("bot_version")
+        if valorant_version != cache.get('valorant_version') or (bot_updated and self.config.get("reset-cache-when-updated", False)) or force:
+            # a new bot version may transform sections differently, unchanged upstream hashes don't tell
+            changed = Cache.update_cache(bot_version, force=force or bot_updated)
+            Drive.backup("data/users.json")
+            Drive.backup("data/notifys.json")
+            Drive.backup("data/emoji.json")
+            print(f"[{datetime.datetime.now()}] *** Updated cache ***")
+            return changed
+    
+    async def refresh_cache(self, force=False) -> Optional[List[str]]:
+        """ Reload the cache in a worker thread, commands keep using the current catalog generation meanwhile """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.funtion_reload_cache, force)
+    
+    async def send_cache_changelog(self, changed: List[str]) -> None:
+        """ Send the changed cache sections to the bot owner """
         with contextlib.suppress(Exception):
-            cache = self.db.read_cache()
-            valorant_version = Cache.get_valorant_version()
-            bot_version = self.bot.bot_version
-            if valorant_version != cache['valorant_version'] or (bot_version != cache["bot_version"] and self.config.get("reset-cache-when-updated", False)) or force:
-                Cache.get_cache(bot_version)
-                cache = self.db.read_cache()
-                cache['bot_version'] = bot_version
-                cache['valorant_version'] = valorant_version
-                self.db.insert_cache(cache)
-                Drive.backup("data/users.json")
-                Drive.backup("data/notifys.json")
-                Drive.backup("data/emoji.json")
-                print(f"[{datetime.datetime.now()}] *** Updated cache ***")
+            user_id = int(self.config.get("owner-id"))
+            owner = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+            locale = self.config.get("command-description-language", "en-US")
+            cache = get_catalog()
+
+            embed = Embed(
+                LocalErrorResponse("CACHE_UPDATED", locale).format(
+                    version=cache.get("valorant_version", ""),
+                    sections=", ".join(f"`{section}`" for section in changed) if changed else "-"
+                )
+            )
+            await owner.send(embed=embed)
+
+    @staticmethod
+    def emoji_progress(interaction: Interaction):
+        """ Show the emoji setup progress in the deferred response """
+        async def progress(text: str) -> None:
+            await interaction.edit_original_response(embed=Embed(text))
+        return progress
 
-    
     @tasks.loop(minutes=30)
     async def reload_cache(self) -> None:
         """ Reload the cache every 30 minutes """
-        self.funtion_reload_cache()
+        try:
+            changed = await self.refresh_cache()
+        except Exception as e:
+            # the loop keeps running, the next check retries
+            print(e)
+            print(f"[{datetime.datetime.now()}] Can't reload cache.")
+            return
+        if changed is not None:
+            await self.send_cache_changelog(changed)
     
     @reload_cache.before_loop
     async def before_reload_cache(self) -> None:
@@ -264,7 +305,7 @@ class ValorantCog(commands.Cog, name='Valorant'):
         response = ResponseLanguage(interaction.command.name, interaction.locale)
 
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
         
         # endpoint
         endpoint = await self.get_endpoint(interaction.user.id, interaction.locale, username, password)
@@ -303,7 +344,7 @@ class ValorantCog(commands.Cog, name='Valorant'):
         response = ResponseLanguage(interaction.command.name, interaction.locale)
 
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
 
         # endpoint
         endpoint = await self.get_endpoint(interaction.user.id, interaction.locale, username, password)
@@ -392,14 +433,56 @@ class ValorantCog(commands.Cog, name='Valorant'):
         # data
         if matches<=0 or matches>match_limit:
             raise ValorantBotError(response.get('FAILED').format(limit=match_limit))
-        data = endpoint.fetch_match_history(index=20, queue=queue, not_found_error=False)
-        if len(data.get("Matches", [])) > matches:
-            data["Matches"] = data["Matches"][:matches]
+        data = endpoint.fetch_match_history(index=20, queue=queue, not_found_error=False) or {}
+        history = data.get("Matches", [])[:matches]
         
-        embeds = GetEmbed.career(endpoint.player, endpoint.puuid, data, response, endpoint, queue, self.bot)
-        
-        await interaction.followup.send(embeds=embeds, view=View.share_button(interaction, embeds) if is_private_message else MISSING)
+        await self.stream_career(interaction, endpoint, history, response, is_private_message)
         await self.check_update(interaction)
+    
+    async def stream_career(self, interaction: Interaction, endpoint: API_ENDPOINT, history: List[Dict], response: Dict, is_private_message: bool) -> None:
+        """ Build the matches side by side and show them as they complete, the summary comes last """
+        started = time.monotonic()
+        locale = str(VLR_locale)
+        results: List[Optional[List[Any]]] = [None] * len(history)
+        
+        async def build(i: int, match: Dict) -> None:
+            match_detail = await pipeline.fetch_match_details(endpoint, match["MatchID"])
+            results[i] = await pipeline.run_blocking(GetEmbed.career_match, match["MatchID"], match, response, endpoint, endpoint.puuid, locale, self.bot, match_detail)
+        
+        message = None
+        first_shown, last_edit = None, 0.0
+        builds = [asyncio.create_task(build(i, match)) for i, match in enumerate(history)]
+        try:
+            for done in asyncio.as_completed(builds):
+                await done
+                embeds = [ret[0] for ret in results if ret is not None]
+                if len(embeds) == 0 or len(embeds) == len(history):
+                    continue  # the last one goes out with the summary
+                
+                # show the matches done so far, in history order
+                if message is None:
+                    message = await interaction.followup.send(embeds=embeds, wait=True)
+                    first_shown = time.monotonic() - started
+                    last_edit = time.monotonic()
+                elif time.monotonic() - last_edit >= career_edit_interval:
+                    await message.edit(embeds=embeds)
+                    last_edit = time.monotonic()
+        except BaseException:
+            for task in builds:
+                task.cancel()
+            raise
+        
+        all_match_stats = [ret[1] for ret in results if ret is not None]
+        embeds = [GetEmbed.career_summary(endpoint.player, all_match_stats, response, self.bot)]
+        embeds += [ret[0] for ret in results if ret is not None]
+        view = View.share_button(interaction, embeds) if is_private_message else MISSING
+        if message is None:
+            await interaction.followup.send(embeds=embeds, view=view)
+        else:
+            await message.edit(embeds=embeds, view=view)
+        
+        elapsed = time.monotonic() - started
+        print(f"[{datetime.datetime.now()}] /career: {len(history)} matches in {elapsed:.2f}s" + (f", first shown after {first_shown:.2f}s" if first_shown is not None else ""))
 
     @app_commands.command(description=clocal.get("match", {}).get("DESCRIPTION", ""))
     @app_commands.describe(username=clocal.get("match", {}).get("DESCRIBE", {}).get("username", ""), password=clocal.get("match", {}).get("DESCRIBE", {}).get("password", ""), match_id=clocal.get("match", {}).get("DESCRIBE", {}).get("match_id", ""))
@@ -531,21 +614,23 @@ class ValorantCog(commands.Cog, name='Valorant'):
         response = ResponseLanguage(interaction.command.name, interaction.locale)
         
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
         
         # default language language
-        default_language = JSON.read("config", dir="config").get("default-language", "en-US")
+        default_language = Config.LoadConfig().get("default-language", "en-US")
         
         # find bundle
-        find_bundle_en_US = [cache['bundles'][i] for i in cache['bundles'] if bundle.lower() in cache['bundles'][i]['names'][default_language].lower()]
-        find_bundle_locale = [cache['bundles'][i] for i in cache['bundles'] if bundle.lower() in cache['bundles'][i]['names'][str(VLR_locale)].lower()]
-        find_bundle = find_bundle_en_US if len(find_bundle_en_US) > 0 else find_bundle_locale
+        find_bundle = [cache['bundles'][uuid] for uuid in Search.find("bundles", bundle, str(VLR_locale), default_language)]
         
         # bundle view
         view = View.BaseBundle(interaction, find_bundle, response)
         await view.start()
         await self.check_update(interaction)
     
+    @bundle.autocomplete('bundle')
+    async def bundle_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return Search.choices("bundles", current, str(VLR_locale))
+    
     # inspired by https://github.com/giorgi-o
     @app_commands.command(description=clocal.get("feature", {}).get("DESCRIPTION", ""))
     # @dynamic_cooldown(cooldown_5s)
@@ -584,41 +669,29 @@ class ValorantCog(commands.Cog, name='Valorant'):
         endpoint = await self.get_endpoint(interaction.user.id, interaction.locale, username, password)
         
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
         
         # default language language
-        default_language = JSON.read("config", dir="config").get("default-language", "en-US")
+        default_language = Config.LoadConfig().get("default-language", "en-US")
 
         # entitlements
         entitlements = endpoint.store_fetch_entitlements()
         
         # find agents
-        find_agent_en_US = []
-        find_agent_locale = []
-
-        
-        for item_key, item_agent in cache['agents'].items():
-            if agent.lower() == "all":
-                data = item_agent
-                data["uuid"] = item_key
-                find_agent_en_US.append(data)
-            else:
-                if agent.lower() in cache['agents'][item_key]['names'][default_language].lower():
-                    data = item_agent
-                    data["uuid"] = item_key
-                    find_agent_en_US.append(data)
-                
-                if agent.lower() in cache['agents'][item_key]['names'][str(VLR_locale)].lower():
-                    data = item_agent
-                    data["uuid"] = item_key
-                    find_agent_locale.append(data)
-            
-        find_agent = find_agent_en_US if len(find_agent_en_US) > 0 else find_agent_locale
+        if agent.lower() == "all":
+            find_agent_uuid = list(cache['agents'].keys())
+        else:
+            find_agent_uuid = Search.find("agents", agent, str(VLR_locale), default_language)
+        find_agent = [dict(cache['agents'][uuid], uuid=uuid) for uuid in find_agent_uuid]
 
         # agents view
         view = View.BaseAgent(interaction, find_agent, entitlements, response, endpoint, is_private_message)
         await view.start()
         await self.check_update(interaction)
+
+    @agent.autocomplete('agent')
+    async def agent_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return Search.choices("agents", current, str(VLR_locale))
     
     @app_commands.command(description=clocal.get("contract", {}).get("DESCRIPTION", ""))
     @app_commands.describe(agent=clocal.get("contract", {}).get("DESCRIBE", {}).get("agent", ""), username=clocal.get("contract", {}).get("DESCRIBE", {}).get("username", ""), password=clocal.get("contract", {}).get("DESCRIBE", {}).get("password", ""))
@@ -632,51 +705,35 @@ class ValorantCog(commands.Cog, name='Valorant'):
         
         # language
         response = ResponseLanguage(interaction.command.name, interaction.locale)
-        default_language = JSON.read("config", dir="config").get("default-language", "en-US")
+        default_language = Config.LoadConfig().get("default-language", "en-US")
         
         # endpoint
         endpoint = await self.get_endpoint(interaction.user.id, interaction.locale, username, password)
 
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
         
         #data
         fetch_data = endpoint.fetch_contracts()
         
         # find agents
-        find_agent_en_US = []
-        find_agent_locale = []
-        find_agent = []
-
         if agent == None:
-            agent_uuid = cache["contracts"][fetch_data["ActiveSpecialContract"]]["reward"]["relationUuid"]
-            data = cache["agents"][agent_uuid]
-            data["uuid"] = agent_uuid
-            find_agent = [data]
+            find_agent_uuid = [cache["contracts"][fetch_data["ActiveSpecialContract"]]["reward"]["relationUuid"]]
+        elif agent.lower() == "all":
+            find_agent_uuid = list(cache['agents'].keys())
         else:
-            for item_key, item_agent in cache['agents'].items():
-                if agent.lower() == "all":
-                    data = item_agent
-                    data["uuid"] = item_key
-                    find_agent_en_US.append(data)
-                else:
-                    if agent.lower() in cache['agents'][item_key]['names'][default_language].lower():
-                        data = item_agent
-                        data["uuid"] = item_key
-                        find_agent_en_US.append(data)
-                    
-                    if agent.lower() in cache['agents'][item_key]['names'][str(VLR_locale)].lower():
-                        data = item_agent
-                        data["uuid"] = item_key
-                        find_agent_locale.append(data)
-            
-            find_agent = find_agent_en_US if len(find_agent_en_US) > 0 else find_agent_locale
+            find_agent_uuid = Search.find("agents", agent, str(VLR_locale), default_language)
+        find_agent = [dict(cache['agents'][uuid], uuid=uuid) for uuid in find_agent_uuid]
 
         # contract view
         view = View.BaseContract(interaction, find_agent, fetch_data, response, endpoint.player, endpoint, is_private_message)
         await view.start()
         await self.check_update(interaction)
 
+    @contract.autocomplete('agent')
+    async def contract_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return Search.choices("agents", current, str(VLR_locale))
+    
     @app_commands.command(description=clocal.get("weapon", {}).get("DESCRIPTION", ""))
     @app_commands.describe(weapon=clocal.get("weapon", {}).get("DESCRIBE", {}).get("weapon", ""))
     # @dynamic_cooldown(cooldown_5s)
@@ -688,61 +745,33 @@ class ValorantCog(commands.Cog, name='Valorant'):
         response = ResponseLanguage(interaction.command.name, interaction.locale)
         
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
         
         # default language language
-        default_language = JSON.read("config", dir="config").get("default-language", "en-US")
+        default_language = Config.LoadConfig().get("default-language", "en-US")
         
         
         # find weapon
-        find_weapon_en_US = []
-        find_weapon_locale = []
+        if weapon.lower() == "all":
+            find_weapon_uuid = list(cache['weapons'].keys()) + list(cache['gears'].keys())
+        else:
+            find_weapon_uuid = Search.find("weapons", weapon, str(VLR_locale), default_language)
 
-        
-        for item_key, item_weapon in cache['weapons'].items():
-            if weapon.lower() == "all":
-                data = item_weapon
-                data["uuid"] = item_key
-                data["type"] = "weapon"
-                find_weapon_en_US.append(data)
-            else:
-                if weapon.lower() in cache['weapons'][item_key]['names'][default_language].lower():
-                    data = item_weapon
-                    data["uuid"] = item_key
-                    data["type"] = "weapon"
-                    find_weapon_en_US.append(data)
-                
-                if weapon.lower() in cache['weapons'][item_key]['names'][str(VLR_locale)].lower():
-                    data = item_weapon
-                    data["uuid"] = item_key
-                    data["type"] = "weapon"
-                    find_weapon_locale.append(data)
-        
-        for item_key, item_gear in cache['gears'].items():
-            if weapon.lower() == "all":
-                data = item_gear
-                data["uuid"] = item_key
-                data["type"] = "gear"
-                find_weapon_en_US.append(data)
+        find_weapon = []
+        for uuid in find_weapon_uuid:
+            if uuid in cache['weapons']:
+                find_weapon.append(dict(cache['weapons'][uuid], uuid=uuid, type="weapon"))
             else:
-                if weapon.lower() in cache['gears'][item_key]['names'][default_language].lower():
-                    data = item_gear
-                    data["uuid"] = item_key
-                    data["type"] = "gear"
-                    find_weapon_en_US.append(data)
-                
-                if weapon.lower() in cache['gears'][item_key]['names'][str(VLR_locale)].lower():
-                    data = item_gear
-                    data["uuid"] = item_key
-                    data["type"] = "gear"
-                    find_weapon_locale.append(data)
-            
-        find_weapon = find_weapon_en_US if len(find_weapon_en_US) > 0 else find_weapon_locale
+                find_weapon.append(dict(cache['gears'][uuid], uuid=uuid, type="gear"))
 
         # weapon view
         view = View.BaseWeapon(interaction, find_weapon, response)
         await view.start()
         await self.check_update(interaction)
+
+    @weapon.autocomplete('weapon')
+    async def weapon_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return Search.choices("weapons", current, str(VLR_locale))
     
     @app_commands.command(description=clocal.get("skin", {}).get("DESCRIPTION", ""))
     @app_commands.describe(skin=clocal.get("skin", {}).get("DESCRIBE", {}).get("skin", ""), username=clocal.get("skin", {}).get("DESCRIBE", {}).get("username", ""), password=clocal.get("skin", {}).get("DESCRIBE", {}).get("password", ""))
@@ -761,10 +790,10 @@ class ValorantCog(commands.Cog, name='Valorant'):
         endpoint = await self.get_endpoint(interaction.user.id, interaction.locale, username, password)
         
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
         
         # default language language
-        default_language = JSON.read("config", dir="config").get("default-language", "en-US")
+        default_language = Config.LoadConfig().get("default-language", "en-US")
 
         # fetch skin price and owns
         skin_price = endpoint.store_fetch_offers()
@@ -772,22 +801,16 @@ class ValorantCog(commands.Cog, name='Valorant'):
         entitlements = endpoint.store_fetch_entitlements()
         
         # find skin
-        find_skin_en_US = []
-        find_skin_locale = []
-
-        for item in cache['skins'].values():
-            if skin.lower() in cache['skins'][item["uuid"]]['names'][default_language].lower():
-                find_skin_en_US.append(item)
-            
-            if skin.lower() in cache['skins'][item["uuid"]]['names'][str(VLR_locale)].lower():
-                find_skin_locale.append(item)
-            
-        find_skin = find_skin_en_US if len(find_skin_en_US) > 0 else find_skin_locale
+        find_skin = [cache['skins'][uuid] for uuid in Search.find("skins", skin, str(VLR_locale), default_language)]
 
         # skin view
         view = View.BaseSkin(interaction, find_skin[:25], response, entitlements, is_private_message)
         await view.start()
         await self.check_update(interaction)
+
+    @skin.autocomplete('skin')
+    async def skin_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return Search.choices("skins", current, str(VLR_locale))
     
     @app_commands.command(description=clocal.get("spray", {}).get("DESCRIPTION", ""))
     @app_commands.describe(spray=clocal.get("spray", {}).get("DESCRIBE", {}).get("spray", ""), username=clocal.get("spray", {}).get("DESCRIBE", {}).get("username", ""), password=clocal.get("spray", {}).get("DESCRIBE", {}).get("password", ""))
@@ -806,10 +829,10 @@ class ValorantCog(commands.Cog, name='Valorant'):
         endpoint = await self.get_endpoint(interaction.user.id, interaction.locale, username, password)
         
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
         
         # default language language
-        default_language = JSON.read("config", dir="config").get("default-language", "en-US")
+        default_language = Config.LoadConfig().get("default-language", "en-US")
 
         # fetch sprat owns
         skin_price = endpoint.store_fetch_offers()
@@ -817,24 +840,17 @@ class ValorantCog(commands.Cog, name='Valorant'):
         entitlements = endpoint.store_fetch_entitlements()
         
         # find spray
-        find_spray_en_US = []
-        find_spray_locale = []
-
-        for item in cache['sprays'].values():
-            if spray.lower() in cache['sprays'][item["uuid"]]['names'][default_language].lower():
-                find_spray_en_US.append(item)
-            
-            if spray.lower() in cache['sprays'][item["uuid"]]['names'][str(VLR_locale)].lower():
-                find_spray_locale.append(item)
-            
-        find_spray = find_spray_en_US if len(find_spray_en_US) > 0 else find_spray_locale
+        find_spray = [cache['sprays'][uuid] for uuid in Search.find("sprays", spray, str(VLR_locale), default_language)]
 
         # skin view
         view = View.BaseSpray(interaction, find_spray[:25], response, entitlements, is_private_message)
         await view.start()
         await self.check_update(interaction)
 
-
+    @spray.autocomplete('spray')
+    async def spray_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return Search.choices("sprays", current, str(VLR_locale))
+    
     @app_commands.command(description=clocal.get("playercard", {}).get("DESCRIPTION", ""))
     @app_commands.describe(playercard=clocal.get("playercard", {}).get("DESCRIBE", {}).get("playercard", ""), username=clocal.get("playercard", {}).get("DESCRIBE", {}).get("username", ""), password=clocal.get("playercard", {}).get("DESCRIBE", {}).get("password", ""))
     # @dynamic_cooldown(cooldown_5s)
@@ -852,10 +868,10 @@ class ValorantCog(commands.Cog, name='Valorant'):
         endpoint = await self.get_endpoint(interaction.user.id, interaction.locale, username, password)
         
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
         
         # default language language
-        default_language = JSON.read("config", dir="config").get("default-language", "en-US")
+        default_language = Config.LoadConfig().get("default-language", "en-US")
 
         # fetch sprat owns
         skin_price = endpoint.store_fetch_offers()
@@ -863,24 +879,17 @@ class ValorantCog(commands.Cog, name='Valorant'):
         entitlements = endpoint.store_fetch_entitlements()
         
         # find cards
-        find_card_en_US = []
-        find_card_locale = []
-
-        for item in cache['playercards'].values():
-            if playercard.lower() in cache['playercards'][item["uuid"]]['names'][default_language].lower():
-                find_card_en_US.append(item)
-            
-            if playercard.lower() in cache['playercards'][item["uuid"]]['names'][str(VLR_locale)].lower():
-                find_card_locale.append(item)
-            
-        find_card = find_card_en_US if len(find_card_en_US) > 0 else find_card_locale
+        find_card = [cache['playercards'][uuid] for uuid in Search.find("playercards", playercard, str(VLR_locale), default_language)]
 
         # skin view
         view = View.BaseCard(interaction, find_card[:25], response, entitlements, is_private_message)
         await view.start()
         await self.check_update(interaction)
 
-
+    @playercard.autocomplete('playercard')
+    async def playercard_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return Search.choices("playercards", current, str(VLR_locale))
+    
     @app_commands.command(description=clocal.get("buddy", {}).get("DESCRIPTION", ""))
     @app_commands.describe(buddy=clocal.get("buddy", {}).get("DESCRIBE", {}).get("buddy", ""), username=clocal.get("buddy", {}).get("DESCRIBE", {}).get("username", ""), password=clocal.get("buddy", {}).get("DESCRIBE", {}).get("password", ""))
     # @dynamic_cooldown(cooldown_5s)
@@ -898,10 +907,10 @@ class ValorantCog(commands.Cog, name='Valorant'):
         endpoint = await self.get_endpoint(interaction.user.id, interaction.locale, username, password)
         
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
         
         # default language language
-        default_language = JSON.read("config", dir="config").get("default-language", "en-US")
+        default_language = Config.LoadConfig().get("default-language", "en-US")
 
         # fetch sprat owns
         skin_price = endpoint.store_fetch_offers()
@@ -909,24 +918,17 @@ class ValorantCog(commands.Cog, name='Valorant'):
         entitlements = endpoint.store_fetch_entitlements()
         
         # find cards
-        find_card_en_US = []
-        find_card_locale = []
-
-        for item in cache['buddies'].values():
-            if buddy.lower() in cache['buddies'][item["uuid"]]['names'][default_language].lower():
-                find_card_en_US.append(item)
-            
-            if buddy.lower() in cache['buddies'][item["uuid"]]['names'][str(VLR_locale)].lower():
-                find_card_locale.append(item)
-            
-        find_card = find_card_en_US if len(find_card_en_US) > 0 else find_card_locale
+        find_card = [cache['buddies'][uuid] for uuid in Search.find("buddies", buddy, str(VLR_locale), default_language)]
 
         # skin view
         view = View.BaseBuddy(interaction, find_card[:25], response, entitlements, is_private_message)
         await view.start()
         await self.check_update(interaction)
 
-
+    @buddy.autocomplete('buddy')
+    async def buddy_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return Search.choices("buddies", current, str(VLR_locale))
+    
     @app_commands.command(description=clocal.get("title", {}).get("DESCRIPTION", ""))
     @app_commands.describe(title=clocal.get("title", {}).get("DESCRIBE", {}).get("title", ""), username=clocal.get("title", {}).get("DESCRIBE", {}).get("username", ""), password=clocal.get("title", {}).get("DESCRIBE", {}).get("password", ""))
     # @dynamic_cooldown(cooldown_5s)
@@ -944,10 +946,10 @@ class ValorantCog(commands.Cog, name='Valorant'):
         endpoint = await self.get_endpoint(interaction.user.id, interaction.locale, username, password)
         
         # cache
-        cache = self.db.read_cache()
+        cache = get_catalog()
         
         # default language language
-        default_language = JSON.read("config", dir="config").get("default-language", "en-US")
+        default_language = Config.LoadConfig().get("default-language", "en-US")
 
         # fetch sprat owns
         skin_price = endpoint.store_fetch_offers()
@@ -955,24 +957,17 @@ class ValorantCog(commands.Cog, name='Valorant'):
         entitlements = endpoint.store_fetch_entitlements()
         
         # find cards
-        find_card_en_US = []
-        find_card_locale = []
-
-        for item in cache['titles'].values():
-            if title.lower() in cache['titles'][item["uuid"]]['names'][default_language].lower():
-                find_card_en_US.append(item)
-            
-            if title.lower() in cache['titles'][item["uuid"]]['names'][str(VLR_locale)].lower():
-                find_card_locale.append(item)
-            
-        find_card = find_card_en_US if len(find_card_en_US) > 0 else find_card_locale
+        find_card = [cache['titles'][uuid] for uuid in Search.find("titles", title, str(VLR_locale), default_language)]
 
         # skin view
         view = View.BaseTitle(interaction, find_card[:25], response, entitlements, is_private_message)
         await view.start()
         await self.check_update(interaction)
 
-
+    @title.autocomplete('title')
+    async def title_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return Search.choices("titles", current, str(VLR_locale))
+    
     @app_commands.command(description=clocal.get("crosshair", {}).get("DESCRIPTION", ""))
     @app_commands.describe(code=clocal.get("crosshair", {}).get("DESCRIBE", {}).get("code", ""), name=clocal.get("crosshair", {}).get("DESCRIBE", {}).get("name", ""))
     async def crosshair(self, interaction: Interaction, code: str = "", name: str = "") -> None:
@@ -1080,7 +1075,8 @@ class ValorantCog(commands.Cog, name='Valorant'):
         
         await interaction.response.defer(ephemeral=is_private_message)
         
-        response = ResponseLanguage(interaction.command.name, interaction.locale)
+        # the language tables are shared, so the overrides go into a copy
+        response = dict(ResponseLanguage(interaction.command.name, interaction.locale))
         response["RESULT"] = {
             "WIN": "VICTORY",
             "LOSE": "DEFEAT",
@@ -1109,8 +1105,17 @@ class ValorantCog(commands.Cog, name='Valorant'):
         else:
             party_details = None
         
+        # members' matches side by side, shared matches only once
+        lobby = {}
+        if party_details!=None:
+            membership = party_details.get("CustomGameData", {}).get("Membership", {})
+            puuids = [p["Subject"] for p in (membership.get("teamOne") or []) + (membership.get("teamTwo") or [])]
+            started = time.monotonic()
+            lobby = await pipeline.lobby_stats(endpoint, puuids)
+            print(f"[{datetime.datetime.now()}] /custom: {len(puuids)} members in {time.monotonic() - started:.2f}s")
+        
         # Embeds
-        embeds = GetEmbed.custom(endpoint.puuid, party_details, endpoint, response, self.bot)
+        embeds = GetEmbed.custom(endpoint.puuid, party_details, lobby, endpoint, response, self.bot)
         
         await interaction.followup.send(embeds=embeds, view=View.share_button(interaction, embeds) if is_private_message else MISSING)
         await self.check_update(interaction)
@@ -1165,6 +1170,9 @@ class ValorantCog(commands.Cog, name='Valorant'):
                 i += 1
 
         if len(article_data) > 0:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(None, GetEmbed.article_template, d) for d in article_data))
+
             embeds = []
             for d in article_data:
                 embeds.append(GetEmbed.article_embed(d, response))
@@ -1178,7 +1186,7 @@ class ValorantCog(commands.Cog, name='Valorant'):
     @app_commands.describe(action=clocal.get("debug", {}).get("DESCRIBE", {}).get("action", ""))
     @app_commands.guild_only()
     @owner_only()
-    async def debug(self, interaction: Interaction, action: Literal['Reload Skin Price', 'Reload Emoji', 'Reload Cache', 'Reset Emoji', 'Reset Cache', 'Reset Fonts Data']) -> None:
+    async def debug(self, interaction: Interaction, action: Literal['Reload Skin Price', 'Reload Emoji', 'Reload Cache', 'Reset Emoji', 'Reset Cache', 'Reset Fonts Data', 'Cache Status']) -> None:
         print(f"[{datetime.datetime.now()}] {interaction.user.name} issued a command /{interaction.command.name}.")
 
         await interaction.response.defer(ephemeral=True)
@@ -1197,23 +1205,24 @@ class ValorantCog(commands.Cog, name='Valorant'):
             await interaction.followup.send(embed=Embed(success.format(action=action)))
         
         elif action == 'Reload Emoji':
-            ret = await setup_emoji(self.bot, interaction.guild, interaction.locale, force=True)
+            ret = await setup_emoji(self.bot, interaction.guild, interaction.locale, force=True, progress=self.emoji_progress(interaction))
             success = response.get('SUCCESS')
             await interaction.followup.send(embed=Embed(success.format(action=action) + "\n\n" + ret))
         
         elif action == 'Reload Cache':
-            self.funtion_reload_cache(force=True)
+            changed = await self.refresh_cache(force=True) or []
             success = response.get('SUCCESS')
-            await interaction.followup.send(embed=Embed(success.format(action=action)))
+            sections = ", ".join(f"`{section}`" for section in changed) if changed else "-"
+            await interaction.followup.send(embed=Embed(success.format(action=action) + "\n\n" + sections))
         
         elif action == 'Reset Emoji':
-            ret = await setup_emoji(self.bot, interaction.guild, interaction.locale, force=True, reset=True)
+            ret = await setup_emoji(self.bot, interaction.guild, interaction.locale, force=True, reset=True, progress=self.emoji_progress(interaction))
             success = response.get('SUCCESS')
             await interaction.followup.send(embed=Embed(success.format(action=action) + "\n\n" + ret))
         
         elif action == 'Reset Cache':
-            from utils.valorant.cache import get_cache
-            get_cache(self.bot.bot_version)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, Cache.get_cache, self.bot.bot_version)
             success = response.get('SUCCESS')
             await interaction.followup.send(embed=Embed(success.format(action=action)))
         
@@ -1222,6 +1231,16 @@ class ValorantCog(commands.Cog, name='Valorant'):
             success = response.get('SUCCESS')
             await interaction.followup.send(embed=Embed(success.format(action=action)))
         
+        elif action == 'Cache Status':
+            cache = get_catalog()
+            status = response.get('STATUS').format(
+                generation=cache.generation,
+                version=cache.get('valorant_version', ''),
+                created=format_dt(cache.created, style='R'),
+                locales=", ".join(f"`{locale}`" for locale in cache.tables.loaded()) if cache.tables and cache.tables.loaded() else "-"
+            )
+            await interaction.followup.send(embed=Embed(status))
+        
         
 
 async def setup(bot: ValorantBot) -> None:
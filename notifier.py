@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import os
+from typing import Dict, List, Optional
+
+import aiohttp
+import discord
+from discord.ext import commands, tasks
+from dotenv import load_dotenv
+
+from bot import BOT_PREFIX
+from cogs.notify import Notify
+from utils.valorant.catalog import reload_catalog
+from utils.valorant.emojis import registry as emoji_registry
+from utils.valorant.outbox import Outbox, global_rate, outbox_file
+
+load_dotenv()
+
+riot_shards = ["na", "eu", "ap", "kr"]
+
+# files written by the gateway process, reloaded when they change
+shared_files = ["data/cache.json", "data/emoji.json"]
+
+
+class Notifier(commands.Bot):
+    """ Runs the notify, auth check and article pipelines over REST, without a gateway connection """
+
+    def __init__(self, shards: Optional[List[str]] = None) -> None:
+        super().__init__(command_prefix=BOT_PREFIX, intents=discord.Intents.none())
+        self.session: aiohttp.ClientSession = None
+        self.shards: Optional[List[str]] = shards
+        self.__logged_in: asyncio.Event = None
+        self.__mtimes: Dict[str, float] = {}
+
+    @property
+    def label(self) -> str:
+        return "-".join(self.shards) if self.shards else "all"
+
+    def is_ready(self) -> bool:
+        return self.__logged_in is not None and self.__logged_in.is_set()
+
+    async def wait_until_ready(self) -> None:
+        # no READY event comes without a gateway, the pipelines only need the REST login
+        await self.__logged_in.wait()
+
+    async def setup_hook(self) -> None:
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        self.refresh_shared.start()
+
+        # each worker keeps its own outbox and its share of the global rate limit
+        if self.shards:
+            box = Outbox(outbox_file.replace(".jsonl", f"-{self.label}.jsonl"))
+            rate = global_rate * len(self.shards) / len(riot_shards)
+        else:
+            box, rate = Outbox(), global_rate
+
+        cog = Notify(self, shards=self.shards, box=box, rate=rate)
+        await self.add_cog(cog)
+        cog.start_pipelines()
+
+        self.__logged_in.set()
+        print(f"[{datetime.datetime.now()}] Notifier ({self.label}) logged in as: {self.user}")
+
+    @tasks.loop(minutes=5)
+    async def refresh_shared(self) -> None:
+        """ Pick up the catalog and emojis updated by the gateway process """
+        for path in shared_files:
+            try:
+                mtime = os.path.getmtime(path)
+            except FileNotFoundError:
+                continue
+
+            last = self.__mtimes.get(path)
+            self.__mtimes[path] = mtime
+            if last is None or last == mtime:
+                continue
+
+            if path == "data/cache.json":
+                await asyncio.get_running_loop().run_in_executor(None, reload_catalog)
+            emoji_registry.invalidate()
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+        await super().close()
+
+    async def run_worker(self) -> None:
+        self.__logged_in = asyncio.Event()
+        async with self:
+            await self.login(os.getenv('TOKEN'))
+            await asyncio.Event().wait()
+
+
+def run_notifier() -> None:
+    parser = argparse.ArgumentParser(description="Run the notify, auth check and article pipelines outside of the bot process.")
+    parser.add_argument("--shard", action="append", choices=riot_shards, default=[], help="riot shard to handle, can be repeated, all of them if omitted")
+    args = parser.parse_args()
+
+    notifier = Notifier(sorted(set(args.shard)) or None)
+    try:
+        asyncio.run(notifier.run_worker())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    run_notifier()
@@ -0,0 +1,59 @@
+""" The analytics summary against values the per-player loops it replaced computed for the same match details """
+
+import glob
+import gzip
+import json
+import os
+import unittest
+
+from utils.valorant.analytics import economy_series, heatmap, summarize
+
+fixture_dir = os.path.join(os.path.dirname(__file__), "fixtures", "matches")
+
+
+def load_fixtures():
+    for path in sorted(glob.glob(os.path.join(fixture_dir, "*.json.gz"))):
+        name = os.path.basename(path)[:-len(".json.gz")]
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            match_detail = json.load(f)
+        with open(os.path.join(fixture_dir, name + ".expected.json"), "r", encoding="utf-8") as f:
+            expected = json.load(f)
+        yield name, match_detail, expected
+
+
+def plain(value):
+    # the expected values went through JSON, so compare in the same form
+    return json.loads(json.dumps(value))
+
+
+class TestMatchAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        self.fixtures = list(load_fixtures())
+        self.assertGreater(len(self.fixtures), 0)
+
+    def test_player_stats(self):
+        for name, match_detail, expected in self.fixtures:
+            summary = plain(summarize(match_detail))
+            for puuid, stats in expected["players"].items():
+                with self.subTest(match=name, puuid=puuid):
+                    actual = dict(summary["players"][puuid])
+                    actual["damage"] = summary["round_damage"][puuid]
+                    actual.update(summary["duel_lists"].get(puuid, {}))
+                    self.assertEqual(actual, stats)
+
+    def test_economy_series(self):
+        for name, match_detail, expected in self.fixtures:
+            with self.subTest(match=name):
+                summary = plain(summarize(match_detail))
+                self.assertEqual(economy_series(summary, expected["team_a"], expected["team_b"]), expected["economy"])
+
+    def test_heatmap(self):
+        for name, match_detail, expected in self.fixtures:
+            with self.subTest(match=name):
+                summary = plain(summarize(match_detail))
+                self.assertEqual(plain(heatmap(summary, expected["rows"], expected["cols"])), expected["heatmap"])
+
+
+if __name__ == "__main__":
+    unittest.main()
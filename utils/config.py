@@ -1,5 +1,17 @@
+from __future__ import annotations
+
+import datetime
 import json
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+config_path = "config/config.json"
+fonts_path = "data/fonts.json"
+# seconds between checks of the config file for changes
+reload_interval = 5.0
 
 class JSON:
 
@@ -25,17 +37,164 @@ class JSON:
             create_json(filename, {})
             return JSON.save(filename, data)
 
-def LoadConfig() -> Dict:
-    return JSON.read("config", dir="config")
+# ---------- SETTINGS ---------- #
+
+class Color(NamedTuple):
+    """ A config color with its forms used by embeds and images """
+    value: int
+    rgb: Tuple[int, int, int]
+    hex: str
+
+    @classmethod
+    def from_value(cls, value: int) -> Color:
+        value = int(value or 0)
+        return cls(value, ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF), "#" + format(value, "06x"))
+
+
+class Settings(Mapping):
+    """ A parsed config.json, read-only, with the derived values computed once """
+
+    def __init__(self, data: Dict[str, Any], fonts: Dict[str, Any]) -> None:
+        self.__data: Mapping[str, Any] = self.__freeze(data)
+
+        match = data.get("commands", {}).get("match", {})
+        self.colors: Mapping[str, Color] = MappingProxyType({key: Color.from_value(value) for key, value in data.get("colors", {}).items()})
+        self.match_colors: Mapping[str, Color] = MappingProxyType({key: Color.from_value(value) for key, value in match.get("color", {}).items()})
+
+        # [family, style] resolved against data/fonts.json
+        match_fonts = {}
+        for key, font in match.get("font", {}).items():
+            match_fonts[key] = fonts.get(font[0], {}).get(font[1], {}).get("path") if font else None
+        self.match_fonts: Mapping[str, Optional[str]] = MappingProxyType(match_fonts)
+
+    @staticmethod
+    def __freeze(value: Any) -> Any:
+        if isinstance(value, dict):
+            return MappingProxyType({key: Settings.__freeze(item) for key, item in value.items()})
+        if isinstance(value, list):
+            return tuple(Settings.__freeze(item) for item in value)
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        return self.__data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__data)
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def color(self, key: str) -> Color:
+        return self.colors.get(key) or Color.from_value(0)
+
+    def match_color(self, key: str) -> Color:
+        return self.match_colors.get(key) or Color.from_value(0)
+
+    def match_font(self, key: str) -> Optional[str]:
+        return self.match_fonts.get(key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """ Get a mutable copy, to edit and save """
+        return json.loads(json.dumps(self.__data, default=dict))
+
+
+class ConfigService:
+    """ config.json parsed once, reloaded when the file (or the font list it refers to) changes """
+
+    def __init__(self, path: str = config_path, fonts: str = fonts_path) -> None:
+        self.path: str = path
+        self.fonts: str = fonts
 
-def SaveConfig(cfg: Dict) -> None:
-    JSON.save("config", cfg, "config")
+        # (settings, mtimes) is replaced as a whole, so readers never see a half-loaded config
+        self.__state: Optional[Tuple[Settings, Tuple[Optional[float], Optional[float]]]] = None
+        self.__checked: float = 0.0
+        self.__listeners: List[Callable[[Settings, Settings], None]] = []
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def __mtime(path: str) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def __read(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding='utf-8') as json_file:
+                return json.load(json_file)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            print(e)
+            print(f"[{datetime.datetime.now()}] Can't load config file: {path}")
+            return None
+
+    def load(self) -> Settings:
+        """ Parse the config and publish it, listeners are told when it changed """
+        with self.__lock:
+            mtimes = (self.__mtime(self.path), self.__mtime(self.fonts))
+            data = self.__read(self.path)
+            old = self.__state[0] if self.__state is not None else None
+
+            # a file caught mid-write keeps the previous settings until the next check
+            if data is None and old is not None:
+                self.__checked = time.monotonic()
+                return old
+
+            settings = Settings(data or {}, self.__read(self.fonts) or {})
+            self.__state = (settings, mtimes)
+            self.__checked = time.monotonic()
+            listeners = list(self.__listeners)
+
+        if old is not None and (old != settings or old.match_fonts != settings.match_fonts):
+            print(f"[{datetime.datetime.now()}] Reloaded config.")
+            for listener in listeners:
+                try:
+                    listener(old, settings)
+                except Exception as e:
+                    print(e)
+        return settings
+
+    def get(self) -> Settings:
+        """ Get the current settings """
+        state = self.__state
+        if state is None:
+            return self.load()
+
+        now = time.monotonic()
+        if now - self.__checked >= reload_interval:
+            self.__checked = now
+            if (self.__mtime(self.path), self.__mtime(self.fonts)) != state[1]:
+                return self.load()
+        return state[0]
+
+    def save(self, data: Mapping[str, Any]) -> Settings:
+        """ Write the config and publish it right away """
+        JSON.save("config", data.to_dict() if isinstance(data, Settings) else dict(data), "config")
+        return self.load()
+
+    def subscribe(self, listener: Callable[[Settings, Settings], None]) -> Callable[[Settings, Settings], None]:
+        """ Call listener(old, new) after the config changed, usable as a decorator """
+        self.__listeners.append(listener)
+        return listener
+
+
+settings = ConfigService()
+
+
+def LoadConfig() -> Settings:
+    return settings.get()
+
+def SaveConfig(cfg: Mapping) -> None:
+    settings.save(cfg)
 
 def NewConfigData() -> Dict:
     return {
         "bot-start-notify": False,
         "default-language": "en-US",
         "command-description-language": "en-US",
+        "catalog-languages": ["en-US", "ja-JP"],
         "owner-id": -1,
         "emoji-server-id": [-1],
         "reset-cache-when-updated": False,
@@ -44,6 +203,12 @@ def NewConfigData() -> Dict:
         "article": {
             "description": 150
         },
+        "notify": {
+            "concurrency": 8,
+            "spread-window": 300,
+            "webhooks": False,
+            "worker": False
+        },
         "emojis": {
             "default": True,
             "tier": False,
@@ -85,4 +250,4 @@ def NewConfigData() -> Dict:
     }
     
 def GetColor(key: str) -> int:
-    return LoadConfig().get("colors", {}).get(key, 0x000000)
\ No newline at end of file
+    return settings.get().color(key).value
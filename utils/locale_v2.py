@@ -4,7 +4,6 @@ DEMO TRANSLATION
 from __future__ import annotations
 
 from contextvars import ContextVar
-import os
 from typing import Optional
 
 discord_locale = [
@@ -80,12 +79,7 @@ def get_valorant_locale() -> str:
 
 
 def set_valorant_locale(locale: Optional[str]) -> None:
-    """ Set the locale for valorant api """
-    
-    language_files = os.listdir('lang')
-    locale_json = str(locale) + '.json'
-    if locale_json not in language_files:
-        _valorant_current_locale.set("en-US")
+    """ Set the locale for valorant api, unsupported locales resolve to en-US in get_valorant_locale """
     _valorant_current_locale.set(locale)
 
 
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+# bump when the numbers computed here change, stored summaries of older versions are recomputed
+analytics_version = 1
+
+# rounds where a player got this many kills count as a multikill
+multikill_threshold = 3
+
+
+class MatchAnalytics:
+    """ Match details as dense arrays, per round stats are indexed [round, player] """
+
+    def __init__(self, match_detail: Dict[str, Any]) -> None:
+        players = match_detail.get("players", [])
+        rounds = match_detail.get("roundResults", [])
+
+        self.puuids: List[str] = [p["subject"] for p in players]
+        self.index: Dict[str, int] = {puuid: i for i, puuid in enumerate(self.puuids)}
+        self.teams: List[str] = [p["teamId"] for p in players]
+        self.round_count: int = len(rounds)
+
+        n_rounds, n_players = len(rounds), len(players)
+        shape = (n_rounds, n_players)
+
+        # match totals of each player
+        stats = [p["stats"] for p in players]
+        self.total_kills = np.array([s["kills"] for s in stats], dtype=np.int64)
+        self.total_deaths = np.array([s["deaths"] for s in stats], dtype=np.int64)
+        self.total_assists = np.array([s["assists"] for s in stats], dtype=np.int64)
+        self.total_score = np.array([s["score"] for s in stats], dtype=np.int64)
+
+        # damage of each player by round, as reported on the player
+        self.has_round_damage = np.array([p.get("roundDamage") is not None for p in players], dtype=bool)
+        entries = [(d["round"], i, d["damage"]) for i, p in enumerate(players) for d in p.get("roundDamage") or []]
+        self.round_damage_entries = np.array(entries, dtype=np.int64).reshape(-1, 3)
+
+        # stats of each round
+        self.present = np.zeros(shape, dtype=bool)
+        self.kills = np.zeros(shape, dtype=np.int64)
+        self.score = np.zeros(shape, dtype=np.int64)
+        self.headshots = np.zeros(shape, dtype=np.int64)
+        self.bodyshots = np.zeros(shape, dtype=np.int64)
+        self.legshots = np.zeros(shape, dtype=np.int64)
+        self.damage = np.zeros(shape, dtype=np.int64)
+        self.loadout = np.zeros(shape, dtype=np.int64)
+        self.remaining = np.zeros(shape, dtype=np.int64)
+        self.spent = np.zeros(shape, dtype=np.int64)
+
+        # economies reported per round, they aren't sent for every match
+        self.has_economies = np.zeros(n_rounds, dtype=bool)
+        self.economy_present = np.zeros(shape, dtype=bool)
+        self.economy_spent = np.zeros(shape, dtype=np.int64)
+
+        cells, values, damages, damage_counts = [], [], [], []
+        economy_cells, economy_spent = [], []
+        for r, round_result in enumerate(rounds):
+            for s in round_result.get("playerStats", []):
+                economy = s["economy"]
+                damage = s.get("damage", [])
+                cells.append((r, self.index[s["subject"]]))
+                values.append((len(s["kills"]), s["score"], economy["loadoutValue"], economy["remaining"], economy["spent"]))
+                damages.extend(damage)
+                damage_counts.append(len(damage))
+
+            if round_result.get("playerEconomies") is not None:
+                self.has_economies[r] = True
+                for e in round_result["playerEconomies"]:
+                    p = self.index.get(e["subject"])
+                    if p is not None:
+                        economy_cells.append((r, p))
+                        economy_spent.append(e["spent"])
+
+        if cells:
+            rows, cols = np.array(cells, dtype=np.int64).T
+            values = np.array(values, dtype=np.int64)
+            self.present[rows, cols] = True
+            self.kills[rows, cols] = values[:, 0]
+            self.score[rows, cols] = values[:, 1]
+            self.loadout[rows, cols] = values[:, 2]
+            self.remaining[rows, cols] = values[:, 3]
+            self.spent[rows, cols] = values[:, 4]
+
+            # damage entries belong to the stats they were listed in
+            counts = np.array(damage_counts, dtype=np.int64)
+            hit_rows, hit_cols = np.repeat(rows, counts), np.repeat(cols, counts)
+            for key, array in (("headshots", self.headshots), ("bodyshots", self.bodyshots), ("legshots", self.legshots), ("damage", self.damage)):
+                np.add.at(array, (hit_rows, hit_cols), np.array([d.get(key, 0) for d in damages], dtype=np.int64))
+        if economy_cells:
+            rows, cols = np.array(economy_cells, dtype=np.int64).T
+            self.economy_present[rows, cols] = True
+            self.economy_spent[rows, cols] = economy_spent
+
+        # kills[killer, victim], assists[assistant, victim]
+        self.kill_matrix = np.zeros((n_players, n_players), dtype=np.int64)
+        self.assist_matrix = np.zeros((n_players, n_players), dtype=np.int64)
+        self.firstbloods = np.zeros(n_players, dtype=np.int64)
+        self.firstdeaths = np.zeros(n_players, dtype=np.int64)
+
+        duels, assists = [], []
+        for k in match_detail.get("kills", []):
+            killer, victim = self.index.get(k.get("killer")), self.index.get(k.get("victim"))
+            if killer is None or victim is None:
+                continue
+            duels.append((k["round"], killer, victim))
+            assists.extend((self.index[a], victim) for a in k.get("assistants", []) if a in self.index)
+
+        if duels:
+            duels = np.array(duels, dtype=np.int64)
+            np.add.at(self.kill_matrix, (duels[:, 1], duels[:, 2]), 1)
+
+            # the first kill after the round changes
+            first = np.ones(len(duels), dtype=bool)
+            first[1:] = duels[1:, 0] != duels[:-1, 0]
+            np.add.at(self.firstbloods, duels[first, 1], 1)
+            np.add.at(self.firstdeaths, duels[first, 2], 1)
+        if assists:
+            assists = np.array(assists, dtype=np.int64)
+            np.add.at(self.assist_matrix, (assists[:, 0], assists[:, 1]), 1)
+
+    # ---------- PER ROUND ---------- #
+
+    def round_damage(self, puuid: str) -> Dict[str, int]:
+        """ Damage of a player by round number, every round is 0 without round damage data """
+        p = self.index[puuid]
+        if not self.has_round_damage[p]:
+            return {str(r): 0 for r in range(self.round_count)}
+
+        entries = self.round_damage_entries[self.round_damage_entries[:, 1] == p]
+        rounds, first = np.unique(entries[:, 0], return_index=True)
+        totals = np.bincount(np.searchsorted(rounds, entries[:, 0]), weights=entries[:, 2], minlength=len(rounds))
+        order = np.argsort(first, kind="stable")
+        return {str(r): int(totals[i]) for i, r in zip(order.tolist(), rounds[order].tolist())}
+
+    def round_stats(self, r: int) -> Dict[str, Dict[str, int]]:
+        """ Stats of the players of a round """
+        stats = {}
+        columns = np.stack((self.kills[r], self.score[r], self.headshots[r], self.legshots[r], self.bodyshots[r], self.damage[r]), axis=1).tolist()
+        for p in np.flatnonzero(self.present[r]).tolist():
+            kills, score, headshots, legshots, bodyshots, damage = columns[p]
+            stats[self.puuids[p]] = {"kills": kills, "score": score, "headshots": headshots, "legshots": legshots, "bodyshots": bodyshots, "damage": damage}
+        return stats
+
+    def team_economy(self) -> List[Dict[str, Dict[str, int]]]:
+        """ Loadout, remaining and spent credits of each team by round """
+        teams = list(dict.fromkeys(self.teams))
+        team_of = np.array([teams.index(t) for t in self.teams], dtype=np.int64)
+        membership = (team_of[:, None] == np.arange(len(teams))[None, :]).astype(np.int64)  # [player, team]
+
+        present = self.present.astype(np.int64)
+        sums = [(self.loadout * present) @ membership, (self.remaining * present) @ membership, (self.spent * present) @ membership]
+        played = (present @ membership) > 0
+        sums = np.stack(sums, axis=2).tolist()
+
+        economies = []
+        for r in range(self.round_count):
+            economies.append({
+                teams[t]: {"loadout": sums[r][t][0], "remain": sums[r][t][1], "spent": sums[r][t][2]}
+                for t in range(len(teams)) if played[r, t]
+            })
+        return economies
+
+    def team_worth(self) -> Dict[str, List[int]]:
+        """ Remaining credits + loadout value of each team by round """
+        worth = (self.remaining + self.loadout) * self.present
+        teams = np.array(self.teams)
+        return {team: worth[:, teams == team].sum(axis=1).tolist() for team in dict.fromkeys(self.teams)}
+
+    # ---------- PER PLAYER ---------- #
+
+    def multikills(self) -> np.ndarray:
+        return ((self.kills >= multikill_threshold) & self.present).sum(axis=0)
+
+    def player_stats(self) -> Dict[str, Dict[str, Any]]:
+        """ Per match stats of each player """
+        deaths = np.maximum(self.total_deaths, 1).astype(np.float64)
+        kd = (self.total_kills / deaths).tolist()
+        kda = ((self.total_kills + self.total_assists) / deaths).tolist()
+        acs = (self.total_score / 20.0).tolist()
+        multikills = self.multikills().tolist()
+        firstbloods, firstdeaths = self.firstbloods.tolist(), self.firstdeaths.tolist()
+
+        result = {}
+        for p, puuid in enumerate(self.puuids):
+            result[puuid] = {
+                "kd": round(kd[p], 1),
+                "kda": round(kda[p], 1),
+                "acs": round(acs[p]),
+                "firstblood": firstbloods[p],
+                "firstdeath": firstdeaths[p],
+                "multikills": multikills[p],
+            }
+
+        # damage and shots of the rounds with economies
+        if self.round_count > 0:
+            mask = self.has_economies[:, None]
+            damage = (self.damage * mask).sum(axis=0).tolist()
+            spent = (self.economy_spent * (self.economy_present & mask)).sum(axis=0).tolist()
+            headshots = (self.headshots * mask).sum(axis=0).tolist()
+            bodyshots = (self.bodyshots * mask).sum(axis=0).tolist()
+            legshots = (self.legshots * mask).sum(axis=0).tolist()
+            any_economy = bool(self.has_economies.any())
+
+            for p, puuid in enumerate(self.puuids):
+                shots = headshots[p] + bodyshots[p] + legshots[p]
+                stats = result[puuid]
+                if any_economy:
+                    stats["eco_rating"] = round(damage[p]*1000/spent[p]) if spent[p] != 0 else round(damage[p]*1000/1)
+                else:
+                    stats["eco_rating"] = 0
+                stats["total_damage"] = damage[p]
+                stats["adr"] = round(damage[p] / self.round_count, 1)
+                stats["headshots"] = headshots[p]
+                stats["bodyshots"] = bodyshots[p]
+                stats["legshots"] = legshots[p]
+                stats["shots"] = shots
+                if shots == 0:
+                    stats["hsrate"], stats["bsrate"], stats["lsrate"] = 0.0, 0.0, 0.0
+                else:
+                    stats["hsrate"] = round(headshots[p] / shots * 100, 1)
+                    stats["bsrate"] = round(bodyshots[p] / shots * 100, 1)
+                    stats["lsrate"] = round(legshots[p] / shots * 100, 1)
+        return result
+
+    def duel_lists(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """ kill_list, killed_list and assist_list of each player who has any """
+        lists = {}
+        for name, matrix in (("kill_list", self.kill_matrix), ("killed_list", self.kill_matrix.T), ("assist_list", self.assist_matrix)):
+            rows, cols = np.nonzero(matrix)
+            counts = matrix[rows, cols].tolist()
+            for p, o, count in zip(rows.tolist(), cols.tolist(), counts):
+                lists.setdefault(self.puuids[p], {}).setdefault(name, {})[self.puuids[o]] = count
+        return lists
+
+    def summary(self) -> Dict[str, Any]:
+        """ Everything get_match_info needs from the analytics, plain JSON values """
+        return {
+            "version": analytics_version,
+            "puuids": self.puuids,
+            "players": self.player_stats(),
+            "round_damage": {puuid: self.round_damage(puuid) for puuid in self.puuids},
+            "duel_lists": self.duel_lists(),
+            "round_stats": [self.round_stats(r) if self.present[r].any() else None for r in range(self.round_count)],
+            "team_economy": self.team_economy(),
+            "team_worth": self.team_worth(),
+            "kill_matrix": self.kill_matrix.tolist(),
+        }
+
+
+def summarize(match_detail: Dict[str, Any]) -> Dict[str, Any]:
+    return MatchAnalytics(match_detail).summary()
+
+
+# ---------- FROM SUMMARIES ---------- #
+
+def economy_series(summary: Dict[str, Any], team_a: str, team_b: str) -> List[int]:
+    """ (remaining + loadout) of team_a minus team_b by round """
+    worth = summary["team_worth"]
+    zeros = [0] * len(summary["team_economy"])
+    return (np.array(worth.get(team_a, zeros), dtype=np.int64) - np.array(worth.get(team_b, zeros), dtype=np.int64)).tolist()
+
+
+def heatmap(summary: Dict[str, Any], rows: List[str], cols: List[str], size: int = 5) -> Dict[str, List[List[int]]]:
+    """ Kills of rows players on cols players and the other way around, padded to size x size """
+    index = {puuid: i for i, puuid in enumerate(summary["puuids"])}
+    kill_matrix = np.array(summary["kill_matrix"], dtype=np.int64).reshape(len(index), len(index))
+    r = [index[puuid] for puuid in rows[:size]]
+    c = [index[puuid] for puuid in cols[:size]]
+
+    kills = np.zeros((size, size), dtype=np.int64)
+    deaths = np.zeros((size, size), dtype=np.int64)
+    if r and c:
+        kills[:len(r), :len(c)] = kill_matrix[np.ix_(r, c)]
+        deaths[:len(r), :len(c)] = kill_matrix[np.ix_(c, r)].T
+    return {"data": (kills - deaths).tolist(), "kills": kills.tolist(), "deaths": deaths.tolist()}
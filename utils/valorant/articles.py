@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .outbox import TokenBucket
+from .useful import JSON
+
+article_endpoint = "https://api.henrikdev.xyz/valorant/v1/website/{locale}"
+article_locales = ["en-us", "en-gb", "de-de", "es-es", "es-mx", "fr-fr", "it-it", "ja-jp", "ko-kr", "pt-br", "ru-ru", "tr-tr", "vi-vn"]
+
+# riot shard whose notifier polls each locale
+locale_shards = {
+    "en-us": "na", "es-mx": "na", "pt-br": "na",
+    "en-gb": "eu", "de-de": "eu", "es-es": "eu", "fr-fr": "eu", "it-it": "eu", "ru-ru": "eu", "tr-tr": "eu",
+    "ja-jp": "ap", "vi-vn": "ap",
+    "ko-kr": "kr",
+}
+
+article_file = "article"  # latest articles of each locale
+state_file = "article_state"  # validators and payload hashes of each locale
+
+# henrikdev allows 30 requests a minute, keep well under it
+request_rate = 0.4
+request_burst = 8
+request_timeout = 30
+
+# poll interval in seconds, backs off while nothing changes
+base_interval = 20 * 60
+hot_interval = 5 * 60
+max_interval = 60 * 60
+backoff = 1.5
+
+# patch notes usually go up on tuesday to thursday afternoons (utc)
+hot_weekdays = (1, 2, 3)
+hot_hours = range(13, 20)
+
+
+class ArticlePoller:
+    """ Poll the articles of every locale with conditional requests, hand over only new ones """
+
+    def __init__(self, locales: List[str] = article_locales) -> None:
+        self.locales: List[str] = locales
+        self.bucket: TokenBucket = TokenBucket(request_rate, request_burst)
+        self.idle_cycles: int = 0
+
+    @staticmethod
+    def is_hot(now: Optional[datetime.datetime] = None) -> bool:
+        now = now or datetime.datetime.utcnow()
+        return now.weekday() in hot_weekdays and now.hour in hot_hours
+
+    def next_interval(self, now: Optional[datetime.datetime] = None) -> float:
+        """ Seconds until the next cycle, the backoff never slows a hot window below hot_interval """
+        if self.is_hot(now):
+            return hot_interval
+        return min(max_interval, base_interval * backoff ** self.idle_cycles)
+
+    async def __fetch(self, session: aiohttp.ClientSession, locale: str, state: Dict[str, Any]) -> Tuple[str, Optional[List[Dict]], Dict[str, Any]]:
+        """ Returns the articles of a locale, or None when unchanged or failed """
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+
+        await self.bucket.take()
+        url = article_endpoint.format(locale=locale)
+        try:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=request_timeout)) as r:
+                if r.status == 304:
+                    return locale, None, state
+                if r.status != 200:
+                    print(f"[{datetime.datetime.now()}] Fetching failed ({r.status}): {url}.")
+                    return locale, None, state
+                body = await r.read()
+                etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"[{datetime.datetime.now()}] Fetching failed ({type(e).__name__}): {url}.")
+            return locale, None, state
+
+        # the api rarely sends validators, so fall back to the payload hash
+        digest = hashlib.sha256(body).hexdigest()
+        new_state = {"etag": etag, "last_modified": last_modified, "hash": digest}
+        if digest == state.get("hash"):
+            return locale, None, new_state
+
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return locale, None, state
+        if isinstance(data, dict):
+            data = data.get("data")
+        if not isinstance(data, list) or not all(isinstance(article, dict) for article in data):
+            return locale, None, state
+        return locale, data, new_state
+
+    async def poll(self, session: aiohttp.ClientSession) -> Dict[str, List[Dict]]:
+        """ Fetch every locale once, returns the new articles of each locale, oldest first """
+        cache = JSON.read(article_file)
+        states = JSON.read(state_file)
+
+        results = await asyncio.gather(*(self.__fetch(session, locale, states.get(locale, {})) for locale in self.locales))
+
+        new_articles: Dict[str, List[Dict]] = {}
+        updated: Dict[str, List[Dict]] = {}
+        for locale, data, state in results:
+            states[locale] = state
+            if data is None:
+                continue
+
+            # a locale seen for the first time only sets the baseline
+            known = cache.get(locale)
+            updated[locale] = data
+            if known is None:
+                continue
+
+            known_urls = {article.get("url") for article in known}
+            fresh = [article for article in data if article.get("url") not in known_urls]
+            if fresh:
+                new_articles[locale] = fresh[::-1]
+
+        # write the state once per cycle, notifier workers share the files but not the locales
+        cache, latest_states = JSON.read(article_file), JSON.read(state_file)
+        cache.update(updated)
+        latest_states.update({locale: states[locale] for locale in self.locales})
+        JSON.save(article_file, cache)
+        JSON.save(state_file, latest_states)
+
+        self.idle_cycles = 0 if new_articles else self.idle_cycles + 1
+        return new_articles
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import concurrent.futures
+import datetime
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+# Standard
+import requests
+from PIL import Image
+
+# Local
+from .catalog import Catalog
+from .local import LocalErrorResponse
+from .useful import GetItems
+from ..errors import ValorantBotError
+from ..locale_v2 import get_interaction_locale
+
+asset_dir = "data/assets"
+memory_items = 64
+disk_limit = 256 * 1024 * 1024
+
+
+class AssetStore:
+    """ Images keyed by URL, decoded images in a memory LRU over a size-capped disk LRU """
+
+    def __init__(self, directory: str = asset_dir, memory_items: int = memory_items, disk_limit: int = disk_limit) -> None:
+        self.directory: str = directory
+        self.memory_items: int = memory_items
+        self.disk_limit: int = disk_limit
+
+        self.__memory: OrderedDict[str, Image.Image] = OrderedDict()
+        self.__pending: Dict[str, concurrent.futures.Future] = {}
+        self.__disk_size: Optional[int] = None
+        self.__lock = threading.Lock()
+
+    def path(self, url: str) -> str:
+        """ Get the disk path of an asset """
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        ext = os.path.splitext(url.split("?")[0])[1][:5] or ".bin"
+        return f"{self.directory}/{name[:2]}/{name}{ext}"
+
+    # ---------- DISK ---------- #
+
+    def fetch(self, url: str) -> Optional[bytes]:
+        """ Get the raw bytes of an asset, downloading it once if it is not on disk """
+        if not url:
+            return None
+
+        path = self.path(url)
+        try:
+            with open(path, "rb") as asset_file:
+                data = asset_file.read()
+            os.utime(path)  # disk tier is evicted by last use
+            return data
+        except FileNotFoundError:
+            pass
+
+        # concurrent requests for the same url share one download
+        with self.__lock:
+            future = self.__pending.get(url)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self.__pending[url] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            data = self.__download(url, path)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_result(None)
+            raise e
+        finally:
+            with self.__lock:
+                self.__pending.pop(url, None)
+
+    def __download(self, url: str, path: str) -> Optional[bytes]:
+        print(f"[{datetime.datetime.now()}] Downloading asset: {url}")
+        try:
+            resp = requests.get(url, timeout=30)
+        except requests.RequestException as e:
+            print(e)
+            return None
+        if resp.status_code != 200:
+            print(f"[{datetime.datetime.now()}] Can't download asset ({resp.status_code}): {url}")
+            return None
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as asset_file:
+            asset_file.write(resp.content)
+        os.replace(path + ".tmp", path)
+
+        self.__trim(len(resp.content))
+        return resp.content
+
+    def __trim(self, added: int) -> None:
+        """ Remove the least recently used assets once the disk tier is over its limit """
+        with self.__lock:
+            if self.__disk_size is None:
+                self.__disk_size = sum(size for _, _, size in self.__scan())
+            else:
+                self.__disk_size += added
+
+            if self.__disk_size <= self.disk_limit:
+                return
+
+            # trim to 90% so that the next few downloads do not trim again
+            for mtime, path, size in sorted(self.__scan()):
+                if self.__disk_size <= self.disk_limit * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                    self.__disk_size -= size
+                except FileNotFoundError:
+                    pass
+
+    def __scan(self) -> List[tuple]:
+        assets = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                    assets.append((stat.st_mtime, path, stat.st_size))
+                except FileNotFoundError:
+                    pass
+        return assets
+
+    # ---------- MEMORY ---------- #
+
+    def image(self, url: str) -> Optional[Image.Image]:
+        """ Get an asset as an image, the caller gets its own copy to draw on """
+        with self.__lock:
+            image = self.__memory.get(url)
+            if image is not None:
+                self.__memory.move_to_end(url)
+                return image.copy()
+
+        data = self.fetch(url)
+        if data is None:
+            return None
+
+        image = Image.open(io.BytesIO(data))
+        image.load()
+
+        with self.__lock:
+            self.__memory[url] = image
+            self.__memory.move_to_end(url)
+            while len(self.__memory) > self.memory_items:
+                self.__memory.popitem(last=False)
+        return image.copy()
+
+    def prefetch(self, urls: Iterable[str], workers: int = 8) -> int:
+        """ Download assets that are not on disk yet, returns the number of downloads """
+        missing = {url for url in urls if url and not os.path.exists(self.path(url))}
+        if len(missing) == 0:
+            return 0
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            downloaded = sum(1 for data in executor.map(self.fetch, missing) if data is not None)
+        print(f"[{datetime.datetime.now()}] Prefetched {downloaded}/{len(missing)} assets.")
+        return downloaded
+
+
+# ---------- STORE ---------- #
+
+store = AssetStore()
+
+
+def get_image(url: str) -> Optional[Image.Image]:
+    """ Get an image from the shared asset store """
+    return store.image(url)
+
+
+def require_image(url: str) -> Image.Image:
+    """ Get an image a render can't do without, a failed download fails the command """
+    image = store.image(url)
+    if image is None:
+        raise ValorantBotError(LocalErrorResponse("API", get_interaction_locale()).get("REQUEST_FAILED", ""))
+    return image
+
+
+def catalog_assets(catalog: Catalog) -> List[str]:
+    """ Get the URLs of the images drawn by the renders """
+    urls = [GetItems.get_act_rank_border(level) for level in range(1, 6)]
+    for agent in catalog.section("agents").values():
+        urls.append(agent.get("portrait"))
+        urls.append(agent.get("background"))
+    for tier in catalog.section("competitive_tiers").values():
+        urls.append(tier.get("icon"))
+        urls.append(tier.get("triangle"))
+        urls.append(tier.get("triangle_down"))
+    return [url for url in urls if url]
+
+
+def prefetch_catalog(catalog: Catalog) -> None:
+    """ Download the render assets of a catalog generation """
+    try:
+        store.prefetch(catalog_assets(catalog))
+    except Exception as e:
+        print(e)
+        print(f"[{datetime.datetime.now()}] Can't prefetch assets")
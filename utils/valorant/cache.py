@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import datetime
 import dateutil.parser
+import hashlib
 import json
 import os
 import math
-from typing import Dict, Optional
+import shutil
+import threading
+from typing import Dict, List, Optional
 
 # Standard
 import requests
@@ -13,8 +16,17 @@ import requests
 from utils.valorant import endpoint
 
 # Local
+from .assets import prefetch_catalog
+from .catalog import publish_prices, reload_catalog
 from .useful import JSON
 
+# a refresh is built here and published into data/ once it is complete
+staging_dir = "data/staging"
+staged_files = ['cache', 'conv', 'cache_meta']
+
+__refresh_lock = threading.Lock()
+__publish_lock = threading.Lock()
+
 
 def create_json(filename: str, formats: Dict) -> None:
     """ Create a json file """
@@ -38,14 +50,69 @@ def get_valorant_version() -> Optional[str]:
     return resp.json()['data']['manifestId']
 
 
-def fetch_agents() -> None:
+# ---------- SECTION REFRESH ---------- #
+
+def request_section(section: str, url: str, data: Dict, force: bool = False, key: str = None) -> Optional[requests.Response]:
+    """ Conditionally fetch a cache section, returns None when the upstream payload is unchanged """
+
+    key = key or section
+    meta = JSON.read('cache_meta', dir=staging_dir)
+    validator = meta.get(key, {})
+
+    # a section missing from the cache is always fetched
+    if section not in data:
+        force = True
+
+    headers = {}
+    if not force:
+        if validator.get('etag'):
+            headers['If-None-Match'] = validator['etag']
+        if validator.get('last_modified'):
+            headers['If-Modified-Since'] = validator['last_modified']
+
+    resp = requests.get(url, headers=headers)
+    if resp.status_code == 304:
+        print(f'[{datetime.datetime.now()}] Section is up to date: {key}')
+        return None
+    if resp.status_code != 200:
+        return resp
+
+    digest = hashlib.sha256(resp.content).hexdigest()
+    unchanged = not force and digest == validator.get('hash')
+
+    meta[key] = {
+        'etag': resp.headers.get('ETag'),
+        'last_modified': resp.headers.get('Last-Modified'),
+        'hash': digest,
+        'updated': str(datetime.datetime.now(datetime.timezone.utc)) if not unchanged else validator.get('updated')
+    }
+    JSON.save('cache_meta', meta, dir=staging_dir)
+
+    if unchanged:
+        print(f'[{datetime.datetime.now()}] Section is up to date: {key}')
+        return None
+    return resp
+
+
+def forget_section(key: str) -> None:
+    """ Drop the stored validator of a section so the next refresh refetches it """
+
+    meta = JSON.read('cache_meta', dir=staging_dir)
+    if meta.pop(key, None) is not None:
+        JSON.save('cache_meta', meta, dir=staging_dir)
+
+
+def fetch_agents(force: bool = False) -> bool:
     """ Fetch the agents from valorant-api.com """
     
     url = 'https://valorant-api.com/v1/agents?language=all&isPlayableCharacter=true'
     print(f'[{datetime.datetime.now()}] Fetching agents: {url}')
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
+
+    resp = request_section('agents', url, data, force)
+    if resp is None:
+        return False
 
-    resp = requests.get(url)
     if resp.status_code == 200:
         json = {}
         for info in resp.json()['data']:
@@ -79,17 +146,22 @@ def fetch_agents() -> None:
             json[info['uuid']]["color"] = colors
 
         data['agents'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_weapon() -> None:
+def fetch_weapon(force: bool = False) -> bool:
     """ Fetch the weapon from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
 
     url = f'https://valorant-api.com/v1/weapons?language=all'
     print(f'[{datetime.datetime.now()}] Fetching weapons: {url}')
 
-    resp = requests.get(url)
+    resp = request_section('weapons', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         for weapon in resp.json()['data']:
@@ -168,16 +240,21 @@ def fetch_weapon() -> None:
                 json[weapon['uuid']]['shop_icon'] = weapon.get("shopData", {}).get("newImage") if weapon.get("shopData", {}).get("newImage2")==None else weapon.get("shopData", {}).get("newImage2")
 
         data['weapons'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_gear() -> None:
+def fetch_gear(force: bool = False) -> bool:
     """ Fetch the skin tier from valorant-api.com """
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = 'https://valorant-api.com/v1/gear?language=all'
     print(f'[{datetime.datetime.now()}] Fetching gears: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('gears', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         for gear in resp.json()['data']:
@@ -194,18 +271,23 @@ def fetch_gear() -> None:
                 'shop_icon': gear.get("shopData", {}).get("newImage")
             }
         data['gears'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_skin() -> None:
+def fetch_skin(force: bool = False) -> bool:
     """ Fetch the skin from valorant-api.com """
     
-    data = JSON.read('cache')
-    conv = JSON.read('conv')
+    data = JSON.read('cache', dir=staging_dir)
+    conv = JSON.read('conv', dir=staging_dir)
 
     url = f'https://valorant-api.com/v1/weapons/skins?language=all'
     print(f'[{datetime.datetime.now()}] Fetching weapon skins: {url}')
 
-    resp = requests.get(url)
+    resp = request_section('skins', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         json_conv = {}
@@ -242,17 +324,22 @@ def fetch_skin() -> None:
         data['skins'] = json
         conv['skins'] = json_conv
         
-        JSON.save('cache', data)
-        JSON.save('conv', conv)
+        JSON.save('cache', data, dir=staging_dir)
+        JSON.save('conv', conv, dir=staging_dir)
+        return True
+    return False
 
-def fetch_tier() -> None:
+def fetch_tier(force: bool = False) -> bool:
     """ Fetch the skin tier from valorant-api.com """
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = 'https://valorant-api.com/v1/contenttiers/'
     print(f'[{datetime.datetime.now()}] Fetching tier skin: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('tiers', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         for tier in resp.json()['data']:
@@ -263,28 +350,33 @@ def fetch_tier() -> None:
                 'rank': tier['rank']
             }
         data['tiers'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
 def pre_fetch_price() -> None:
     """ Pre-fetch the price of all skins """
     try:
-        data = JSON.read('cache')
+        data = JSON.read('cache', dir=staging_dir)
         pre_json = {'is_price': False}
         data['prices'] = pre_json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
     except Exception as e:
         print(e)
         print(f"[{datetime.datetime.now()}] Can't fetch price")
 
-def fetch_mission() -> None:
+def fetch_mission(force: bool = False) -> bool:
     """ Fetch the mission from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/missions?language=all'
     print(f'[{datetime.datetime.now()}] Fetching mission: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('missions', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         # json['version'] = get_valorant_version()
@@ -297,17 +389,22 @@ def fetch_mission() -> None:
                 'xp': uuid['xpGrant'],
             }
         data['missions'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_playercard() -> None:
+def fetch_playercard(force: bool = False) -> bool:
     """ Fetch the player card from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/playercards?language=all'
     print(f'[{datetime.datetime.now()}] Fetching playercards: {url}')
 
-    resp = requests.get(url)
+    resp = request_section('playercards', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         payload = {}
         # json['version'] = get_valorant_version()
@@ -322,17 +419,22 @@ def fetch_playercard() -> None:
                 }
             }
         data['playercards'] = payload
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_titles() -> None:
+def fetch_titles(force: bool = False) -> bool:
     """ Fetch the player titles from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/playertitles?language=all'
     print(f'[{datetime.datetime.now()}] Fetching player titles: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('titles', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         payload = {}
         for title in resp.json()['data']:
@@ -342,17 +444,22 @@ def fetch_titles() -> None:
                 'text': title['titleText']
             }
         data['titles'] = payload
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_levelborders() -> None:
+def fetch_levelborders(force: bool = False) -> bool:
     """ Fetch the player titles from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/levelborders'
     print(f'[{datetime.datetime.now()}] Fetching player levelborders: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('levelborders', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         levelborder = {}
         for item in resp.json()['data']:
@@ -363,18 +470,22 @@ def fetch_levelborders() -> None:
                 'small_icon': item['smallPlayerCardAppearance'],
             }
         data['levelborders'] = levelborder
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_spray() -> None:
+def fetch_spray(force: bool = False) -> bool:
     """ Fetch the spray from valorant-api.com"""
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/sprays?language=all'
     print(f'[{datetime.datetime.now()}] Fetching sprays: {url}')
 
-    session = requests.session()
-    resp = requests.get(url)
+    resp = request_section('sprays', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         payload = {}
         for spray in resp.json()['data']:
@@ -386,17 +497,30 @@ def fetch_spray() -> None:
                 'animation_gif': spray.get("animationGif"),
             }
         data['sprays'] = payload
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_bundles() -> None:
+def fetch_bundles(force: bool = False) -> bool:
     """ Fetch all bundles from valorant-api.com and https://docs.valtracker.gg/bundles"""
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/bundles?language=all'
+    url_valtracker = f'https://api.valtracker.gg/bundles'
     print(f'[{datetime.datetime.now()}] Fetching bundles: {url}')
 
-    resp = requests.get(url)
+    resp = request_section('bundles', url, data, force)
+    resp2 = request_section('bundles', url_valtracker, data, force, key='bundles_valtracker')
+    if resp is None and resp2 is None:
+        return False
+    
+    # both payloads are needed to rebuild the section
+    if resp is None:
+        resp = requests.get(url)
+    if resp2 is None:
+        resp2 = requests.get(url_valtracker)
+
     if resp.status_code == 200:
         bundles = {}
         for bundle in resp.json()['data']:
@@ -412,8 +536,6 @@ def fetch_bundles() -> None:
                 'expires': None,
             }
         
-        resp2 = requests.get(f'https://api.valtracker.gg/bundles')
-        
         for bundle2 in resp2.json()['data']:
             if bundle2['uuid'] in bundles:
                 bundle = bundles[bundle2.get('uuid')]
@@ -452,17 +574,22 @@ def fetch_bundles() -> None:
                 bundle['price'] = bundle2['price']
         
         data['bundles'] = bundles
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_contracts() -> None:
+def fetch_contracts(force: bool = False) -> bool:
     """ Fetch contracts from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/contracts?language=all'
     print(f'[{datetime.datetime.now()}] Fetching contracts: {url}')
 
-    resp = requests.get(url)
+    resp = request_section('contracts', url, data, force)
+    if resp is None:
+        return False
+
     
     # IGNOR OLD BATTLE_PASS
     ignor_contract = [
@@ -492,17 +619,22 @@ def fetch_contracts() -> None:
                     'reward': contract['content']
                 }
         data['contracts'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_currencies() -> None:
+def fetch_currencies(force: bool = False) -> bool:
     """ Fetch currencies from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/currencies?language=all'
     print(f'[{datetime.datetime.now()}] Fetching currencies: {url}')
 
-    resp = requests.get(url)
+    resp = request_section('currencies', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         payload = {}
         for currencie in resp.json()['data']:
@@ -512,18 +644,23 @@ def fetch_currencies() -> None:
                 'icon': currencie['displayIcon']
             }
         data['currencies'] = payload
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_buddies() -> None:
+def fetch_buddies(force: bool = False) -> bool:
     """ Fetch all buddies from valorant-api.com """
 
-    data = JSON.read('cache')
-    conv = JSON.read('conv')
+    data = JSON.read('cache', dir=staging_dir)
+    conv = JSON.read('conv', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/buddies?language=all'
     print(f'[{datetime.datetime.now()}] Fetching buddies: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('buddies', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         payload = {}
         payload_conv = {}
@@ -538,34 +675,41 @@ def fetch_buddies() -> None:
         data['buddies'] = payload
         conv['buddies'] = payload_conv
 
-        JSON.save('cache', data)
-        JSON.save('conv', conv)
+        JSON.save('cache', data, dir=staging_dir)
+        JSON.save('conv', conv, dir=staging_dir)
+        return True
+    return False
 
 def fetch_price(data_price: Dict) -> None:
     """ Fetch the price of a skin """
 
     print(f'[{datetime.datetime.now()}] Fetching skin price')
     
-    data = JSON.read('cache')
-    payload = {}
-    for skin in data_price['Offers']:
-        offer = skin["OfferID"]
-        if  offer in data['skins'] or offer in data['sprays'] or offer in data['playercards'] or offer in data['buddies'] or offer in data['titles']:
-            *cost, = skin["Cost"].values()
-            payload[ offer] = cost[0]
-    # prices['is_price'] = True
-    data['prices'] = payload
-    JSON.save('cache', data)
-
-def fetch_maps() -> None:
+    with __publish_lock:
+        data = JSON.read('cache')
+        payload = {}
+        for skin in data_price['Offers']:
+            offer = skin["OfferID"]
+            if  offer in data['skins'] or offer in data['sprays'] or offer in data['playercards'] or offer in data['buddies'] or offer in data['titles']:
+                *cost, = skin["Cost"].values()
+                payload[ offer] = cost[0]
+        # prices['is_price'] = True
+        data['prices'] = payload
+        JSON.save('cache', data)
+    publish_prices(payload)
+
+def fetch_maps(force: bool = False) -> bool:
     """ Fetch the maps from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = 'https://valorant-api.com/v1/maps?language=all'
     print(f'[{datetime.datetime.now()}] Fetching maps: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('maps', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         for info in resp.json()['data']:
@@ -578,17 +722,22 @@ def fetch_maps() -> None:
                 'mapId': info['mapUrl']
             }
         data['maps'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_rank() -> None:
+def fetch_rank(force: bool = False) -> bool:
     """ Fetch the competitive tier from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = 'https://valorant-api.com/v1/competitivetiers?language=all'
     print(f'[{datetime.datetime.now()}] Fetching competitive tiers: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('competitive_tiers', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         for info in resp.json()['data'][len(resp.json()["data"])-1]['tiers']:
@@ -602,17 +751,22 @@ def fetch_rank() -> None:
                 'triangle_down': info['rankTriangleDownIcon']
             }
         data['competitive_tiers'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_gamemode() -> None:
+def fetch_gamemode(force: bool = False) -> bool:
     """ Fetch the gamemodes from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/gamemodes?language=all'
     print(f'[{datetime.datetime.now()}] Fetching gamemodes: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('gamemodes', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         for info in resp.json()['data']:
@@ -622,17 +776,22 @@ def fetch_gamemode() -> None:
                 'icon': info['displayIcon']
             }
         data['gamemodes'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_ceremony() -> None:
+def fetch_ceremony(force: bool = False) -> bool:
     """ Fetch the gamemodes from valorant-api.com """
     
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = f'https://valorant-api.com/v1/ceremonies?language=all'
     print(f'[{datetime.datetime.now()}] Fetching ceremonies: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('ceremonies', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         for info in resp.json()['data']:
@@ -642,16 +801,21 @@ def fetch_ceremony() -> None:
             }
 
         data['ceremonies'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_event() -> None:
+def fetch_event(force: bool = False) -> bool:
     """ Fetch the events from valorant-api.com """
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = 'https://valorant-api.com/v1/events?language=all'
     print(f'[{datetime.datetime.now()}] Fetching events: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('events', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         for info in resp.json()['data']:
@@ -663,16 +827,21 @@ def fetch_event() -> None:
                 'end': str(dateutil.parser.parse(info['endTime'])),
             }
         data['events'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
-def fetch_season() -> None:
+def fetch_season(force: bool = False) -> bool:
     """ Fetch the seasons from valorant-api.com """
-    data = JSON.read('cache')
+    data = JSON.read('cache', dir=staging_dir)
     
     url = 'https://valorant-api.com/v1/seasons?language=all'
     print(f'[{datetime.datetime.now()}] Fetching seasons: {url}')
     
-    resp = requests.get(url)
+    resp = request_section('seasons', url, data, force)
+    if resp is None:
+        return False
+
     if resp.status_code == 200:
         json = {}
         for info in resp.json()['data']:
@@ -684,7 +853,9 @@ def fetch_season() -> None:
                 'parent_uuid': info['parentUuid']
             }
         data['seasons'] = json
-        JSON.save('cache', data)
+        JSON.save('cache', data, dir=staging_dir)
+        return True
+    return False
 
 
 # def fetch_skinchromas() -> None:
@@ -694,7 +865,6 @@ def fetch_season() -> None:
 
 #     data = JSON.read('skinchromas')
 #     session = requests.session()
-
 #     print('Fetching season !')
 
 #     resp = session.get('https://valorant-api.com/v1/weapons/skinchromas?language=all')
@@ -716,35 +886,108 @@ def fetch_season() -> None:
 
 #     session.close()
 
+# fetchers by cache section, in refresh order
+section_fetchers = {
+    'agents': fetch_agents,
+    'weapons': fetch_weapon,
+    'gears': fetch_gear,
+    'skins': fetch_skin,
+    'tiers': fetch_tier,
+    'bundles': fetch_bundles,
+    'playercards': fetch_playercard,
+    'currencies': fetch_currencies,
+    'titles': fetch_titles,
+    'levelborders': fetch_levelborders,
+    'sprays': fetch_spray,
+    'buddies': fetch_buddies,
+    'missions': fetch_mission,
+    'contracts': fetch_contracts,
+    'maps': fetch_maps,
+    'competitive_tiers': fetch_rank,
+    'ceremonies': fetch_ceremony,
+    'events': fetch_event,
+    'seasons': fetch_season,
+    'gamemodes': fetch_gamemode,
+    # 'chromas': fetch_skinchromas, # next update
+}
+
+
+# ---------- STAGING ---------- #
+
+def stage_cache() -> None:
+    """ Copy the published cache files into the staging directory """
+
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir, exist_ok=True)
+    for filename in staged_files:
+        if os.path.exists(f"data/{filename}.json"):
+            shutil.copyfile(f"data/{filename}.json", f"{staging_dir}/{filename}.json")
+        else:
+            JSON.save(filename, {}, dir=staging_dir)
+
+
+def publish_cache(reset_prices: bool) -> None:
+    """ Move a complete staged cache into data/ """
+
+    with __publish_lock:
+        # prices fetched while the refresh was running are kept, unless the refresh reset them
+        if not reset_prices:
+            data = JSON.read('cache', dir=staging_dir)
+            data['prices'] = JSON.read('cache').get('prices', data.get('prices', {}))
+            JSON.save('cache', data, dir=staging_dir)
+
+        # the cache file goes last, its mtime is what marks the catalog shards outdated
+        for filename in reversed(staged_files):
+            os.replace(f"{staging_dir}/{filename}.json", f"data/{filename}.json")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def update_cache(bot_version: str, force: bool = False) -> List[str]:
+    """ Refresh the cache section by section, returns the sections that changed """
+
+    # one refresh at a time, a second caller waits and then refreshes on top of the first
+    with __refresh_lock:
+        return __update_cache(bot_version, force)
+
+
+def __update_cache(bot_version: str, force: bool) -> List[str]:
+    valorant_version = get_valorant_version()
+    stage_cache()
+
+    changed = []
+    for section, fetcher in section_fetchers.items():
+        try:
+            if fetcher(force):
+                changed.append(section)
+        except Exception as e:
+            print(e)
+            print(f"[{datetime.datetime.now()}] Can't fetch section: {section}")
+            forget_section(section)
+            if section == 'bundles':
+                forget_section('bundles_valtracker')
+    
+    # skin prices are keyed by skin, so they are refetched whenever skins change
+    reset_prices = force or 'skins' in changed
+    if reset_prices:
+        pre_fetch_price()
+
+    data = JSON.read('cache', dir=staging_dir)
+    data['valorant_version'] = valorant_version
+    data['bot_version'] = bot_version
+    JSON.save('cache', data, dir=staging_dir)
+
+    # the catalog is only rebuilt from a complete cache, commands keep the current generation until then
+    publish_cache(reset_prices)
+    catalog = reload_catalog()
+
+    # renders rarely wait on the network for icons the catalog knows about, login doesn't wait for the downloads
+    threading.Thread(target=prefetch_catalog, args=(catalog,), name="asset-prefetch", daemon=True).start()
+    print(f"[{datetime.datetime.now()}] *** Updated Cache: {', '.join(changed) if changed else 'no changes'} ***")
+    return changed
+
+
 def get_cache(bot_version: str) -> None:
     """ Get all cache from valorant-api.com """
     
-    create_json('cache', {
-        "valorant_version": get_valorant_version(),
-        "bot_version": bot_version
-    })
-    
-    fetch_agents()
-    fetch_weapon()
-    fetch_gear()
-    fetch_skin()
-    fetch_tier()
-    pre_fetch_price()
-    fetch_bundles()
-    fetch_playercard()
-    fetch_currencies()
-    fetch_titles()
-    fetch_levelborders()
-    fetch_spray()
-    fetch_buddies()
-    fetch_mission()
-    fetch_contracts()
-    fetch_maps()
-    fetch_rank()
-    fetch_ceremony()
-    fetch_event()
-    fetch_season()
-    fetch_gamemode()
-    # fetch_skinchromas() # next update
-    
+    update_cache(bot_version, force=True)
     print(f"[{datetime.datetime.now()}] *** Loaded Cache ***")
@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import marshal
+import os
+import re
+import shutil
+import struct
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import dateutil.parser
+
+import utils.config as Config
+
+catalog_dir = "data/catalog"
+default_language = "en-US"
+locale_pattern = re.compile(r"^[a-z]{2}-[A-Z]{2}$")
+# string table builds kept on disk, older generations may still be serving commands
+kept_builds = 3
+
+# ---------- LOCALE SHARDS ---------- #
+
+def is_localized(value: Any) -> bool:
+    """ Check if a cache value is a per-locale string dictionary """
+    return isinstance(value, dict) and default_language in value and all(locale_pattern.match(key) for key in value)
+
+
+class StringTables:
+    """ Per-locale string tables, loaded on first use of a locale """
+
+    def __init__(self, available: List[str], languages: Optional[List[str]] = None, build: str = "") -> None:
+        self.available: List[str] = available
+        self.build: str = build
+        self.configure(languages)
+
+    def configure(self, languages: Optional[List[str]] = None) -> None:
+        """ Set the served locales, None serves every locale that was fetched """
+        self.languages: List[str] = list(self.available) if languages is None else [lang for lang in languages if lang in self.available]
+        if default_language not in self.languages:
+            self.languages.append(default_language)
+
+        self.__tables: Dict[str, List[Optional[str]]] = {}
+        self.__lock = threading.Lock()
+
+    def resolve(self, locale: str) -> str:
+        """ Get the locale actually served for locale """
+        return locale if locale in self.languages else default_language
+
+    def table(self, locale: str) -> List[Optional[str]]:
+        locale = self.resolve(locale)
+        table = self.__tables.get(locale)
+        if table is None:
+            with self.__lock:
+                table = self.__tables.get(locale)
+                if table is None:
+                    try:
+                        with open(f"{catalog_dir}/lang/{self.build}/{locale}.json", "r", encoding="utf-8") as json_file:
+                            table = json.load(json_file)
+                    except (FileNotFoundError, json.JSONDecodeError):
+                        table = []
+                    self.__tables[locale] = table
+        return table
+
+    def text(self, index: int, locale: str) -> Optional[str]:
+        table = self.table(locale)
+        value = table[index] if index < len(table) else None
+        if value is None and self.resolve(locale) != default_language:
+            return self.text(index, default_language)
+        return value
+
+    def loaded(self) -> List[str]:
+        return list(self.__tables)
+
+
+class LocalizedText(Mapping):
+    """ A localized string of the catalog, behaves like the original `{locale: text}` dictionary """
+
+    __slots__ = ("tables", "index")
+
+    def __init__(self, tables: StringTables, index: int) -> None:
+        self.tables = tables
+        self.index = index
+
+    def __getitem__(self, locale: str) -> Optional[str]:
+        return self.tables.text(self.index, locale)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tables.available)
+
+    def __len__(self) -> int:
+        return len(self.tables.available)
+
+    def __contains__(self, locale: object) -> bool:
+        return locale in self.tables.available
+
+    def __repr__(self) -> str:
+        return repr(self[default_language])
+
+
+def build_catalog_shards() -> None:
+    """ Split data/cache.json into a locale-neutral core, per-locale string tables and a binary snapshot """
+
+    data = __read("cache")
+    if not is_complete(data):
+        print(f"[{datetime.datetime.now()}] Cache is not built yet, keeping the current catalog shards.")
+        return
+
+    entries: List[Dict[str, str]] = []
+
+    def split(value: Any) -> Any:
+        if is_localized(value):
+            entries.append(value)
+            return {"$t": len(entries) - 1}
+        elif isinstance(value, dict):
+            return {key: split(item) for key, item in value.items()}
+        elif isinstance(value, list):
+            return [split(item) for item in value]
+        return value
+
+    core = split(data)
+    locales = sorted({locale for entry in entries for locale in entry})
+    if default_language not in locales:
+        locales.append(default_language)
+
+    # string tables go to a new build directory, so a catalog generation still serving
+    # commands keeps reading the tables its core was split against
+    build = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
+    os.makedirs(f"{catalog_dir}/lang/{build}", exist_ok=True)
+    for locale in locales:
+        __write(f"lang/{build}/{locale}", [entry.get(locale) for entry in entries])
+    __write("lang/index", {"build": build, "locales": locales})
+    __write("core", core)
+    write_snapshot(core, __read("conv"), locales, build)
+    __prune_builds()
+
+    print(f"[{datetime.datetime.now()}] Built catalog shards: {len(entries)} strings in {len(locales)} locales.")
+
+
+def __write(filename: str, data: Any) -> None:
+    """ Write a shard atomically """
+    path = f"{catalog_dir}/{filename}.json"
+    with open(path + ".tmp", "w", encoding="utf-8") as json_file:
+        json.dump(data, json_file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+
+
+def __prune_builds() -> None:
+    """ Remove string table builds older than the last few """
+    builds = []
+    for entry in os.scandir(f"{catalog_dir}/lang"):
+        if entry.is_dir():
+            builds.append(entry.name)
+        elif entry.name != "index.json":
+            # tables of the flat layout before builds
+            os.remove(entry.path)
+
+    for build in sorted(builds)[:-kept_builds]:
+        shutil.rmtree(f"{catalog_dir}/lang/{build}", ignore_errors=True)
+
+
+def is_complete(data: Dict) -> bool:
+    """ Check if a cache was fully built, a fresh or failed cache must not replace the shards """
+    return bool(data.get("valorant_version")) and bool(data.get("skins"))
+
+
+def __shards_outdated() -> bool:
+    try:
+        return os.path.getmtime("data/cache.json") > os.path.getmtime(f"{catalog_dir}/core.json")
+    except FileNotFoundError:
+        return os.path.exists("data/cache.json")
+
+
+def __read_core() -> Tuple[Dict, Dict, StringTables]:
+    """ Read the JSON core, the fallback of the binary snapshot """
+    try:
+        with open(f"{catalog_dir}/lang/index.json", "r", encoding="utf-8") as json_file:
+            index = json.load(json_file)
+        tables = StringTables(index["locales"], build=index["build"])
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+        tables = StringTables([])
+
+    def hook(value: Dict) -> Any:
+        if len(value) == 1 and "$t" in value:
+            return LocalizedText(tables, value["$t"])
+        return value
+
+    try:
+        with open(f"{catalog_dir}/core.json", "r", encoding="utf-8") as json_file:
+            core = json.load(json_file, object_hook=hook)
+    except (FileNotFoundError, json.JSONDecodeError):
+        core = {}
+    return core, __read("conv"), tables
+
+
+# ---------- SNAPSHOT ---------- #
+
+snapshot_magic = b"VLRCATALOG"
+snapshot_version = 3
+
+
+def bind_tables(value: Any, tables: StringTables) -> Any:
+    """ Replace the `{"$t": index}` references of the core with LocalizedText """
+    if isinstance(value, dict):
+        if len(value) == 1 and "$t" in value:
+            return LocalizedText(tables, value["$t"])
+        return {key: bind_tables(item, tables) for key, item in value.items()}
+    elif isinstance(value, list):
+        return [bind_tables(item, tables) for item in value]
+    return value
+
+
+def write_snapshot(core: Dict, conv: Dict, locales: List[str], build: str) -> None:
+    """ Write the core as checksummed marshal data that loads without JSON parsing """
+
+    # marshal only holds plain values, unlike pickle nothing in data/ can run code on load
+    payload = marshal.dumps({"locales": locales, "build": build, "core": core, "conv": conv})
+    header = snapshot_magic + struct.pack("<I", snapshot_version) + hashlib.sha256(payload).digest()
+
+    path = f"{catalog_dir}/snapshot.bin"
+    with open(path + ".tmp", "wb") as snapshot_file:
+        snapshot_file.write(header + payload)
+    os.replace(path + ".tmp", path)
+
+
+def read_snapshot() -> Optional[Tuple[Dict, Dict, StringTables]]:
+    """ Read the binary snapshot, None when it is missing, outdated or corrupted """
+
+    path = f"{catalog_dir}/snapshot.bin"
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(f"{catalog_dir}/core.json"):
+            return None
+    except FileNotFoundError:
+        if not os.path.exists(path):
+            return None
+
+    try:
+        with open(path, "rb") as snapshot_file:
+            raw = snapshot_file.read()
+
+        offset = len(snapshot_magic)
+        magic, version = raw[:offset], struct.unpack("<I", raw[offset:offset + 4])[0]
+        digest, payload = raw[offset + 4:offset + 36], raw[offset + 36:]
+        if magic != snapshot_magic or version != snapshot_version or hashlib.sha256(payload).digest() != digest:
+            print(f"[{datetime.datetime.now()}] Catalog snapshot failed the integrity check, falling back to JSON.")
+            return None
+
+        snapshot = marshal.loads(payload)
+        tables = StringTables(snapshot["locales"], build=snapshot["build"])
+        return bind_tables(snapshot["core"], tables), snapshot["conv"], tables
+    except Exception as e:
+        print(e)
+        print(f"[{datetime.datetime.now()}] Can't read catalog snapshot, falling back to JSON.")
+        return None
+
+# ---------- CATALOG ---------- #
+
+class Catalog(Mapping):
+    """ Read-only, indexed view of the cache built from the catalog shards """
+
+    def __init__(self, data: Dict, conv: Dict = None, generation: int = 0, tables: StringTables = None) -> None:
+        self.data: Dict = data
+        self.conv: Dict = conv or {}
+        self.generation: int = generation
+        self.tables: Optional[StringTables] = tables
+        self.created: datetime.datetime = datetime.datetime.now()
+
+        self.__build_indexes()
+
+    # mapping interface, so that `cache["skins"]` keeps working for callers
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def section(self, name: str) -> Dict:
+        """ Get a cache section, empty if missing """
+        return self.data.get(name) or {}
+
+    # ---------- INDEXES ---------- #
+
+    def __build_indexes(self) -> None:
+        """ Build lookup indexes from the raw cache """
+
+        # skin level / chroma / base skin uuid -> skin entry uuid
+        self.skin_index: Dict[str, str] = {}
+        for uuid, skin in self.section("skins").items():
+            self.skin_index[uuid] = uuid
+            if skin.get("skin_uuid"):
+                self.skin_index[skin["skin_uuid"]] = uuid
+            for level in skin.get("levels", {}):
+                self.skin_index.setdefault(level, uuid)
+            for chroma in skin.get("chromas", {}):
+                self.skin_index.setdefault(chroma, uuid)
+        for base, uuid in self.conv.get("skins", {}).items():
+            self.skin_index.setdefault(base, uuid)
+
+        # buddy uuid -> buddy level uuid
+        self.buddy_index: Dict[str, str] = {uuid: uuid for uuid in self.section("buddies")}
+        for base, uuid in self.conv.get("buddies", {}).items():
+            self.buddy_index.setdefault(base, uuid)
+
+        # map path (mapId) -> map uuid
+        self.map_index: Dict[str, str] = {}
+        for uuid, map in self.section("maps").items():
+            if map.get("mapId"):
+                self.map_index[map["mapId"]] = uuid
+
+        # event / season intervals
+        self.event_intervals: List[Tuple[datetime.datetime, datetime.datetime, str]] = self.__intervals(self.section("events"))
+        self.season_intervals: List[Tuple[datetime.datetime, datetime.datetime, str]] = self.__intervals(
+            {uuid: season for uuid, season in self.section("seasons").items() if season.get("parent_uuid") is not None}
+        )
+
+    def __intervals(self, section: Dict) -> List[Tuple[datetime.datetime, datetime.datetime, str]]:
+        ret = []
+        for uuid, item in section.items():
+            try:
+                start, end = dateutil.parser.parse(item["start"]), dateutil.parser.parse(item["end"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            ret.append((start, end, uuid))
+        ret.sort()
+        return ret
+
+    # ---------- ACCESSORS ---------- #
+
+    def get_skin(self, uuid: str) -> Optional[Dict]:
+        """ Get skin by skin, level or chroma uuid """
+        key = self.skin_index.get(uuid)
+        if key is None:
+            return None
+        return self.section("skins").get(key)
+
+    def get_buddy(self, uuid: str) -> Optional[Dict]:
+        """ Get buddy by buddy or buddy level uuid """
+        key = self.buddy_index.get(uuid)
+        if key is None:
+            return None
+        return self.section("buddies").get(key)
+
+    def get_map_uuid(self, map_id: str) -> Optional[str]:
+        """ Get map uuid by map path """
+        return self.map_index.get(map_id)
+
+    def get_current_events(self, date: datetime.datetime = None) -> List[str]:
+        """ Get the uuids of events running at date """
+        if date is None:
+            date = datetime.datetime.now(datetime.timezone.utc)
+        return [uuid for start, end, uuid in self.event_intervals if start <= date <= end]
+
+    def get_active_season(self, date: datetime.datetime = None) -> Optional[Dict]:
+        """ Get the act running at date """
+        if date is None:
+            date = datetime.datetime.now(datetime.timezone.utc)
+        for start, end, uuid in self.season_intervals:
+            if start <= date <= end:
+                return self.section("seasons").get(uuid)
+        return None
+
+
+# ---------- GENERATION ---------- #
+
+__catalog: Optional[Catalog] = None
+__generation: int = 0
+__lock = threading.Lock()
+
+
+def __read(filename: str) -> Dict:
+    try:
+        with open(f"data/{filename}.json", "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def reload_catalog() -> Catalog:
+    """ Load data/cache.json into a new catalog generation and publish it """
+    global __catalog, __generation
+
+    with __lock:
+        if __shards_outdated():
+            build_catalog_shards()
+
+        loaded = read_snapshot() or __read_core()
+        core, conv, tables = loaded
+        tables.configure(Config.LoadConfig().get("catalog-languages"))
+        catalog = Catalog(core, conv, __generation + 1, tables)
+        __generation = catalog.generation
+        __catalog = catalog
+
+    print(f"[{datetime.datetime.now()}] Loaded catalog generation {catalog.generation}.")
+    return catalog
+
+
+def publish_prices(prices: Dict) -> Catalog:
+    """ Publish new prices as a new generation sharing everything else, the shards catch up on the next reload """
+    global __catalog, __generation
+
+    with __lock:
+        current = __catalog
+        if current is not None:
+            catalog = Catalog({**current.data, "prices": prices}, current.conv, __generation + 1, current.tables)
+            __generation = catalog.generation
+            __catalog = catalog
+            return catalog
+    return reload_catalog()
+
+
+def get_catalog() -> Catalog:
+    """ Get the current catalog generation """
+    catalog = __catalog
+    if catalog is None:
+        catalog = reload_catalog()
+    return catalog
+
+
+@Config.settings.subscribe
+def __languages_changed(old: Config.Settings, new: Config.Settings) -> None:
+    """ Serve a changed `catalog-languages` from a new generation """
+    if __catalog is not None and old.get("catalog-languages") != new.get("catalog-languages"):
+        reload_catalog()
+
+
+if __name__ == "__main__":
+    # build the catalog shards and snapshot offline, e.g. while building a container image:
+    #   python -m utils.valorant.catalog [--fetch]
+    import sys
+
+    if "--fetch" in sys.argv:
+        from bot import bot_option
+        from .cache import get_cache
+        get_cache(bot_option["version"])
+    else:
+        build_catalog_shards()
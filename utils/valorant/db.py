@@ -7,6 +7,7 @@ from typing import Any, Dict, Optional
 
 from .auth import Auth
 from .cache import fetch_price
+from .catalog import get_catalog, reload_catalog
 from .local import verify_localcode, LocalErrorResponse
 from .useful import JSON
 from ..errors import DatabaseError
@@ -44,6 +45,7 @@ class DATABASE:
     def insert_cache(self, data: Dict) -> None:
         """ Insert cache """
         JSON.save('cache', data)
+        reload_catalog()
     
     async def is_login(self, user_id: int, response: Dict) -> Optional[Dict[str, Any]]:
         """Check if user is logged in"""
@@ -300,7 +302,7 @@ class DATABASE:
     def insert_skin_price(self, skin_price: Dict, force=False) -> None:
         """Insert skin price to cache """
         
-        cache = self.read_cache()
+        cache = get_catalog()
         price = cache['prices']
         check_price = price.get('is_price', None)
         if check_price is False or force:
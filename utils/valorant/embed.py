@@ -2,7 +2,7 @@ from __future__ import annotations
 from operator import itemgetter
 
 import re
-import io, os, asyncio, concurrent.futures
+import io, os, asyncio, concurrent.futures, contextvars
 import json
 from pathlib import Path
 import numpy as np
@@ -16,7 +16,7 @@ from datetime import datetime, timedelta, timezone
 from urllib import request
 import dateutil.parser
 from tracemalloc import start
-from typing import Any, Dict, List, TYPE_CHECKING, Union
+from typing import Any, Dict, List, Optional, TYPE_CHECKING, Union
 from unittest import result
 
 from utils.errors import (
@@ -28,11 +28,16 @@ from discord.utils import MISSING
 from discord import app_commands, Interaction, ui, File
 import matplotlib.pyplot as plt
 
+from . import pipeline
+from .assets import require_image
+from .catalog import get_catalog
 from .endpoint import API_ENDPOINT
 
 import utils.config as Config
 from utils.valorant import view as View
-from .useful import (calculate_level_xp, format_relative, GetEmoji, GetFormat, GetImage, iso_to_time, format_timedelta, JSON)
+from .template import formatter, LazyFields, render
+from .useful import (calculate_level_xp, format_relative, GetEmoji, GetFormat, GetImage, GetItems, iso_to_time, format_timedelta, JSON)
+from .emojis import registry as emoji_registry
 from ..locale_v2 import ValorantTranslator
 
 VLR_locale = ValorantTranslator()
@@ -40,10 +45,16 @@ VLR_locale = ValorantTranslator()
 if TYPE_CHECKING:
     from bot import ValorantBot
 
+# rendered storefront skin embeds, shared by every /store and store notification
+storefront_embeds: Dict[tuple, discord.Embed] = {}
+
+# article embeds without the localized category, keyed by article url and description length
+article_embeds: Dict[tuple, discord.Embed] = {}
+
 
 class Embed(discord.Embed):  # Custom Embed
-    def __init__(self, description: str = None, color: Union[discord.Color, int] = Config.GetColor("default"), **kwargs: Any) -> None:
-        super().__init__(description=description, color=color, **kwargs)
+    def __init__(self, description: str = None, color: Union[discord.Color, int] = None, **kwargs: Any) -> None:
+        super().__init__(description=description, color=color if color is not None else Config.GetColor("default"), **kwargs)
 
 
 class GetEmbed:
@@ -85,6 +96,27 @@ class GetEmbed:
         
         return embeds
     
+    @classmethod
+    def __skin_embed(cls, uuid: str, locale: str, response: Dict, bot: ValorantBot) -> discord.Embed:
+        """ Get the storefront embed of a skin, rendered once per locale, response and emoji set """
+        key = (uuid, locale, response.get("SKIN"), response.get("VIDEO"), emoji_registry.get(bot).generation, Config.GetColor("items"))
+        embed = storefront_embeds.get(key)
+        if embed is None:
+            skin = GetItems.get_skin(uuid)
+            skin = dict(uuid=uuid, name=skin['names'][locale], icon=skin['icon'], price=GetItems.get_skin_price(uuid), video=skin.get('video'), levels=skin.get('levels', {}))
+            embed = cls.__giorgio_embed(skin, bot, response)
+
+            # old generations are never asked for again
+            if len(storefront_embeds) >= 4096:
+                storefront_embeds.clear()
+            storefront_embeds[key] = embed
+        return embed.copy()
+
+    @classmethod
+    def storefront(cls, offer: Dict, response: Dict, locale: str, bot: ValorantBot) -> List[discord.Embed]:
+        """ Get the embeds of the skins in a storefront """
+        return [cls.__skin_embed(uuid, locale, response, bot) for uuid in offer["SkinsPanelLayout"]["SingleItemOffers"]]
+
     def __giorgio_embed(skin: Dict, bot: ValorantBot, response: Dict) -> discord.Embed:
         """EMBED DESIGN Giorgio"""
         
@@ -120,30 +152,44 @@ class GetEmbed:
         embed.set_thumbnail(url=icon)
         return embed
     
-    def article_embed(article: Dict, response: Dict) -> discord.Embed:
+    def article_summary(url: str, length: int) -> str:
+        """Fetch an article page and cut its text to length (blocking)"""
         body = ""
-        lines = Config.LoadConfig().get("article", {}).get("description", 150)
-
         try:
-            html = requests.get(article.get("url")).content
+            html = requests.get(url, timeout=10).content
             soup = BeautifulSoup(html, 'html.parser')
 
             elems = soup.find_all(["p", "li"])
             for elem in elems:
                 body += elem.get_text().replace("\n", "") + " "
-                if len(body)>lines:
-                    body = body[:lines] + " ..."
+                if len(body)>length:
+                    body = body[:length] + " ..."
                     break
         except:
             pass
+        return body
 
-        embed = discord.Embed(
-            title = article.get("title"),
-            description=body,
-            url = article.get("external_link") or article.get("url"),
-            timestamp = dateutil.parser.parse(article["date"])
-        )
-        embed.set_image(url = article.get("banner_url"))
+    def article_template(article: Dict) -> discord.Embed:
+        """Article embed without the category, the page is fetched once per article (blocking on first use)"""
+        lines = Config.LoadConfig().get("article", {}).get("description", 150)
+        key = (article.get("url"), lines)
+
+        embed = article_embeds.get(key)
+        if embed is None:
+            embed = discord.Embed(
+                title = article.get("title"),
+                description=GetEmbed.article_summary(article.get("url"), lines),
+                url = article.get("external_link") or article.get("url"),
+                timestamp = dateutil.parser.parse(article["date"])
+            )
+            embed.set_image(url = article.get("banner_url"))
+            if len(article_embeds) >= 256:
+                article_embeds.clear()
+            article_embeds[key] = embed
+        return embed
+
+    def article_embed(article: Dict, response: Dict) -> discord.Embed:
+        embed = GetEmbed.article_template(article).copy()
         embed.set_author(name = response.get("CATEGORY", {}).get(article.get("category", "")))
         return embed
 
@@ -153,15 +199,13 @@ class GetEmbed:
         
         store_response = response.get('RESPONSE')
         
-        data = GetFormat.offer_format(offer)
-        
-        duration = data.pop('duration')
+        duration = offer["SkinsPanelLayout"]["SingleItemOffersRemainingDurationInSeconds"]
         
         description = store_response.format(username=player, duration=format_relative(datetime.utcnow() + timedelta(seconds=duration)))
         
         embed = Embed(description)
         embeds = [embed]
-        [embeds.append(cls.__giorgio_embed(data[skin], bot, response)) for skin in data]
+        embeds.extend(cls.storefront(offer, response, str(VLR_locale), bot))
         
         return embeds
     
@@ -230,7 +274,7 @@ class GetEmbed:
         # language
         title_point = response.get('POINT')
         
-        cache = JSON.read('cache')
+        cache = get_catalog()
         point = cache['currencies']
         
         vp_uuid = '85ad13f7-3d1b-5128-9eb2-7cd8ee0b5741'
@@ -265,7 +309,7 @@ class GetEmbed:
             self.response: Dict = response
             self.endpoint: API_ENDPOINT = endpoint
             self.bot: ValorantBot = getattr(interaction, "client", interaction._state._get_client())
-            self.cache = JSON.read('cache')
+            self.cache = get_catalog()
             self.color: str
             self.is_private_message: bool = is_private_message
             self.match_info: Dict
@@ -275,14 +319,21 @@ class GetEmbed:
             self.temp_embeds: Dict = {}
             self.temp_files: Dict = {}
             self.embeds: List[List[discord.Embed]] = []
+            self.player_fields: Dict[str, LazyFields] = {}
+
+        def format_player(self, format: str, puuid: str) -> str:
+            """ Format player data, the fields of a player are shared by every template of the match """
+            fields = self.player_fields.get(puuid)
+            if fields is None:
+                fields = GetFormat.match_playerdata_fields(self.match_info["players"], puuid, self.match_id, self.bot)
+                self.player_fields[puuid] = fields
+            return GetFormat.format_match_playerdata(format, self.match_info["players"], puuid, self.match_id, self.bot, fields)
 
         def build_graph(self, filename: str) -> discord.File:
             rounds = self.match_info["rounds"]
             teamA = self.match_info["match_info"]["teamA"]
-            teamB = self.match_info["match_info"]["teamB"]
 
-            f = Config.LoadConfig().get("commands", {}).get("match", {}).get("font", {}).get("graph-regular")
-            font_regular = GetImage.find_font(f[0], f[1])
+            font_regular = Config.LoadConfig().match_font("graph-regular")
 
             # create graph
             plt.figure(figsize=(15, 3), dpi=300)
@@ -291,12 +342,8 @@ class GetEmbed:
 
             # add a lines
             y = [-30000, -20000, -10000, 0, 10000, 20000, 30000]
-            x, y_m = [], []
+            x, y_m = [r["number"] for r in rounds], self.match_info["match_info"]["economy"]
             for r in rounds:
-                x.append(r["number"])
-                money = (r["economy"][teamA]["remain"]-r["economy"][teamB]["remain"]) + (r["economy"][teamA]["loadout"]-r["economy"][teamB]["loadout"])
-                y_m.append(money)
-
                 if r["win"]==teamA:
                     ax.axvspan(r["number"]-0.5, r["number"]+0.5, color="#3cb371", alpha=0.1)
                 else:
@@ -342,33 +389,17 @@ class GetEmbed:
             teamA = self.match_info["match_info"]["teamA"]
             teamB = self.match_info["match_info"]["teamB"]
 
-            f = Config.LoadConfig().get("commands", {}).get("match", {}).get("font", {}).get("heatmap-bold")
-            font_bold = GetImage.find_font(f[0], f[1])
-            f = Config.LoadConfig().get("commands", {}).get("match", {}).get("font", {}).get("heatmap-regular")
-            font_regular = GetImage.find_font(f[0], f[1])
+            config = Config.LoadConfig()
+            font_bold = config.match_font("heatmap-bold")
+            font_regular = config.match_font("heatmap-regular")
 
             # create graph
             plt.figure(figsize=(15, 15), dpi=300)
             plt.style.use("dark_background")
             
             # get value
-            array_detail = [[{"a": 0, "b": 0} for i in range(5)] for j in range(5)]
-            array_data = [[0]*5  for i in range(5)]
-
-            y = 0
-            for kp in teams[teamA]["players"]:
-                for name,times in players[kp].get("kill_list", {}).items():
-                    if name in teams[teamB]["players"]:
-                        x = teams[teamB]["players"].index(name)
-                        array_data[y][x] += times
-                        array_detail[y][x]["a"] = times
-
-                for name,times in players[kp].get("killed_list", {}).items():
-                    if name in teams[teamB]["players"]:
-                        x = teams[teamB]["players"].index(name)
-                        array_data[y][x] -= times
-                        array_detail[y][x]["b"] = times
-                y = y + 1
+            heatmap = self.match_info["match_info"]["heatmap"]
+            array_data = heatmap["data"]
 
             # draw heatmap
             fig, ax = plt.subplots()
@@ -393,7 +424,7 @@ class GetEmbed:
                     ax.text(
                         x,
                         y+0.2,
-                        "{a} - {b}".format(a=array_detail[y][x]["a"], b=array_detail[y][x]["b"]),
+                        "{a} - {b}".format(a=heatmap["kills"][y][x], b=heatmap["deaths"][y][x]),
                         verticalalignment="center",
                         horizontalalignment="center",
                         color="Black",
@@ -403,7 +434,7 @@ class GetEmbed:
                     )
             
             # ticks
-            cache = JSON.read("cache")
+            cache = get_catalog()
 
             ls = []
             for player in teams[teamA]["players"]:
@@ -437,18 +468,14 @@ class GetEmbed:
             size = (1920, 1080)
             cache = self.cache
             config = Config.LoadConfig()
-            colors = config.get("commands", {}).get("match", {}).get("color", {})
+            match_color = config.match_color
 
             layer = [None, None]
 
-            f = config.get("commands", {}).get("match", {}).get("font", {}).get("stats-title")
-            font_impact = GetImage.find_font(f[0], f[1])
-            f = config.get("commands", {}).get("match", {}).get("font", {}).get("stats-regular")
-            font_regular = GetImage.find_font(f[0], f[1])
-            f = config.get("commands", {}).get("match", {}).get("font", {}).get("stats-bold")
-            font_bold = GetImage.find_font(f[0], f[1])
-            f = config.get("commands", {}).get("match", {}).get("font", {}).get("stats-player")
-            font_player = GetImage.find_font(f[0], f[1])
+            font_impact = config.match_font("stats-title")
+            font_regular = config.match_font("stats-regular")
+            font_bold = config.match_font("stats-bold")
+            font_player = config.match_font("stats-player")
 
             def make_gradient(img: Image) -> Image:
                 gradient = Image.new('L', (1, 256))
@@ -467,21 +494,21 @@ class GetEmbed:
                     enemy_team = t["id"]
             
             if res:
-                score_color = ["#" + GetImage.convert_hex(colors.get("victory-text")), "#" + GetImage.convert_hex(colors.get("defeat-text"))]
+                score_color = [match_color("victory-text").hex, match_color("defeat-text").hex]
                 if teams[team]["win"]:
                     result_str = self.response.get("TEAM_STATS", {}).get("VICTORY")
-                    result_color = "#" + GetImage.convert_hex(colors.get("victory-text"))
+                    result_color = match_color("victory-text").hex
                     winner_score = teams[team]["point"]
                     loser_score = teams[enemy_team]["point"]
                 else:
                     result_str = self.response.get("TEAM_STATS", {}).get("DEFEAT")
-                    result_color = "#" + GetImage.convert_hex(colors.get("defeat-text"))
+                    result_color = match_color("defeat-text").hex
                     winner_score = teams[enemy_team]["point"]
                     loser_score = teams[team]["point"]
             else:
-                score_color = ["#" + GetImage.convert_hex(colors.get("draw-text")), "#" + GetImage.convert_hex(colors.get("draw-text"))]
+                score_color = [match_color("draw-text").hex, match_color("draw-text").hex]
                 result_str = self.response.get("TEAM_STATS", {}).get("DRAW")
-                result_color = "#" + GetImage.convert_hex(colors.get("draw-text"))
+                result_color = match_color("draw-text").hex
                 winner_score = teams[team]["point"]
                 loser_score = teams[enemy_team]["point"]
 
@@ -519,45 +546,43 @@ class GetEmbed:
 
                     # portrait
                     agent = cache["agents"][player["agent_id"]]
-                    self.endpoint.download(agent['portrait'], f"resources/temp/{team_color}_agent_portrait.png")
-                    portrait = Image.open(f"resources/temp/{team_color}_agent_portrait.png")
+                    portrait = require_image(agent['portrait'])
                     portrait = portrait.resize((int(portrait.width * coordinate[i]["scale"]), int(portrait.height * coordinate[i]["scale"])))
                     base = GetImage.paste_centered(base, portrait, (coordinate[i]["x"], coordinate[i]["y"]))
 
                     # stats base
-                    stats_base = Image.new('RGB', (300, 270), GetImage.convert_color(colors.get("base")))
+                    stats_base = Image.new('RGB', (300, 270), match_color("base").rgb)
                     stats_base.putalpha(int(255 * 0.8))
                     base = GetImage.paste_centered(base, stats_base, (coordinate_stats[i]["x"], coordinate_stats[i]["y"]))
 
-                    stats_lux = Image.new('RGB', (300, 1), GetImage.convert_color(colors.get("text")))
+                    stats_lux = Image.new('RGB', (300, 1), match_color("text").rgb)
                     stats_lux.putalpha(int(255 * 0.8))
                     base = GetImage.paste_centered(base, stats_lux, (coordinate_stats[i]["x"], coordinate_stats[i]["y"]-135))
 
-                    stats_lux = Image.new('RGB', (8, 8), GetImage.convert_color(colors.get("text")))
+                    stats_lux = Image.new('RGB', (8, 8), match_color("text").rgb)
                     stats_lux.putalpha(255)
                     stats_lux = stats_lux.rotate(45, expand=True)
                     base = GetImage.paste_centered(base, stats_lux, (coordinate_stats[i]["x"], coordinate_stats[i]["y"]-135))
 
                     if i==len(teams[team]["players"])-1:
-                        stats_base = Image.new('RGB', (300, 135), GetImage.convert_color(colors.get("point")))
+                        stats_base = Image.new('RGB', (300, 135), match_color("point").rgb)
                         stats_base = make_gradient(stats_base)
                         base = GetImage.paste_centered(base, stats_base, (coordinate_stats[i]["x"], coordinate_stats[i]["y"] + stats_base.height/2))
 
                         # mvp square
-                        stats_base = Image.new('RGB', (160, 60), GetImage.convert_color(colors.get("text")))
+                        stats_base = Image.new('RGB', (160, 60), match_color("text").rgb)
                         stats_base.putalpha(255)
                         base = GetImage.paste_centered(base, stats_base, (coordinate_stats[i]["x"], coordinate_stats[i]["y"] - 145))
 
                         font = ImageFont.truetype(font_impact, 50)
-                        GetImage.draw_text(base, self.response.get("TEAM_STATS", {}).get("MVP"), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] - 145), font, "#" + GetImage.convert_hex(colors.get("base")))
+                        GetImage.draw_text(base, self.response.get("TEAM_STATS", {}).get("MVP"), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] - 145), font, match_color("base").hex)
 
                     # agent name
                     font = ImageFont.truetype(font_regular, 20)
-                    GetImage.draw_text(base, GetFormat.format_match_playerdata(self.response.get("TEAM_STATS", {}).get("AGENT"), players, puuid, self.match_id, self.bot), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] - 96), font, "#" + GetImage.convert_hex(colors.get("text-base")))
+                    GetImage.draw_text(base, self.format_player(self.response.get("TEAM_STATS", {}).get("AGENT"), puuid), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] - 96), font, match_color("text-base").hex)
 
                     # rank icon
-                    self.endpoint.download(cache["competitive_tiers"][str(player["rank_id"])]["icon"], f"resources/temp/{team_color}_rank_icon.png")
-                    rank = Image.open(f"resources/temp/{team_color}_rank_icon.png")
+                    rank = require_image(cache["competitive_tiers"][str(player["rank_id"])]["icon"])
                     rank = rank.crop(rank.getbbox())
                     rank = rank.resize((int(rank.width * 30 / rank.height), int(rank.height * 30 / rank.height)))
                     base = GetImage.paste_centered(base, rank, (coordinate_stats[i]["x"] - 120, coordinate_stats[i]["y"] - 110))
@@ -565,24 +590,24 @@ class GetEmbed:
                     # player name
                     font = ImageFont.truetype(font_player, 34)
                     draw = ImageDraw.Draw(base)
-                    txw, txh = draw.textsize(GetFormat.format_match_playerdata(self.response.get("TEAM_STATS", {}).get("NAME"), players, puuid, self.match_id, self.bot), font=font)
+                    txw, txh = draw.textsize(self.format_player(self.response.get("TEAM_STATS", {}).get("NAME"), puuid), font=font)
                     if txw > 300 - 20:
                         font = ImageFont.truetype(font_player, int(34 * (300 - 20) / txw))
-                    GetImage.draw_text(base, GetFormat.format_match_playerdata(self.response.get("TEAM_STATS", {}).get("NAME"), players, puuid, self.match_id, self.bot), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] - 60), font, "#" + GetImage.convert_hex(colors.get("text")))
+                    GetImage.draw_text(base, self.format_player(self.response.get("TEAM_STATS", {}).get("NAME"), puuid), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] - 60), font, match_color("text").hex)
                     
                     # line
-                    stats_lux = Image.new('RGB', (300 - 40, 1), GetImage.convert_color(colors.get("text")))
+                    stats_lux = Image.new('RGB', (300 - 40, 1), match_color("text").rgb)
                     stats_lux.putalpha(int(255 * 0.8))
                     base = GetImage.paste_centered(base, stats_lux, (coordinate_stats[i]["x"], coordinate_stats[i]["y"]-20))
 
                     # stats 1
                     font = ImageFont.truetype(font_bold, 30)
-                    GetImage.draw_text(base, GetFormat.format_match_playerdata(self.response.get("TEAM_STATS", {}).get("RESPONSE_1"), players, puuid, self.match_id, self.bot), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] +15), font, "#" + GetImage.convert_hex(colors.get("text")))
-                    GetImage.draw_text(base, GetFormat.format_match_playerdata(self.response.get("TEAM_STATS", {}).get("RESPONSE_2"), players, puuid, self.match_id, self.bot), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] +80), font, "#" + GetImage.convert_hex(colors.get("text")))
+                    GetImage.draw_text(base, self.format_player(self.response.get("TEAM_STATS", {}).get("RESPONSE_1"), puuid), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] +15), font, match_color("text").hex)
+                    GetImage.draw_text(base, self.format_player(self.response.get("TEAM_STATS", {}).get("RESPONSE_2"), puuid), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] +80), font, match_color("text").hex)
                     
                     font = ImageFont.truetype(font_regular, 20)
-                    GetImage.draw_text(base, GetFormat.format_match_playerdata(self.response.get("TEAM_STATS", {}).get("TITLE_1"), players, puuid, self.match_id, self.bot), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] +45), font, "#" + GetImage.convert_hex(colors.get("text-base")))
-                    GetImage.draw_text(base, GetFormat.format_match_playerdata(self.response.get("TEAM_STATS", {}).get("TITLE_2"), players, puuid, self.match_id, self.bot), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] +110), font, "#" + GetImage.convert_hex(colors.get("text-base")))
+                    GetImage.draw_text(base, self.format_player(self.response.get("TEAM_STATS", {}).get("TITLE_1"), puuid), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] +45), font, match_color("text-base").hex)
+                    GetImage.draw_text(base, self.format_player(self.response.get("TEAM_STATS", {}).get("TITLE_2"), puuid), (coordinate_stats[i]["x"], coordinate_stats[i]["y"] +110), font, match_color("text-base").hex)
                     
                     i += 1
                     n = player["name"]
@@ -599,9 +624,6 @@ class GetEmbed:
                 file = io.BytesIO(f.read())
             image = discord.File(file, filename=filename)
 
-            if os.path.isfile(f"resources/temp/{team_color}_rank_icon.png"): os.remove(f"resources/temp/{team_color}_rank_icon.png")
-            if os.path.isfile(f"resources/temp/{team_color}_agent_portrait.png"): os.remove(f"resources/temp/{team_color}_agent_portrait.png")
-
             self.temp_files["stats_" + team_color] = image
 
         def embed_main(self) -> None:
@@ -615,40 +637,23 @@ class GetEmbed:
             # first embed post
             description = ""
             if match_info["match_info"]["is_played"]:
-                description = GetFormat.format_match_playerdata(response.get("RESPONSE"), match_info["players"], puuid, match_id, bot)
+                description = self.format_player(response.get("RESPONSE"), puuid)
             else:
                 description = ""
 
-            title = response.get("TITLE", "").format(
-                match_id=match_info["match_info"]["match_id"],
-                map=match_info["match_info"]["map"],
-                time=match_info["match_info"]["time"],
-                point=match_info["match_info"]["point"],
-                result=match_info["match_info"]["results"],
-                tracker=GetFormat.get_trackergg_link(match_info["match_info"]["match_id"]),
-                queue=match_info["match_info"]["queue"],
-                duration=match_info["match_info"]["duration"]
-            )
-            header = response.get("HEADER").format(
-                match_id=match_info["match_info"]["match_id"],
-                map=match_info["match_info"]["map"],
-                time=match_info["match_info"]["time"],
-                point=match_info["match_info"]["point"],
-                result=match_info["match_info"]["results"],
-                tracker=GetFormat.get_trackergg_link(match_info["match_info"]["match_id"]),
-                queue=match_info["match_info"]["queue"],
-                duration=match_info["match_info"]["duration"]
-            )
-            footer=response.get("FOOTER").format(
+            match_format = formatter(LazyFields(
                 match_id=match_info["match_info"]["match_id"],
                 map=match_info["match_info"]["map"],
                 time=match_info["match_info"]["time"],
                 point=match_info["match_info"]["point"],
                 result=match_info["match_info"]["results"],
-                tracker=GetFormat.get_trackergg_link(match_info["match_info"]["match_id"]),
+                tracker=lambda: GetFormat.get_trackergg_link(match_info["match_info"]["match_id"]),
                 queue=match_info["match_info"]["queue"],
                 duration=match_info["match_info"]["duration"]
-            )
+            ))
+            title = match_format(response.get("TITLE", ""))
+            header = match_format(response.get("HEADER"))
+            footer = match_format(response.get("FOOTER"))
 
             embed_main = Embed(title=title, description=description, color=match_info["match_info"]["color"])
             embed_main.set_author(name=header, icon_url=match_info["match_info"]["gamemode_icon"])
@@ -673,7 +678,7 @@ class GetEmbed:
                 for p in teams[team_name]["players"]:
                     if len(message)!=0:
                         message+="\n"
-                    message += GetFormat.format_match_playerdata(message_format, players, p, self.match_id, self.bot)
+                    message += self.format_player(message_format, p)
                     if teams[team_name]["win"]:
                         _result = response["RESULT"]["WIN"]
                     else:
@@ -709,7 +714,7 @@ class GetEmbed:
                 for t_puuid in sorted_players:
                     if len(message)!=0:
                         message+="\n"
-                    message += GetFormat.format_match_playerdata(response.get("PLAYERS", {}).get("DETAIL_DEATHMATCH"), players, t_puuid, self.match_id, self.bot)
+                    message += self.format_player(response.get("PLAYERS", {}).get("DETAIL_DEATHMATCH"), t_puuid)
                 embed_players.description = message
 
             self.temp_embeds["players"] = embed_players
@@ -721,8 +726,8 @@ class GetEmbed:
             team = self.match_info["match_info"][team_color]
 
             for p in teams[team]["players"]:
-                n = GetFormat.format_match_playerdata(self.response.get("STATS",{}).get("TITLE"), players, p, self.match_id, self.bot)
-                v = GetFormat.format_match_playerdata(self.response.get("STATS",{}).get("RESPONSE"), players, p, self.match_id, self.bot)
+                n = self.format_player(self.response.get("STATS",{}).get("TITLE"), p)
+                v = self.format_player(self.response.get("STATS",{}).get("RESPONSE"), p)
                 embed_team.add_field(name=n, value=v)
             
             if filename!=None:
@@ -833,18 +838,27 @@ class GetEmbed:
             self.color = match_info["match_info"]["color"]
 
             # embed
+            # errors of the parts fail the command, not only their thread
             with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-                    executor.submit(self.embed_main)
-                    executor.submit(self.embed_players, filename[1])
+                    futures = [
+                        executor.submit(contextvars.copy_context().run, self.embed_main),
+                        executor.submit(contextvars.copy_context().run, self.embed_players, filename[1]),
+                    ]
+            for future in futures:
+                future.result()
 
             if len(match_info["teams"])==2: # default
 
                 with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                    executor.submit(self.build_stats, "teamA", "teamA_" + filename[2])
-                    executor.submit(self.build_stats, "teamB", "teamB_" + filename[2])
-                    executor.submit(self.embed_team, response.get("TEAM_A"), "teamA", "teamA_" + filename[2])
-                    executor.submit(self.embed_team, response.get("TEAM_B"), "teamB", "teamB_" + filename[2])
-                    executor.submit(self.embed_economy, filename[0])
+                    futures = [
+                        executor.submit(contextvars.copy_context().run, self.build_stats, "teamA", "teamA_" + filename[2]),
+                        executor.submit(contextvars.copy_context().run, self.build_stats, "teamB", "teamB_" + filename[2]),
+                        executor.submit(contextvars.copy_context().run, self.embed_team, response.get("TEAM_A"), "teamA", "teamA_" + filename[2]),
+                        executor.submit(contextvars.copy_context().run, self.embed_team, response.get("TEAM_B"), "teamB", "teamB_" + filename[2]),
+                        executor.submit(contextvars.copy_context().run, self.embed_economy, filename[0]),
+                    ]
+                for future in futures:
+                    future.result()
 
                 
                 self.build_graph(filename[0])
@@ -856,7 +870,8 @@ class GetEmbed:
                 self.files = [[]]
 
         async def start(self):      
-            self.build_embeds()
+            # downloads and renders, off the event loop
+            await pipeline.run_blocking(self.build_embeds)
 
             embeds = self.embeds
             for i in range(len(embeds)):
@@ -870,9 +885,10 @@ class GetEmbed:
 
     # ---------- MATCH HISTORY EMBED ---------- #
     
-    def __career_embed(cls, match_id: str, match_data: Dict, response: Dict, endpoint, puuid: str, locale: str, bot: ValorantBot) -> discord.Embed:
-        """Generate Embed Career"""
-        cache = JSON.read('cache')
+    @classmethod
+    def career_match(cls, match_id: str, match_data: Dict, response: Dict, endpoint, puuid: str, locale: str, bot: ValorantBot, match_detail: Dict = None) -> Optional[List[Any]]:
+        """Generate Embed Career, returns [embed, stats] of a match"""
+        cache = get_catalog()
         
         # earned rank rating info
         earned_rr = match_data.get("RankedRatingEarned", 0)
@@ -882,23 +898,23 @@ class GetEmbed:
         after_rank = match_data.get("TierAfterUpdate", 0)
 
         # data
-        match_detail = GetFormat.get_match_info(puuid, match_id, endpoint, response, )
+        match_detail = GetFormat.get_match_info(puuid, match_id, endpoint, response, locale, match_detail)
 
-        def match_format(format: str):
+        def match_fields() -> LazyFields:
             players = match_detail["players"]
             info = match_detail["match_info"]
-            return format.format(
-                tracker=GetFormat.get_trackergg_link(match_id),
+            return LazyFields(
+                tracker=lambda: GetFormat.get_trackergg_link(match_id),
 
                 puuid=puuid,
                 name=players[puuid]["name"],
                 rank=players[puuid]["rank"],
-                rank_emoji=GetEmoji.competitive_tier_by_bot(players[puuid]["rank_id"], bot),
+                rank_emoji=lambda: GetEmoji.competitive_tier_by_bot(players[puuid]["rank_id"], bot),
                 level=players[puuid]["level"],
                 agent=players[puuid]["agent"],
-                agent_emoji=GetEmoji.agent_by_bot(players[puuid]["agent_id"], bot),
+                agent_emoji=lambda: GetEmoji.agent_by_bot(players[puuid]["agent_id"], bot),
                 role=players[puuid]["role"],
-                role_emoji=GetEmoji.role_by_bot(players[puuid]["agent_id"], bot),
+                role_emoji=lambda: GetEmoji.role_by_bot(players[puuid]["agent_id"], bot),
                 kills=players[puuid]["kills"],
                 deaths=players[puuid]["deaths"],
                 assists=players[puuid]["assists"],
@@ -933,13 +949,15 @@ class GetEmbed:
                 earned_rr = earned_rr,
                 before_rr = before_rr,
                 after_rr = after_rr,
-                before_rank = GetFormat.get_competitive_tier_name(before_rank),
-                after_rank = GetFormat.get_competitive_tier_name(after_rank),
-                before_rank_emoji = GetEmoji.competitive_tier_by_bot(before_rank, bot),
-                after_rank_emoji = GetEmoji.competitive_tier_by_bot(after_rank, bot)
+                before_rank = lambda: GetFormat.get_competitive_tier_name(before_rank),
+                after_rank = lambda: GetFormat.get_competitive_tier_name(after_rank),
+                before_rank_emoji = lambda: GetEmoji.competitive_tier_by_bot(before_rank, bot),
+                after_rank_emoji = lambda: GetEmoji.competitive_tier_by_bot(after_rank, bot)
             )
 
         if match_detail!=None:
+            match_format = formatter(match_fields())
+
             # embed
             embed = Embed(title=match_format(response.get('TITLE')), color=match_detail["match_info"]["color"])
             if len(match_detail["teams"])==2:
@@ -972,11 +990,10 @@ class GetEmbed:
             return None
     
     @classmethod
-    def career(cls, player: str, puuid: str, history: Dict, response: Dict, endpoint, queue: str, bot: ValorantBot) -> discord.Embed:
+    def career(cls, player: str, puuid: str, history: Dict, response: Dict, endpoint, queue: str, bot: ValorantBot) -> List[discord.Embed]:
         """Embed Match"""
         
         # language
-        msg_response = response.get('STATS')
         locale = str(VLR_locale)
         
         # data
@@ -987,16 +1004,20 @@ class GetEmbed:
         # embed
         all_match_stats = []
         embeds = []
-        i = 0
         for match in matches:
-            ret = cls.__career_embed(cls, match["MatchID"], matches[i], response, endpoint, puuid, locale, bot)
+            ret = cls.career_match(match["MatchID"], match, response, endpoint, puuid, locale, bot)
             if ret!=None:
                 embeds.append(ret[0])
                 all_match_stats.append(ret[1])
-            i += 1
+
+        embeds.insert(0, cls.career_summary(player, all_match_stats, response, bot))
+        return embeds
+
+    def career_summary(player: str, all_match_stats: List[Dict], response: Dict, bot: ValorantBot) -> discord.Embed:
+        """Embed stats of all matches, all_match_stats is ordered from the latest match"""
 
         # stats of all matches 
-        all_matches = len(embeds)
+        all_matches = len(all_match_stats)
         if all_matches>0:
             match_stats = {
                 "kills": 0,
@@ -1043,8 +1064,7 @@ class GetEmbed:
 
         
             # make embed post
-            def format_main(format: str) -> str:
-                return format.format(
+            format_main = formatter(LazyFields(
                     name=player,
                     matches = all_matches,
 
@@ -1057,18 +1077,18 @@ class GetEmbed:
                     kills = match_stats["kills"],
                     deaths = match_stats["deaths"],
                     assists = match_stats["assists"],
-                    kd = GetFormat.get_kdrate(match_stats["kills"], match_stats["deaths"]),
-                    kda = GetFormat.get_kdarate(match_stats["kills"], match_stats["deaths"], match_stats["assists"]),
+                    kd = lambda: GetFormat.get_kdrate(match_stats["kills"], match_stats["deaths"]),
+                    kda = lambda: GetFormat.get_kdarate(match_stats["kills"], match_stats["deaths"], match_stats["assists"]),
 
                     before_rank = match_stats["before_rank"],
                     after_rank = match_stats["after_rank"],
-                    before_rank_emoji = GetEmoji.competitive_tier_by_bot(match_stats["before_raw_rank"], bot),
-                    after_rank_emoji = GetEmoji.competitive_tier_by_bot(match_stats["after_raw_rank"], bot),
+                    before_rank_emoji = lambda: GetEmoji.competitive_tier_by_bot(match_stats["before_raw_rank"], bot),
+                    after_rank_emoji = lambda: GetEmoji.competitive_tier_by_bot(match_stats["after_raw_rank"], bot),
                     before_rr = match_stats["before_rr"],
                     after_rr = match_stats["after_rr"],
                     earned_rr = match_stats["earned_rr"],
                     rr = rr
-                )
+            ))
 
             embed = Embed(title=format_main(response.get("STATS", {}).get('TITLE')), description=format_main(response.get("STATS", {}).get('RESPONSE')))
             embed.set_author(name=response.get("STATS", {}).get('HEADER'))
@@ -1082,9 +1102,7 @@ class GetEmbed:
             embed = Embed(title=format_main(response.get("STATS", {}).get('TITLE')), description=response.get("STATS", {}).get('NO_MATCH'))
             embed.set_author(name=response.get("STATS", {}).get('HEADER'))
             embed.set_footer(text=response.get("STATS", {}).get('FOOTER'))
-        embeds.insert(0, embed)
-
-        return embeds
+        return embed
 
     # ---------- NIGHT MARKET EMBED ---------- #
     
@@ -1148,20 +1166,19 @@ class GetEmbed:
             item_type = item['type']
             original_type = item['original_type']
             
-            def battlepass_format(format: str):
-                return format.format(
-                    player = player,
-                    name = act,
-                    reward = reward,
-                    type = item_type,
-                    vp_emoji = GetEmoji.get("ValorantPointIcon", bot),
-                    cost = cost,
-                    xp = f'{xp:,}',
-                    max_xp = f'{calculate_level_xp(tier + 1):,}',
-                    end=format_relative(season_end),
-                    tier=tier,
-                    max_tier=tiers
-                )
+            battlepass_format = formatter(LazyFields(
+                player = player,
+                name = act,
+                reward = reward,
+                type = item_type,
+                vp_emoji = lambda: GetEmoji.get("ValorantPointIcon", bot),
+                cost = cost,
+                xp = f'{xp:,}',
+                max_xp = lambda: f'{calculate_level_xp(tier + 1):,}',
+                end = lambda: format_relative(season_end),
+                tier=tier,
+                max_tier=tiers
+            ))
             
             embed = Embed(battlepass_format(MSG_RESPONSE), title=battlepass_format(MSG_TITLE), color=Config.GetColor("items"))
             embed.set_footer(text=battlepass_format(MSG_FOOTER))
@@ -1189,7 +1206,7 @@ class GetEmbed:
         MSG_HEADER = response.get("EVENTPASS", {}).get('HEADER')
         MSG_FOOTER = response.get("EVENTPASS", {}).get('FOOTER')
 
-        event_data = JSON.read("cache")["events"].get(event)
+        event_data = get_catalog()["events"].get(event)
         if event_data == None:
             return None
         
@@ -1207,20 +1224,19 @@ class GetEmbed:
         item_type = item['type']
         original_type = item['original_type']
         
-        def battlepass_format(format: str):
-            return format.format(
-                player = player,
-                name = event_data["title"][str(VLR_locale)],
-                reward = reward,
-                type = item_type,
-                cost = cost,
-                vp_emoji = GetEmoji.get("ValorantPointIcon", bot),
-                xp = f'{xp:,}',
-                max_xp = f'{calculate_level_xp(tier + 1):,}',
-                end=format_relative(dateutil.parser.parse(season_end)),
-                tier=tier,
-                max_tier=tiers
-            )
+        battlepass_format = formatter(LazyFields(
+            player = player,
+            name = lambda: event_data["title"][str(VLR_locale)],
+            reward = reward,
+            type = item_type,
+            cost = cost,
+            vp_emoji = lambda: GetEmoji.get("ValorantPointIcon", bot),
+            xp = f'{xp:,}',
+            max_xp = lambda: f'{calculate_level_xp(tier + 1):,}',
+            end = lambda: format_relative(dateutil.parser.parse(season_end)),
+            tier=tier,
+            max_tier=tiers
+        ))
 
         embed = Embed(battlepass_format(MSG_RESPONSE), title=battlepass_format(MSG_TITLE), color=Config.GetColor("items"))
         embed.set_footer(text=battlepass_format(MSG_FOOTER))
@@ -1242,7 +1258,7 @@ class GetEmbed:
     # ---------- PARTY EMBED ---------- #
     
     def member_party(player: str, puuid: str, data: Dict, endpoint: API_ENDPOINT, response: Dict, bot: ValorantBot) -> discord.Embed:
-        cache = JSON.read("cache")
+        cache = get_catalog()
 
         # values
         # is this custome game ?
@@ -1290,39 +1306,44 @@ class GetEmbed:
         embeds = []
 
         # main embed
-        def format_party_info(format: str) -> str:
-            return format.format(
-                name = player,
-                puuid = puuid,
-                access = response.get("ACCESS", {}).get(data["Accessibility"]),
-                party_id = data["ID"],
-
-                queue_id = data["MatchmakingData"]["QueueID"] if not is_custom_game else "custom",
-                queue = response.get("QUEUE", {}).get(data["MatchmakingData"]["QueueID"])if not is_custom_game else response.get("QUEUE", {}).get("custom"),
-                members = len(data["Members"]),
-                in_queue = format_relative(dateutil.parser.parse(data["QueueEntryTime"])) if data["QueueEntryTime"]!="0001-01-01T00:00:00Z" else "",
-                owner_icon = response.get("OWNER")
-            )
+        format_party_info = formatter(LazyFields(
+            name = player,
+            puuid = puuid,
+            access = lambda: response.get("ACCESS", {}).get(data["Accessibility"]),
+            party_id = data["ID"],
+
+            queue_id = lambda: data["MatchmakingData"]["QueueID"] if not is_custom_game else "custom",
+            queue = lambda: response.get("QUEUE", {}).get(data["MatchmakingData"]["QueueID"])if not is_custom_game else response.get("QUEUE", {}).get("custom"),
+            members = len(data["Members"]),
+            in_queue = lambda: format_relative(dateutil.parser.parse(data["QueueEntryTime"])) if data["QueueEntryTime"]!="0001-01-01T00:00:00Z" else "",
+            owner_icon = response.get("OWNER")
+        ))
         embed_main = Embed(
             title = format_party_info(response.get("TITLE", "")),
             description = format_party_info(response.get("RESPONSE", ""))
         )
 
         # player embed
+        player_fields = {}
+
         def format_player_info(format: str, p_puuid: str, name: str = response.get("")) -> str:
-            return format.format(
-                name = players[p_puuid]["name"],
-                level = players[p_puuid]["level"],
-                rank = GetFormat.get_competitive_tier_name(players[p_puuid]["rank"]),
-                rank_emoji = GetEmoji.competitive_tier_by_bot(players[p_puuid]["rank"], bot),
-                rr = players[p_puuid]["rr"],
-                leaderboard = players[p_puuid]["leaderboard"],
-                ready = players[p_puuid]["ready"],
-                owner = players[p_puuid]["owner"],
-                playercard = cache["playercards"][players[p_puuid]["player_card"]]["names"][str(VLR_locale)],
-                title = "`" + cache["titles"][players[p_puuid]["player_title"]]["text"].get(str(VLR_locale)) + "`" if cache["titles"][players[p_puuid]["player_title"]]["text"]!=None else cache["titles"][players[p_puuid]["player_title"]].get("names", {}).get(str(VLR_locale)) or "",
-                membership = players[p_puuid]["membership"]
-            )
+            # the four templates of a player embed share one set of fields
+            key = (p_puuid, players[p_puuid]["membership"])
+            if key not in player_fields:
+                player_fields[key] = LazyFields(
+                    name = players[p_puuid]["name"],
+                    level = players[p_puuid]["level"],
+                    rank = lambda: GetFormat.get_competitive_tier_name(players[p_puuid]["rank"]),
+                    rank_emoji = lambda: GetEmoji.competitive_tier_by_bot(players[p_puuid]["rank"], bot),
+                    rr = players[p_puuid]["rr"],
+                    leaderboard = players[p_puuid]["leaderboard"],
+                    ready = players[p_puuid]["ready"],
+                    owner = players[p_puuid]["owner"],
+                    playercard = lambda: cache["playercards"][players[p_puuid]["player_card"]]["names"][str(VLR_locale)],
+                    title = lambda: "`" + cache["titles"][players[p_puuid]["player_title"]]["text"].get(str(VLR_locale)) + "`" if cache["titles"][players[p_puuid]["player_title"]]["text"]!=None else cache["titles"][players[p_puuid]["player_title"]].get("names", {}).get(str(VLR_locale)) or "",
+                    membership = players[p_puuid]["membership"]
+                )
+            return render(format, player_fields[key])
 
         if is_custom_game:
             def make_embed(p_puuid: str, membership: str, color: int = Config.GetColor("items")):
@@ -1371,7 +1392,7 @@ class GetEmbed:
     # ---------- MEMBER EMBED ---------- #
 
     def member_pregame(bot: ValorantBot, player: str, data: Dict, endpoint: API_ENDPOINT, response: Dict) -> List[discord.Embed]:
-        cache = JSON.read("cache")
+        cache = get_catalog()
         embeds = []
 
         embeds.append(Embed(description=response.get("PREGAME").get("TITLE").format(player=player)))
@@ -1379,21 +1400,20 @@ class GetEmbed:
         for team in data.get("Teams", []):
             for player in team.get("Players"):
 
-                def format_player(format: str) -> str:
-                    rank = player.get("CompetitiveTier") if player.get("CompetitiveTier")!=0 else endpoint.get_player_tier_rank(puuid=player.get("Subject"))
-                    fetch_name = endpoint.fetch_name_by_puuid(player.get("Subject"))[0]
-
-                    return format.format(
-                        puuid = player.get("Subject"),
-                        name = fetch_name["GameName"] + "#" + fetch_name["TagLine"],
-                        agent = cache["agents"].get(player.get("CharacterID").lower(), {}).get("names", {}).get(str(VLR_locale), response.get("PREGAME").get("NONE")),
-                        agent_emoji = GetEmoji.agent_by_bot(player.get("CharacterID"), bot) if len(player.get("CharacterID"))>0 else "",
-                        select = response.get("PREGAME").get("SELECTION_STATE").get(player.get("CharacterSelectionState")) if response.get("PREGAME").get("SELECTION_STATE").get(player.get("CharacterSelectionState"))!=None else response.get("PREGAME").get("SELECTION_STATE").get("None"),
-                        rank = GetFormat.get_competitive_tier_name(rank),
-                        rank_emoji = GetEmoji.competitive_tier_by_bot(rank, bot),
-                        level = player.get("PlayerIdentity", {}).get("AccountLevel", 0),
-                        title = "`" + cache["titles"].get(player.get("PlayerIdentity", {}).get("PlayerTitleID", ""), {}).get("text", {}).get(str(VLR_locale)) + "`" if cache["titles"].get(player.get("PlayerIdentity", {}).get("PlayerTitleID", ""), {}).get("text")!=None else ""
-                    )
+                # the rank and the name are API requests, made once per player and only if a template uses them
+                fields = LazyFields(
+                    rank_id = lambda: player.get("CompetitiveTier") if player.get("CompetitiveTier")!=0 else endpoint.get_player_tier_rank(puuid=player.get("Subject")),
+                    puuid = player.get("Subject"),
+                    name = lambda: "{GameName}#{TagLine}".format_map(endpoint.fetch_name_by_puuid(player.get("Subject"))[0]),
+                    agent = lambda: cache["agents"].get(player.get("CharacterID").lower(), {}).get("names", {}).get(str(VLR_locale), response.get("PREGAME").get("NONE")),
+                    agent_emoji = lambda: GetEmoji.agent_by_bot(player.get("CharacterID"), bot) if len(player.get("CharacterID"))>0 else "",
+                    select = lambda: response.get("PREGAME").get("SELECTION_STATE").get(player.get("CharacterSelectionState")) if response.get("PREGAME").get("SELECTION_STATE").get(player.get("CharacterSelectionState"))!=None else response.get("PREGAME").get("SELECTION_STATE").get("None"),
+                    rank = lambda: GetFormat.get_competitive_tier_name(fields["rank_id"]),
+                    rank_emoji = lambda: GetEmoji.competitive_tier_by_bot(fields["rank_id"], bot),
+                    level = player.get("PlayerIdentity", {}).get("AccountLevel", 0),
+                    title = lambda: "`" + cache["titles"].get(player.get("PlayerIdentity", {}).get("PlayerTitleID", ""), {}).get("text", {}).get(str(VLR_locale)) + "`" if cache["titles"].get(player.get("PlayerIdentity", {}).get("PlayerTitleID", ""), {}).get("text")!=None else ""
+                )
+                format_player = formatter(fields)
                 
                 embed = Embed(
                     title=format_player(response.get("PREGAME").get("PLAYER").get("TITLE")),
@@ -1406,7 +1426,7 @@ class GetEmbed:
     
     def member_coregame(bot: ValorantBot, player: str, puuid: str, data: Dict, endpoint: API_ENDPOINT, response: Dict) -> List[discord.Embed]:
         map_id = GetFormat.get_mapuuid_from_mapid(data.get("MapID"))
-        cache = JSON.read("cache")
+        cache = get_catalog()
 
         # teams
         teams = {}
@@ -1473,8 +1493,9 @@ class GetEmbed:
 
     # ---------- CUSTOM EMBED ---------- #
     @classmethod
-    def custom(cls, puuid: str, data: Dict, endpoint: API_ENDPOINT, response: Dict, bot: ValorantBot, mode_rand: bool = False) -> discord.Embed:
-        cache = JSON.read("cache")
+    def custom(cls, puuid: str, data: Dict, lobby: Dict[str, Dict], endpoint: API_ENDPOINT, response: Dict, bot: ValorantBot, mode_rand: bool = False) -> discord.Embed:
+        """Embed Custom, lobby holds the pipeline.lobby_stats of the members"""
+        cache = get_catalog()
         embeds = []
         
         # Select Maps
@@ -1510,18 +1531,15 @@ class GetEmbed:
             #    raise ValorantBotError(response.get("NOT_CUSTOM_MODE"))
 
             # player data
-            players = {}
             players_data_list = []
             for p in (teamA_members + teamB_members):
-                # fetch mmr
                 p_puuid = p["Subject"]
-                mmr = endpoint.fetch_player_mmr(p_puuid)
+                member = lobby.get(p_puuid)
+                if member==None:
+                    continue
 
-                season_id = mmr['LatestCompetitiveUpdate']['SeasonID']
-                if season_id==None:
-                    season_id = ""
-                if len(season_id) == 0:
-                    season_id = endpoint.__get_live_season()
+                mmr = member["mmr"]
+                season_id = member["season_id"]
 
                 # player data
                 current_season = mmr.get("QueueSkills", {}).get('competitive', {}).get('SeasonalInfoBySeasonID', {})
@@ -1529,7 +1547,7 @@ class GetEmbed:
 
                 # set data to dict
                 player = {
-                    "name": "",
+                    "name": member["name"],
                     "user": "",
                     "puuid": p_puuid,
                     "rank": current_season.get(season_id, {}).get('CompetitiveTier', 0),
@@ -1557,33 +1575,13 @@ class GetEmbed:
                     100 # Radiant
                 ]
 
-                data = endpoint.fetch_match_history(index=5, puuid=p_puuid, not_found_error=False, queue="competitive")["Matches"]
-                size = 0
-                if len(data)<1:
-                    player["custom_rating"] = -1
-                    fetch_name = endpoint.fetch_name_by_puuid(p_puuid)[0]
-                    player["name"] = fetch_name["GameName"] + "#" + fetch_name["TagLine"]
-                else:
-                    for d in data:
-                        match_id = d["MatchID"]
-
-                        match_info = GetFormat.get_match_info(p_puuid, match_id, endpoint, response)
-
-                        player_data = match_info["players"].get(p_puuid)
-                        if player_data==None:
-                            continue
-                        
-                        player["name"] = player_data["name"]
-                        player["kda"] += player_data["kda"]
-                        player["acs"] += player_data["acs"]
-                        player["eco_rating"] += player_data["eco_rating"]
-                        player["adr"] += player_data["adr"]
-                        size += 1
-
-                    player["kda"] /= size
-                    player["acs"] /= size
-                    player["eco_rating"] /= size
-                    player["adr"] /= size
+                # averages of the recent matches, kept by the player stats store
+                stats = member["stats"]
+                if stats!=None:
+                    player["kda"] = stats["kda"]
+                    player["acs"] = stats["acs"]
+                    player["eco_rating"] = stats["eco_rating"]
+                    player["adr"] = stats["adr"]
                 
                 rating = (player["kda"]*0.3) * (player["acs"] / 200 * 0.4) * (player["eco_rating"]/50 * 0.2) * (player["adr"] / 150 * 0.2) * (rank_weight[player["rank"]]/100* 0.8) * 1000
                 player["custom_rating"] = rating
@@ -1598,14 +1596,14 @@ class GetEmbed:
             sorted_players = sorted(players_data_list, key=lambda x: x.get('custom_rating', 0), reverse=True)
             
             def format_team_description(format: str, player_data: Dict):
-                return format.format(
+                return render(format, LazyFields(
                     name = player_data["name"],
                     puuid = player_data["puuid"],
-                    rank = GetFormat.get_competitive_tier_name(player_data["rank"]),
-                    rank_emoji = GetEmoji.competitive_tier_by_bot(player_data["rank"], bot),
+                    rank = lambda: GetFormat.get_competitive_tier_name(player_data["rank"]),
+                    rank_emoji = lambda: GetEmoji.competitive_tier_by_bot(player_data["rank"], bot),
                     rating = round(player_data["custom_rating"], 1),
                     user = player_data["user"]
-                )
+                ))
 
             members = len(sorted_players)
             member = [0, 0, 0, 0]
@@ -1679,13 +1677,11 @@ class GetEmbed:
         
         description_format = response.get('RESPONSE_ALL')
         
-        data = GetFormat.offer_format(offer, locale)
-        
-        duration = data.pop('duration')
+        duration = offer["SkinsPanelLayout"]["SingleItemOffersRemainingDurationInSeconds"]
         
         description = description_format.format(username=player, duration=format_relative(datetime.utcnow() + timedelta(seconds=duration)))
         embed = Embed(description)
         embeds = [embed]
-        [embeds.append(cls.__giorgio_embed(data[skin], bot, response)) for skin in data]
+        embeds.extend(cls.storefront(offer, response, locale, bot))
         
         return embeds
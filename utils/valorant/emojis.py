@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import datetime
+import json
+import threading
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+from .catalog import Catalog, get_catalog
+from .resources import tiers as tiers_resources
+from ..errors import ValorantBotError
+
+if TYPE_CHECKING:
+    from bot import ValorantBot
+
+emoji_file = "data/emoji.json"
+
+# round result -> emoji name prefix, "Won" or "Lost" is appended
+round_results = {
+    "Elimination": "Elimination",
+    "Defuse": "Defuse",
+    "Detonate": "Detonate",
+    "Timeup": "Timeup",
+    "": "Timeup",
+}
+
+
+class EmojiSet:
+    """ Mention strings of one registry build, keyed by what they stand for """
+
+    def __init__(self, files: Dict[str, str], bot_emojis: Dict[str, str], catalog: Catalog, generation: Tuple = ()) -> None:
+        # (catalog generation, registry version, with bot emojis), for caches of rendered emojis
+        self.generation: Tuple = generation
+
+        # emojis of the bot come first, emoji.json fills in the rest
+        self.names: Dict[str, str] = {**files, **bot_emojis}
+
+        self.skins: Dict[str, str] = {}
+        tiers = catalog.section("tiers")
+        for uuid, skin in catalog.section("skins").items():
+            tier = tiers.get(skin.get("tier"))
+            if tier is None:
+                continue
+            self.skins[uuid] = bot_emojis.get(f"{tier['name']}Tier") or files.get(tiers_resources.get(tier["uuid"], {}).get("emoji"), "")
+
+        self.agents: Dict[str, str] = {}
+        self.roles: Dict[str, str] = {}
+        for uuid, agent in catalog.section("agents").items():
+            self.agents[uuid] = self.names.get("Agent" + agent["names"]["en-US"].replace("/", ""))
+            self.roles[uuid] = self.names.get(agent["role"]["names"]["en-US"])
+
+        self.competitive_tiers: Dict[int, str] = {}
+        for tier, rank in catalog.section("competitive_tiers").items():
+            name = rank["names"]["en-US"]
+            if name:
+                self.competitive_tiers[int(tier)] = self.names.get("Tier" + name.replace(" ", "").capitalize())
+
+        self.round_results: Dict[Tuple[str, bool], str] = {}
+        for result, prefix in round_results.items():
+            for win in (True, False):
+                self.round_results[(result, win)] = self.names.get(prefix + ("Won" if win else "Lost"), "")
+
+    def skin_tier(self, skin_uuid: str) -> str:
+        try:
+            return self.skins[skin_uuid]
+        except KeyError:
+            raise ValorantBotError('Some skin data is missing, plz use `/debug cache`')
+
+    def round_result(self, result: str, win: bool) -> str:
+        emoji = self.round_results.get((result, win))
+        if emoji is None:
+            return self.names.get("Won" if win else "Lost", "")
+        return emoji
+
+
+class EmojiRegistry:
+    """ Emoji sets built once per catalog generation and emoji setup """
+
+    def __init__(self, path: str = emoji_file) -> None:
+        self.path: str = path
+
+        self.__version: int = 0
+        self.__sets: Dict[Tuple[int, int, bool], EmojiSet] = {}
+        self.__lock = threading.Lock()
+
+    def __read(self) -> Dict[str, str]:
+        try:
+            with open(self.path, "r", encoding='utf-8') as json_file:
+                return json.load(json_file)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            print(e)
+            print(f"[{datetime.datetime.now()}] Can't load emoji file: {self.path}")
+            return {}
+
+    def invalidate(self) -> None:
+        """ Rebuild on next use, after emoji.json or the emojis of the bot changed """
+        with self.__lock:
+            self.__version += 1
+            self.__sets = {}
+
+    def get(self, bot: Optional[ValorantBot] = None) -> EmojiSet:
+        """ Get the emoji set of the current catalog generation, with the emojis of bot if given """
+        catalog = get_catalog()
+        key = (catalog.generation, self.__version, bot is not None)
+
+        emoji_set = self.__sets.get(key)
+        if emoji_set is None:
+            with self.__lock:
+                emoji_set = self.__sets.get(key)
+                if emoji_set is None:
+                    bot_emojis = {}
+                    if bot is not None:
+                        for emoji in bot.emojis:
+                            bot_emojis.setdefault(emoji.name, str(emoji))
+                    emoji_set = EmojiSet(self.__read(), bot_emojis, catalog, key)
+
+                    # drop sets of older generations
+                    self.__sets = {k: v for k, v in self.__sets.items() if k[:2] == key[:2]}
+                    self.__sets[key] = emoji_set
+        return emoji_set
+
+
+registry = EmojiRegistry()
@@ -15,6 +15,7 @@ import urllib.error
 import urllib.request
 
 from .local import LocalErrorResponse
+from .matches import match_store
 from .useful import JSON, GetItems, load_file
 # Local
 from .resources import (base_endpoint, base_endpoint_glz, base_endpoint_shared, base_endpoint_henrik, region_shard_override,
@@ -249,7 +250,11 @@ class API_ENDPOINT:
         """
         Get the history of match
         """
-        data = self.fetch(endpoint=f'/match-details/v1/matches/{match_id}', url='pd', not_found_error=not_found_error)
+        # finished matches never change, any user's fetch serves everyone
+        data = match_store.get_details(match_id)
+        if data is None:
+            data = self.fetch(endpoint=f'/match-details/v1/matches/{match_id}', url='pd', not_found_error=not_found_error)
+            match_store.put_details(match_id, data)
         return data
     
     def fetch_leaderboard(self, season: str = None, start_index: int = 0, size: int = 10, not_found_error: bool = True) -> Mapping[str, Any]:
@@ -493,6 +498,12 @@ class API_ENDPOINT:
         except Exception as e:
             return 0
     
+    def get_live_season(self) -> str:
+        """
+        get the live competitive season
+        """
+        return self.__get_live_season()
+    
     def get_discord_userid_from_puuid(self, puuid: str) -> str:
         users = JSON.read("users")
 
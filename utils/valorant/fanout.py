@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import datetime
+import hashlib
+import itertools
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .useful import JSON
+
+stats_file = "fanout_stats"
+kept_runs = 30
+
+
+def spread_offset(key: str, window: float, salt: str = "") -> float:
+    """ Get the start offset of a key in a window, the same key always gets the same offset """
+    if window <= 0:
+        return 0.0
+    digest = hashlib.sha256(f"{salt}:{key}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64 * window
+
+
+# ---------- RUN STATS ---------- #
+
+class FanoutRun:
+    """ Throughput, latency and failures of one fan-out run """
+
+    def __init__(self, name: str, total: int) -> None:
+        self.name: str = name
+        self.total: int = total
+        self.started: datetime.datetime = datetime.datetime.utcnow()
+        self.__start: float = time.monotonic()
+        self.elapsed: float = 0.0
+
+        self.sent: int = 0
+        self.skipped: int = 0
+        self.failures: collections.Counter = collections.Counter()
+        self.latencies: List[float] = []
+
+    @property
+    def failed(self) -> int:
+        return sum(self.failures.values())
+
+    def record(self, latency: float, failure: Optional[str] = None, sent: bool = True) -> None:
+        """ Record one finished key """
+        self.latencies.append(latency)
+        if failure is not None:
+            self.failures[failure] += 1
+        elif sent:
+            self.sent += 1
+        else:
+            self.skipped += 1
+
+    def finish(self) -> None:
+        self.elapsed = time.monotonic() - self.__start
+
+    def percentile(self, p: float) -> float:
+        if len(self.latencies) == 0:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[max(0, math.ceil(p * len(latencies)) - 1)]
+
+    def summary(self) -> Dict[str, Any]:
+        done = len(self.latencies)
+        return {
+            "started": self.started.isoformat(),
+            "total": self.total,
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "failures": dict(self.failures),
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(done / self.elapsed, 3) if self.elapsed > 0 else 0.0,
+            "p50": round(self.percentile(0.5), 3),
+            "p95": round(self.percentile(0.95), 3),
+        }
+
+
+def record_run(run: FanoutRun) -> None:
+    """ Log a run and keep its summary in data/fanout_stats.json """
+    summary = run.summary()
+    print(
+        f"[{datetime.datetime.now()}] {run.name}: {summary['sent']} sent, {summary['skipped']} skipped, {summary['failed']} failed "
+        f"of {summary['total']} in {summary['elapsed']}s ({summary['throughput']}/s, p95 {summary['p95']}s) {summary['failures'] or ''}"
+    )
+
+    stats = JSON.read(stats_file)
+    runs = stats.get(run.name, [])
+    runs.append(summary)
+    stats[run.name] = runs[-kept_runs:]
+    JSON.save(stats_file, stats)
+
+
+# ---------- FAN-OUT ---------- #
+
+class Fanout:
+    """ Run a prepare -> deliver pipeline for many keys with bounded concurrency, spread over a window """
+
+    def __init__(self, name: str, concurrency: int = 8, window: float = 0.0, salt: str = "") -> None:
+        self.name: str = name
+        self.concurrency: int = max(1, concurrency)
+        self.window: float = max(0.0, window)
+        self.salt: str = salt
+
+    async def run(
+        self,
+        keys: Iterable[str],
+        prepare: Callable[[str], Awaitable[Optional[Tuple[int, Any]]]],
+        deliver: Callable[[str, Any], Awaitable[None]],
+        on_error: Callable[[str, Exception], str] = lambda key, e: type(e).__name__,
+        urgent: Callable[[str], bool] = lambda key: False,
+    ) -> FanoutRun:
+        """ prepare(key) returns (priority, payload) or None when there is nothing to send, urgent keys start ahead of the window """
+        keys = list(dict.fromkeys(keys))
+        run = FanoutRun(self.name, len(keys))
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        order = itertools.count()
+
+        async def produce(key: str) -> None:
+            if not urgent(key):
+                await asyncio.sleep(max(0.0, start + spread_offset(key, self.window, self.salt) - loop.time()))
+            began = loop.time()
+            async with semaphore:
+                try:
+                    prepared = await prepare(key)
+                except Exception as e:
+                    run.record(loop.time() - began, on_error(key, e))
+                    return
+            if prepared is None:
+                run.record(loop.time() - began, sent=False)
+                return
+            # lower priorities are delivered first when deliveries back up
+            priority, payload = prepared
+            await queue.put((priority, next(order), key, payload, began))
+
+        async def consume() -> None:
+            while True:
+                _, _, key, payload, began = await queue.get()
+                try:
+                    await deliver(key, payload)
+                    run.record(loop.time() - began)
+                except Exception as e:
+                    run.record(loop.time() - began, on_error(key, e))
+                finally:
+                    queue.task_done()
+
+        consumers = [asyncio.create_task(consume()) for _ in range(self.concurrency)]
+        try:
+            # urgent keys are started first, so they also queue first on the semaphore
+            await asyncio.gather(*(produce(key) for key in sorted(keys, key=lambda key: not urgent(key))))
+            await queue.join()
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+            run.finish()
+        return run
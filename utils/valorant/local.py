@@ -4,9 +4,12 @@ I WILL REMOVE THIS FILE AFTER THE LOCALIZATION V2 IS DONE
 
 from __future__ import annotations
 
-import contextlib
+import datetime
 import json
-from typing import Any, Dict
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
 
 # credit by /giorgi-o/
 
@@ -17,45 +20,120 @@ Locale = {
     'ja-JP': 'ja-JP'
 }
 
+lang_dir = "lang"
+default_locale = "en-US"
+# seconds between checks of the lang files for changes
+reload_interval = 5.0
+
 
 def InteractionLanguage(local_code: str) -> Dict[str, Any]:
     return Locale.get(str(local_code), 'en-US')
 
 
-def __LocalRead(filename: str) -> Dict:
-    data = {}
-    filename = Locale.get(str(filename), "en-US")
-    try:
-        with open(f"lang/{filename}.json", "r", encoding='utf-8') as json_file:
-            data = json.load(json_file)
-    except FileNotFoundError:
-        return __LocalRead('en-US')
-    return data
+# ---------- LOCALE CATALOG ---------- #
+
+class LocaleCatalog:
+    """ Every lang file loaded once, resolved by flattened key like `commands.store` or `errors.API` """
+
+    def __init__(self, directory: str = lang_dir) -> None:
+        self.directory: str = directory
+
+        # (tables, mtimes) is replaced as a whole, so readers never see a half-loaded catalog
+        self.__state: Tuple[Dict[str, Dict[str, Any]], Dict[str, float]] = ({}, {})
+        self.__checked: float = 0.0
+        self.__lock = threading.Lock()
+        self.load()
+
+    def __files(self) -> Dict[str, float]:
+        files = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json"):
+                    files[entry.name[:-len(".json")]] = entry.stat().st_mtime
+        return files
+
+    def __read(self, locale: str) -> Dict[str, Any]:
+        try:
+            with open(f"{self.directory}/{locale}.json", "r", encoding='utf-8') as json_file:
+                return json.load(json_file)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(e)
+            print(f"[{datetime.datetime.now()}] Can't load language file: {locale}")
+            return {}
+
+    @staticmethod
+    def flatten(data: Dict[str, Any]) -> Dict[str, Any]:
+        """ Flatten a lang file to `section` and `section.name` keys """
+        flat = {}
+        for section, values in data.items():
+            flat[section] = values
+            if isinstance(values, dict):
+                for name, value in values.items():
+                    flat[f"{section}.{name}"] = value
+        return flat
+
+    @classmethod
+    def merge(cls, fallback: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+        """ data over fallback at every depth, a key missing in a command falls back too """
+        merged = dict(fallback)
+        for key, value in data.items():
+            if isinstance(value, dict) and isinstance(fallback.get(key), dict):
+                value = cls.merge(fallback[key], value)
+            merged[key] = value
+        return merged
+
+    def load(self) -> None:
+        """ Load every lang file and publish the new tables at once """
+        with self.__lock:
+            mtimes = self.__files()
+            files = {locale: self.__read(locale) for locale in mtimes}
+            fallback = files.get(default_locale, {})
+
+            tables = {}
+            for locale, data in files.items():
+                # fallback chain: the locale itself, then the default locale
+                tables[locale] = self.flatten(self.merge(fallback, data))
+
+            self.__state = (tables, mtimes)
+            self.__checked = time.monotonic()
+
+        print(f"[{datetime.datetime.now()}] Loaded language files: {', '.join(sorted(tables))}")
+
+    def __check(self) -> None:
+        """ Reload when a lang file was added, removed or modified """
+        now = time.monotonic()
+        if now - self.__checked < reload_interval:
+            return
+        self.__checked = now
+
+        try:
+            changed = self.__files() != self.__state[1]
+        except FileNotFoundError:
+            return
+        if changed:
+            self.load()
+
+    def get(self, key: str, local_code: str) -> Any:
+        """ Resolve a flattened key for a locale code, None if missing everywhere """
+        self.__check()
+        tables = self.__state[0]
+        table = tables.get(Locale.get(verify_localcode(str(local_code)), default_locale)) or tables.get(default_locale, {})
+        return table.get(key)
+
+
+locales = LocaleCatalog()
 
 
 def ResponseLanguage(command_name: str, local_code: str) -> Dict[str, Any]:
-    local_code = verify_localcode(local_code)
-    local = {}
     if command_name==None or len(command_name)==0:
-        with contextlib.suppress(KeyError):
-            local_dict = __LocalRead(local_code)
-            local = local_dict['commands']
-        return local
-    else:
-        with contextlib.suppress(KeyError):
-            local_dict = __LocalRead(local_code)
-            local = local_dict['commands'][str(command_name)]
-        return local
+        return locales.get('commands', local_code) or {}
+    return locales.get(f'commands.{command_name}', local_code) or {}
 
 
 def LocalErrorResponse(value: str, local_code: str) -> Dict[str, Any]:
-    local_code = verify_localcode(local_code)
-    local = {}
-    with contextlib.suppress(KeyError):
-        local_dict = __LocalRead(local_code)
-        local = local_dict['errors'][value]
-    return local
-    
+    local = locales.get(f'errors.{value}', local_code)
+    return local if local is not None else {}
+
 
 def verify_localcode(local_code: str) -> str:
     if local_code in ['en-US', 'en-GB']:
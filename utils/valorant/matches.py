@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import collections
+import datetime
+import gzip
+import json
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .analytics import analytics_version, summarize
+
+store_dir = "data/matches"
+
+# match details never change once a match ends, keep the recently used ones on disk
+raw_max_bytes = 256 * 1024 * 1024
+summary_max_bytes = 64 * 1024 * 1024
+
+match_id_pattern = re.compile(r"[0-9a-fA-F-]{36}")
+
+
+class FileTier:
+    """ gzipped JSON files in a directory, the least recently used are removed over max_bytes """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+
+        self.__sizes: Optional[collections.OrderedDict] = None  # key -> size, least recently used first
+        self.__total: int = 0
+        self.__lock = threading.Lock()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json.gz")
+
+    def __scan(self) -> None:
+        if self.__sizes is not None:
+            return
+
+        files = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json.gz"):
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, entry.name[:-len(".json.gz")], stat.st_size))
+        except FileNotFoundError:
+            pass
+
+        self.__sizes = collections.OrderedDict((key, size) for _, key, size in sorted(files))
+        self.__total = sum(self.__sizes.values())
+
+    def read(self, key: str) -> Optional[Any]:
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(gzip.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError):
+            print(f"[{datetime.datetime.now()}] Can't read stored match: {path}")
+            self.remove(key)
+            return None
+
+        # mtime is the last use, it orders the files on the next start
+        with self.__lock:
+            self.__scan()
+            if key in self.__sizes:
+                self.__sizes.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def write(self, key: str, data: Any) -> None:
+        compressed = gzip.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.__path(key)
+        temp = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(compressed)
+        os.replace(temp, path)
+
+        with self.__lock:
+            self.__scan()
+            self.__total += len(compressed) - self.__sizes.pop(key, 0)
+            self.__sizes[key] = len(compressed)
+
+            while self.__total > self.max_bytes and len(self.__sizes) > 1:
+                old_key, size = self.__sizes.popitem(last=False)
+                self.__total -= size
+                try:
+                    os.remove(self.__path(old_key))
+                except FileNotFoundError:
+                    pass
+
+    def remove(self, key: str) -> None:
+        with self.__lock:
+            self.__scan()
+            self.__total -= self.__sizes.pop(key, 0)
+        try:
+            os.remove(self.__path(key))
+        except FileNotFoundError:
+            pass
+
+
+class MatchStore:
+    """ Match details and their analytics summaries, keyed by match id """
+
+    def __init__(self, path: str = store_dir) -> None:
+        self.raw: FileTier = FileTier(os.path.join(path, "raw"), raw_max_bytes)
+        self.summaries: FileTier = FileTier(os.path.join(path, "summary"), summary_max_bytes)
+        self.__listeners: List[Callable[[str, Dict[str, Any], Dict[str, Any]], None]] = []
+
+    def subscribe(self, listener: Callable[[str, Dict[str, Any], Dict[str, Any]], None]) -> Callable[[str, Dict[str, Any], Dict[str, Any]], None]:
+        """ Call listener(match_id, match_detail, summary) when a match is summarized for the first time, usable as a decorator """
+        self.__listeners.append(listener)
+        return listener
+
+    @staticmethod
+    def is_match_id(match_id: Any) -> bool:
+        return isinstance(match_id, str) and match_id_pattern.fullmatch(match_id) is not None
+
+    def get_details(self, match_id: str) -> Optional[Dict[str, Any]]:
+        if not self.is_match_id(match_id):
+            return None
+        return self.raw.read(match_id)
+
+    def put_details(self, match_id: str, match_detail: Any) -> None:
+        # only finished matches are served, errors and partial payloads are not kept
+        if self.is_match_id(match_id) and isinstance(match_detail, dict) and "matchInfo" in match_detail and "roundResults" in match_detail:
+            self.raw.write(match_id, match_detail)
+
+    def summary(self, match_id: str, match_detail: Dict[str, Any]) -> Dict[str, Any]:
+        """ Get the analytics summary of a match, computed again only when the analytics changed """
+        if not self.is_match_id(match_id):
+            return summarize(match_detail)
+
+        summary = self.summaries.read(match_id)
+        if summary is None or summary.get("version") != analytics_version:
+            summary = summarize(match_detail)
+            self.summaries.write(match_id, summary)
+
+            # a match is new to the listeners when its summary is, stored summaries were already announced
+            for listener in self.__listeners:
+                try:
+                    listener(match_id, match_detail, summary)
+                except Exception as e:
+                    print(f"[{datetime.datetime.now()}] Match listener failed: {e}")
+        return summary
+
+
+match_store = MatchStore()
@@ -0,0 +1,548 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import os
+import time
+import traceback
+import uuid
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+
+import aiohttp
+import discord
+
+import utils.config as Config
+
+if TYPE_CHECKING:
+    from bot import ValorantBot
+
+outbox_file = "data/outbox.jsonl"
+# days a delivered (user, day, kind) is remembered for deduplication
+sent_retention = 2
+max_attempts = 5
+retry_delay = 30.0
+
+# discord allows 50 requests/s per bot and 5 messages/5s per channel
+global_rate = 40.0
+channel_rate = 1.0
+channel_burst = 5
+
+
+def today() -> str:
+    return datetime.datetime.utcnow().strftime("%Y-%m-%d")
+
+
+# ---------- TOKEN BUCKET ---------- #
+
+class TokenBucket:
+    """ `rate` tokens per second, up to `capacity` saved up """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.tokens: float = capacity
+        self.updated: float = time.monotonic()
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """ Take a token, returns 0 or the seconds to wait before trying again """
+        self.__refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    @property
+    def full(self) -> bool:
+        self.__refill()
+        return self.tokens >= self.capacity
+
+    async def take(self) -> None:
+        while True:
+            delay = self.delay()
+            if delay == 0:
+                return
+            await asyncio.sleep(delay)
+
+
+# ---------- OUTBOX ---------- #
+
+class Outbox:
+    """ Rendered messages waiting for delivery, journaled to a JSON lines file """
+
+    def __init__(self, path: str = outbox_file) -> None:
+        self.path: str = path
+
+        self.__pending: Optional[Dict[str, Dict[str, Any]]] = None
+        self.__keys: Dict[str, str] = {}  # dedupe key -> pending entry id
+        self.__sent: Dict[str, str] = {}  # dedupe key -> day delivered
+        self.__lines: int = 0
+        self.__listeners: List[Callable[[], None]] = []
+
+    # ---------- JOURNAL ---------- #
+
+    def __load(self) -> None:
+        if self.__pending is not None:
+            return
+
+        self.__pending = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a line cut off by a crash
+                    self.__apply(record)
+                    self.__lines += 1
+        except FileNotFoundError:
+            pass
+
+        if len(self.__pending) > 0:
+            print(f"[{datetime.datetime.now()}] Outbox: {len(self.__pending)} messages left from the last run.")
+        self.__compact()
+
+    def __apply(self, record: Dict[str, Any]) -> None:
+        op = record.get("op")
+        if op == "put":
+            entry = record["entry"]
+            self.__pending[entry["id"]] = entry
+            self.__keys[entry["key"]] = entry["id"]
+        elif op == "retry":
+            entry = self.__pending.get(record["id"])
+            if entry is not None:
+                entry["attempts"] = record["attempts"]
+                entry["next_attempt"] = record["next_attempt"]
+        elif op in ("sent", "drop"):
+            entry = self.__pending.pop(record["id"], None)
+            if entry is not None:
+                self.__keys.pop(entry["key"], None)
+                if op == "sent":
+                    self.__sent[entry["key"]] = entry["day"]
+        elif op == "seen":
+            self.__sent[record["key"]] = record["day"]
+
+    def __write(self, *records: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as journal:
+            for record in records:
+                journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.__lines += len(records)
+
+        if self.__lines > max(1000, 4 * (len(self.__pending) + len(self.__sent))):
+            self.__compact()
+
+    def __compact(self) -> None:
+        """ Rewrite the journal with only the pending entries and the recent deliveries """
+        oldest = (datetime.datetime.utcnow() - datetime.timedelta(days=sent_retention)).strftime("%Y-%m-%d")
+        self.__sent = {key: day for key, day in self.__sent.items() if day >= oldest}
+
+        records = [{"op": "seen", "key": key, "day": day} for key, day in self.__sent.items()]
+        records += [{"op": "put", "entry": entry} for entry in self.__pending.values()]
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as journal:
+            for record in records:
+                journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(self.path + ".tmp", self.path)
+        self.__lines = len(records)
+
+    # ---------- QUEUE ---------- #
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """ Call listener() whenever messages are enqueued """
+        self.__listeners.append(listener)
+
+    def enqueue(
+        self,
+        user_id: Any,
+        kind: str,
+        *,
+        dm: bool = True,
+        channel_id: Optional[int] = None,
+        content: Optional[str] = None,
+        embeds: Optional[List[discord.Embed]] = None,
+        view: Optional[Dict[str, Any]] = None,
+        group: Optional[str] = None,  # channel messages of one group are identical and can be sent as one
+        day: Optional[str] = None,
+        priority: int = 1,  # lower priorities are sent first
+    ) -> bool:
+        """ Queue a message, returns False if the same (user, day, kind) was already queued or sent """
+        self.__load()
+
+        day = day or today()
+        key = f"{user_id}:{day}:{kind}"
+        if key in self.__keys or key in self.__sent:
+            return False
+
+        entry = {
+            "id": uuid.uuid4().hex,
+            "key": key,
+            "day": day,
+            "user_id": str(user_id),
+            "dm": dm,
+            "channel_id": channel_id,
+            "content": content,
+            "embeds": [embed.to_dict() for embed in embeds or []],
+            "view": view,
+            "group": group,
+            "priority": priority,
+            "attempts": 0,
+            "next_attempt": 0.0,
+        }
+        self.__pending[entry["id"]] = entry
+        self.__keys[key] = entry["id"]
+        self.__write({"op": "put", "entry": entry})
+
+        for listener in self.__listeners:
+            listener()
+        return True
+
+    def due(self, now: float) -> List[Dict[str, Any]]:
+        """ Get the entries that can be sent now, by priority and then oldest first """
+        self.__load()
+        return sorted((entry for entry in self.__pending.values() if entry["next_attempt"] <= now), key=lambda entry: entry.get("priority", 1))
+
+    def is_pending(self, entry: Dict[str, Any], now: float) -> bool:
+        """ Check that an entry is neither sent, dropped nor waiting for a retry """
+        self.__load()
+        return entry["id"] in self.__pending and entry["next_attempt"] <= now
+
+    def next_attempt(self, after: float) -> Optional[float]:
+        """ Get the time of the first retry after a time """
+        self.__load()
+        return min((entry["next_attempt"] for entry in self.__pending.values() if entry["next_attempt"] > after), default=None)
+
+    def sent(self, entry: Dict[str, Any]) -> None:
+        if self.__pending.pop(entry["id"], None) is not None:
+            self.__keys.pop(entry["key"], None)
+            self.__sent[entry["key"]] = entry["day"]
+            self.__write({"op": "sent", "id": entry["id"]})
+
+    def retry(self, entry: Dict[str, Any]) -> bool:
+        """ Back off a transient failure, returns False once the entry is out of attempts """
+        entry["attempts"] += 1
+        if entry["attempts"] >= max_attempts:
+            self.drop(entry)
+            return False
+        entry["next_attempt"] = time.time() + retry_delay * 2 ** (entry["attempts"] - 1)
+        self.__write({"op": "retry", "id": entry["id"], "attempts": entry["attempts"], "next_attempt": entry["next_attempt"]})
+        return True
+
+    def drop(self, entry: Dict[str, Any]) -> None:
+        if self.__pending.pop(entry["id"], None) is not None:
+            self.__keys.pop(entry["key"], None)
+            self.__write({"op": "drop", "id": entry["id"]})
+
+    def __len__(self) -> int:
+        self.__load()
+        return len(self.__pending)
+
+
+outbox = Outbox()
+
+
+# ---------- DM CHANNELS ---------- #
+
+# changes are written in batches, each write merges in the entries of the other workers
+dm_flush_batch = 100
+dm_flush_interval = 30.0
+
+
+class DMChannels:
+    """ User id -> DM channel id, so that DMs need neither fetch_user nor create_dm """
+
+    def __init__(self, filename: str = "dm_channels") -> None:
+        self.path: str = f"data/{filename}.json"
+        self.__channels: Optional[Dict[str, int]] = None
+        self.__changes: Dict[str, Optional[int]] = {}  # user id -> channel id, None when forgotten
+        self.__flushed: float = time.monotonic()
+
+    def __read(self) -> Dict[str, int]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            # only a cache, a lost entry means one more create_dm
+            print(f"[{datetime.datetime.now()}] Outbox: {self.path} is broken, starting over.")
+            return {}
+
+    def __load(self) -> Dict[str, int]:
+        if self.__channels is None:
+            self.__channels = self.__read()
+        return self.__channels
+
+    def get(self, user_id: Any) -> Optional[int]:
+        return self.__load().get(str(user_id))
+
+    def __update(self, user_id: Any, channel_id: Optional[int]) -> None:
+        channels = self.__load()
+        if channel_id is None:
+            channels.pop(str(user_id), None)
+        else:
+            channels[str(user_id)] = channel_id
+        self.__changes[str(user_id)] = channel_id
+
+        if len(self.__changes) >= dm_flush_batch or time.monotonic() - self.__flushed >= dm_flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """ Write the changes, read back in first as notifier workers share the file """
+        self.__flushed = time.monotonic()
+        if len(self.__changes) == 0:
+            return
+
+        channels = self.__read()
+        for user_id, channel_id in self.__changes.items():
+            if channel_id is None:
+                channels.pop(user_id, None)
+            else:
+                channels[user_id] = channel_id
+        self.__changes = {}
+
+        # replaced in one go, a worker never reads a half written file
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump(channels, file, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.__channels = channels
+
+    def set(self, user_id: Any, channel_id: int) -> None:
+        if self.__load().get(str(user_id)) != channel_id:
+            self.__update(user_id, channel_id)
+
+    def forget(self, user_id: Any) -> None:
+        if self.__load().get(str(user_id)) is not None:
+            self.__update(user_id, None)
+
+
+dm_channels = DMChannels()
+
+
+# ---------- DISPATCHER ---------- #
+
+webhook_name = "Valorant Notify"
+# discord limit of the message content, grouped mentions are split to fit
+content_limit = 2000
+
+
+class Dispatcher:
+    """ Drain the outbox, paced by global and per-channel token buckets """
+
+    def __init__(self, bot: ValorantBot, box: Outbox = outbox, concurrency: int = 8, rate: float = global_rate) -> None:
+        """ rate is the share of the global limit, processes using the same bot token split it """
+        self.bot: ValorantBot = bot
+        self.outbox: Outbox = box
+        self.concurrency: int = concurrency
+
+        # view factories by name, for messages with buttons: factory(spec) -> discord.ui.View
+        self.views: Dict[str, Callable[[Dict[str, Any]], discord.ui.View]] = {}
+
+        self.__global = TokenBucket(rate, rate)
+        self.__channels: Dict[str, TokenBucket] = {}
+        self.__busy: set = set()
+        self.__webhooks: Dict[int, discord.Webhook] = {}
+        self.__no_webhook: set = set()  # channels where the bot can't manage webhooks
+        self.__wake = asyncio.Event()
+        self.__task: Optional[asyncio.Task] = None
+        self.outbox.subscribe(self.__wake.set)
+
+    def start(self) -> None:
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.get_running_loop().create_task(self.__run())
+
+    def stop(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+        dm_channels.flush()
+
+    @property
+    def use_webhooks(self) -> bool:
+        return bool(Config.LoadConfig().get("notify", {}).get("webhooks", False))
+
+    @staticmethod
+    def channel_key(entry: Dict[str, Any]) -> str:
+        return f"dm:{entry['user_id']}" if entry["dm"] else f"channel:{entry['channel_id']}"
+
+    def __channel_bucket(self, key: str) -> TokenBucket:
+        bucket = self.__channels.get(key)
+        if bucket is None:
+            # idle channels are back to a full bucket, no need to keep them
+            if len(self.__channels) > 1000:
+                self.__channels = {k: b for k, b in self.__channels.items() if not b.full or k in self.__busy}
+            bucket = self.__channels[key] = TokenBucket(channel_rate, channel_burst)
+        return bucket
+
+    def group(self, entry: Dict[str, Any], due: List[Dict[str, Any]], now: float) -> List[Dict[str, Any]]:
+        """ Get the entries sent together with entry, the same message to one channel with all their mentions """
+        if entry["dm"] or entry.get("group") is None:
+            return [entry]
+
+        entries = [entry]
+        length = len(entry["content"] or "")
+        for other in due:
+            if other is entry or other["dm"] or other.get("group") != entry["group"] or other["channel_id"] != entry["channel_id"]:
+                continue
+            if not self.outbox.is_pending(other, now):
+                continue
+            length += len(other["content"] or "") + 1
+            if length > content_limit:
+                break
+            entries.append(other)
+        return entries
+
+    async def __run(self) -> None:
+        await self.bot.wait_until_ready()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        while True:
+            self.__wake.clear()
+            now = time.time()
+            waits = []
+            webhooks = self.use_webhooks
+
+            # one message in flight per channel keeps each channel in order
+            due = self.outbox.due(now)
+            for entry in due:
+                key = self.channel_key(entry)
+                if key in self.__busy or not self.outbox.is_pending(entry, now):
+                    continue
+                delay = self.__channel_bucket(key).delay()
+                if delay > 0:
+                    waits.append(delay)
+                    continue
+                # webhooks have their own rate limits
+                if not webhooks or entry["dm"]:
+                    await self.__global.take()
+                await semaphore.acquire()
+                # due goes stale while waiting, the entry may have been sent with its group or retried meanwhile
+                if not self.outbox.is_pending(entry, now):
+                    semaphore.release()
+                    continue
+                self.__busy.add(key)
+                asyncio.get_running_loop().create_task(self.__send(self.group(entry, due, now), key, webhooks, semaphore))
+
+            # nothing in flight, save the DM channels opened meanwhile
+            if len(self.__busy) == 0:
+                dm_channels.flush()
+
+            # sleep until a channel has a token, a retry is due or something is enqueued or sent
+            next_attempt = self.outbox.next_attempt(now)
+            if next_attempt is not None:
+                waits.append(next_attempt - time.time())
+            timeout = max(0.0, min(waits)) if len(waits) > 0 else None
+            try:
+                await asyncio.wait_for(self.__wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def __target(self, entry: Dict[str, Any], webhooks: bool) -> Optional[discord.abc.Messageable]:
+        if entry["dm"]:
+            # a known DM channel is sent to directly, otherwise it is opened once and remembered
+            channel_id = dm_channels.get(entry["user_id"])
+            if channel_id is None:
+                user_id = int(entry["user_id"])
+                user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+                channel = user.dm_channel or await user.create_dm()
+                dm_channels.set(entry["user_id"], channel.id)
+                return channel
+            return self.bot.get_partial_messageable(channel_id, type=discord.ChannelType.private)
+
+        channel_id = int(entry["channel_id"])
+        channel = self.bot.get_channel(channel_id)
+        if channel is None and webhooks:
+            channel = await self.bot.fetch_channel(channel_id)  # webhooks are managed on the full channel
+        return channel or self.bot.get_partial_messageable(channel_id)
+
+    async def __webhook(self, channel: discord.abc.Messageable) -> Optional[discord.Webhook]:
+        """ Get the notify webhook of a channel, made on first use """
+        if not isinstance(channel, discord.TextChannel) or channel.id in self.__no_webhook:
+            return None
+
+        webhook = self.__webhooks.get(channel.id)
+        if webhook is None:
+            try:
+                webhook = next((w for w in await channel.webhooks() if w.name == webhook_name and w.user is not None and w.user.id == self.bot.user.id), None)
+                if webhook is None:
+                    webhook = await channel.create_webhook(name=webhook_name, reason="notify delivery")
+            except discord.Forbidden:
+                print(f"[{datetime.datetime.now()}] Outbox: no permission to manage webhooks in {channel.id}, sending as the bot.")
+                self.__no_webhook.add(channel.id)
+                return None
+            self.__webhooks[channel.id] = webhook
+        return webhook
+
+    async def __send(self, entries: List[Dict[str, Any]], key: str, webhooks: bool, semaphore: asyncio.Semaphore) -> None:
+        entry = entries[0]
+        webhook = None
+        try:
+            target = await self.__target(entry, webhooks)
+            if target is None:
+                print(f"[{datetime.datetime.now()}] Outbox: no channel for {entry['key']}, dropped.")
+                for item in entries:
+                    self.outbox.drop(item)
+                return
+
+            content = " ".join(e["content"] for e in entries if e["content"]) or None
+            kwargs = {"content": content, "embeds": [discord.Embed.from_dict(embed) for embed in entry["embeds"]]}
+            view = None
+            if entry["view"] is not None and entry["view"].get("type") in self.views:
+                view = kwargs["view"] = self.views[entry["view"]["type"]](entry["view"])
+
+            if webhooks and not entry["dm"]:
+                webhook = await self.__webhook(target)
+
+            if webhook is not None:
+                message = await webhook.send(username=self.bot.user.name, avatar_url=self.bot.user.display_avatar.url, wait=True, **kwargs)
+            else:
+                message = await target.send(**kwargs)
+            if view is not None:
+                view.message = message
+            for item in entries:
+                self.outbox.sent(item)
+
+        except (discord.Forbidden, discord.NotFound) as e:
+            if webhook is not None and isinstance(e, discord.NotFound):
+                # the webhook was deleted, make a new one on the next try
+                self.__webhooks.pop(webhook.channel_id, None)
+                for item in entries:
+                    self.outbox.retry(item)
+            elif entry["dm"] and isinstance(e, discord.NotFound) and dm_channels.get(entry["user_id"]) is not None:
+                # a stale DM channel, open a new one on the next try
+                dm_channels.forget(entry["user_id"])
+                for item in entries:
+                    self.outbox.retry(item)
+            else:
+                if entry["dm"]:
+                    dm_channels.forget(entry["user_id"])
+                print(f"[{datetime.datetime.now()}] Outbox: can't send {entry['key']} (no access), dropped.")
+                for item in entries:
+                    self.outbox.drop(item)
+        except (discord.HTTPException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # 429 and 5xx are worth another try, other errors will fail again
+            status = getattr(e, "status", None)
+            if isinstance(e, discord.HTTPException) and status != 429 and status < 500:
+                print(f"[{datetime.datetime.now()}] Outbox: can't send {entry['key']} ({status}), dropped.")
+                for item in entries:
+                    self.outbox.drop(item)
+            else:
+                for item in entries:
+                    if not self.outbox.retry(item):
+                        print(f"[{datetime.datetime.now()}] Outbox: {item['key']} failed {max_attempts} times, dropped.")
+        except Exception as e:
+            print(e)
+            traceback.print_exception(type(e), e, e.__traceback__)
+            for item in entries:
+                self.outbox.drop(item)
+        finally:
+            self.__busy.discard(key)
+            semaphore.release()
+            self.__wake.set()
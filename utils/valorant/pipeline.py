@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+from typing import Any, Callable, Dict, List, Optional
+
+from .matches import match_store
+from .outbox import TokenBucket
+from .player_stats import player_stats
+
+# match requests of every command share these, riot limits each token to a few requests a second
+fetch_concurrency = 4
+fetch_rate = 4.0
+
+# recent matches of each lobby member behind the /custom rating
+lobby_matches = 5
+
+
+async def run_blocking(func: Callable, *args: Any) -> Any:
+    """ Run func in the default executor, with the locale of the caller """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(contextvars.copy_context().run, func, *args))
+
+
+class RiotLimiter:
+    """ Bounded concurrency and rate of requests to riot """
+
+    def __init__(self, concurrency: int = fetch_concurrency, rate: float = fetch_rate) -> None:
+        self.concurrency: int = concurrency
+        self.bucket: TokenBucket = TokenBucket(rate, rate)
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self) -> None:
+        # made on first use, so it belongs to the running loop
+        loop = asyncio.get_running_loop()
+        if self.__loop is not loop:
+            self.__semaphore, self.__loop = asyncio.Semaphore(self.concurrency), loop
+        await self.__semaphore.acquire()
+        await self.bucket.take()
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.__semaphore.release()
+
+
+limiter = RiotLimiter()
+
+
+async def fetch_match_details(endpoint, match_id: str) -> Optional[Dict[str, Any]]:
+    """ Match details from the match store, or from riot under the limiter """
+    match_detail = await run_blocking(match_store.get_details, match_id)
+    if match_detail is None:
+        async with limiter:
+            match_detail = await run_blocking(endpoint.fetch_match_details, match_id)
+    return match_detail
+
+
+async def fetch_limited(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """ Run a blocking riot request under the limiter """
+    async with limiter:
+        return await run_blocking(functools.partial(func, *args, **kwargs))
+
+
+async def lobby_stats(endpoint, puuids: List[str], queue: str = "competitive", index: int = lobby_matches) -> Dict[str, Dict[str, Any]]:
+    """ MMR, name and recent match averages of every lobby member, a match shared by members is fetched and analysed once """
+    mmrs, histories = await asyncio.gather(
+        asyncio.gather(*(fetch_limited(endpoint.fetch_player_mmr, puuid) for puuid in puuids)),
+        asyncio.gather(*(fetch_limited(endpoint.fetch_match_history, index=index, puuid=puuid, not_found_error=False, queue=queue) for puuid in puuids)),
+    )
+
+    # members who haven't played this act fall back to the live one, looked up once
+    season_ids = [mmr["LatestCompetitiveUpdate"]["SeasonID"] or "" for mmr in mmrs]
+    if not all(season_ids):
+        live_season = await fetch_limited(endpoint.get_live_season)
+        season_ids = [season_id or live_season for season_id in season_ids]
+
+    # only matches the stats store hasn't counted yet, each once, in the order members first played them
+    member_matches = {puuid: [d["MatchID"] for d in history.get("Matches", [])] for puuid, history in zip(puuids, histories)}
+    missing = {puuid: set(ids) - set(player_stats.recent_ids(puuid, queue)) for puuid, ids in member_matches.items()}
+    match_ids = list(dict.fromkeys(match_id for puuid, ids in member_matches.items() for match_id in ids if match_id in missing[puuid]))
+
+    async def analyse(match_id: str) -> None:
+        match_detail = await fetch_match_details(endpoint, match_id)
+        if match_detail is not None:
+            # a new summary is counted for every player in it, the members missing a stored one are counted here
+            summary = await run_blocking(match_store.summary, match_id, match_detail)
+            members = [puuid for puuid in puuids if match_id in missing[puuid]]
+            await run_blocking(player_stats.record, match_id, match_detail, summary, members)
+
+    await asyncio.gather(*(analyse(match_id) for match_id in match_ids))
+
+    lobby = {}
+    for puuid, mmr, season_id in zip(puuids, mmrs, season_ids):
+        lobby[puuid] = {
+            "mmr": mmr,
+            "season_id": season_id,
+            "name": player_stats.name(puuid, queue) if member_matches[puuid] else "",
+            "stats": player_stats.matches(puuid, member_matches[puuid], queue),
+        }
+
+    # members without matches, named in a single request
+    unnamed = [puuid for puuid, member in lobby.items() if member["name"] == ""]
+    if unnamed:
+        for name in await fetch_limited(endpoint.fetch_name_by_puuid, unnamed):
+            if name.get("Subject") in lobby:
+                lobby[name["Subject"]]["name"] = name["GameName"] + "#" + name["TagLine"]
+    return lobby
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import collections
+import threading
+from typing import Any, Dict, List, Optional
+
+from .matches import FileTier, match_store
+
+store_dir = "data/players"
+max_bytes = 32 * 1024 * 1024
+memory_records = 1024  # records kept decoded in memory
+memory_matches = 4096  # match ids counted for all their players, checked before any record is read
+
+stats_version = 1
+
+# the windows read in O(1), the longest one bounds the recent matches kept
+window_sizes = (5, 20)
+max_window = max(window_sizes)
+
+stat_keys = ("kills", "deaths", "assists", "kd", "kda", "acs", "eco_rating", "adr", "win", "lose", "draw")
+
+
+def match_entries(match_detail: Dict[str, Any], summary: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """ What a match adds to the record of each of its players """
+    info = match_detail["matchInfo"]
+    teams = match_detail.get("teams") or []
+    rounds_won = {t["teamId"]: t.get("roundsWon", 0) for t in teams}
+    won = {t["teamId"]: t.get("won", False) for t in teams}
+    draw = len(teams) == 2 and len(set(rounds_won.values())) == 1
+
+    entries = {}
+    for p in match_detail.get("players", []):
+        puuid = p["subject"]
+        player_stats = summary["players"].get(puuid)
+        if player_stats is None:
+            continue
+
+        stats = p.get("stats") or {}
+        result = {"win": 0, "lose": 0, "draw": 0}
+        if len(teams) == 2:
+            result["draw" if draw else ("win" if won.get(p["teamId"]) else "lose")] = 1
+
+        entries[puuid] = {
+            "match_id": info["matchId"],
+            "start": info["gameStartMillis"],
+            "season_id": info["seasonId"],
+            "name": "{name}#{tagline}".format(name=p["gameName"], tagline=p["tagLine"]),
+            "kills": stats.get("kills", 0),
+            "deaths": stats.get("deaths", 0),
+            "assists": stats.get("assists", 0),
+            "kd": player_stats["kd"],
+            "kda": player_stats["kda"],
+            "acs": player_stats["acs"],
+            "eco_rating": player_stats.get("eco_rating", 0),
+            "adr": player_stats.get("adr", 0),
+            **result,
+        }
+    return entries
+
+
+def aggregate(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """ Sums of stat_keys and the number of matches """
+    sums = {"count": len(entries)}
+    for key in stat_keys:
+        sums[key] = 0
+        for entry in entries:
+            sums[key] += entry[key]
+    return sums
+
+
+def averages(sums: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not sums or sums["count"] == 0:
+        return None
+    result = {key: sums[key] / sums["count"] for key in stat_keys}
+    result["count"] = sums["count"]
+    return result
+
+
+class PlayerStatsStore:
+    """ Rolling stats of each player and queue, updated as matches are summarized """
+
+    def __init__(self, path: str = store_dir) -> None:
+        self.tier: FileTier = FileTier(path, max_bytes)
+        self.__records: collections.OrderedDict = collections.OrderedDict()
+        self.__counted: collections.OrderedDict = collections.OrderedDict()
+        self.__lock = threading.RLock()
+
+    def __get(self, puuid: str) -> Dict[str, Any]:
+        record = self.__records.get(puuid)
+        if record is None:
+            record = self.tier.read(puuid)
+            if record is None or record.get("version") != stats_version:
+                record = {"version": stats_version, "queues": {}}
+        self.__records[puuid] = record
+        self.__records.move_to_end(puuid)
+        while len(self.__records) > memory_records:
+            self.__records.popitem(last=False)
+        return record
+
+    def __add(self, record: Dict[str, Any], queue: str, entry: Dict[str, Any]) -> bool:
+        stats = record["queues"].setdefault(queue, {"recent": [], "windows": {}, "season": None})
+        recent, season = stats["recent"], stats["season"]
+
+        # season to date, a newer season starts over and older ones are left out
+        if season is None or (entry["season_id"] != season["season_id"] and entry["start"] > season["latest"]):
+            season = stats["season"] = {"season_id": entry["season_id"], "latest": entry["start"], "match_ids": [], "sums": aggregate([])}
+        in_season = entry["season_id"] == season["season_id"] and entry["match_id"] not in season["match_ids"]
+        if in_season:
+            season["match_ids"].append(entry["match_id"])
+            season["latest"] = max(season["latest"], entry["start"])
+            for key in stat_keys:
+                season["sums"][key] += entry[key]
+            season["sums"]["count"] += 1
+
+        # the latest matches, newest first
+        in_recent = all(e["match_id"] != entry["match_id"] for e in recent) and (len(recent) < max_window or entry["start"] > recent[-1]["start"])
+        if in_recent:
+            i = 0
+            while i < len(recent) and recent[i]["start"] > entry["start"]:
+                i += 1
+            recent.insert(i, entry)
+            del recent[max_window:]
+            stats["windows"] = {str(size): aggregate(recent[:size]) for size in window_sizes}
+            stats["name"] = recent[0]["name"]
+
+        return in_season or in_recent
+
+    def record(self, match_id: str, match_detail: Dict[str, Any], summary: Dict[str, Any], puuids: Optional[List[str]] = None) -> None:
+        """ Add a match to the records of its players, or only of puuids, each record skips a match it already counted """
+        # a hint for whole matches only, a record evicted from the tier has lost the matches counted here
+        with self.__lock:
+            if puuids is None and match_id in self.__counted:
+                self.__counted.move_to_end(match_id)
+                return
+
+        queue = match_detail["matchInfo"].get("queueID") or ""
+        entries = match_entries(match_detail, summary)
+        if puuids is not None:
+            entries = {puuid: entry for puuid, entry in entries.items() if puuid in puuids}
+
+        with self.__lock:
+            for puuid, entry in entries.items():
+                record = self.__get(puuid)
+                if self.__add(record, queue, entry):
+                    self.tier.write(puuid, record)
+
+            if puuids is None:
+                self.__counted[match_id] = True
+                while len(self.__counted) > memory_matches:
+                    self.__counted.popitem(last=False)
+
+    def __queue(self, puuid: str, queue: str) -> Optional[Dict[str, Any]]:
+        with self.__lock:
+            return self.__get(puuid)["queues"].get(queue)
+
+    def window(self, puuid: str, queue: str = "competitive", size: int = window_sizes[0]) -> Optional[Dict[str, Any]]:
+        """ Averages over the last size matches, size is one of window_sizes """
+        stats = self.__queue(puuid, queue)
+        return averages(stats["windows"].get(str(size))) if stats else None
+
+    def season(self, puuid: str, queue: str = "competitive", season_id: str = None) -> Optional[Dict[str, Any]]:
+        """ Averages over the latest season, or None when season_id is not it """
+        stats = self.__queue(puuid, queue)
+        if not stats or stats["season"] is None or (season_id is not None and stats["season"]["season_id"] != season_id):
+            return None
+        return averages(stats["season"]["sums"])
+
+    def matches(self, puuid: str, match_ids: List[str], queue: str = "competitive") -> Optional[Dict[str, Any]]:
+        """ Averages over match_ids, the latest matches newest first, read from a window when they are one """
+        stats = self.__queue(puuid, queue)
+        if not stats or not match_ids:
+            return None
+
+        counted = [entry["match_id"] for entry in stats["recent"]]
+        if len(match_ids) in window_sizes and counted[:len(match_ids)] == match_ids:
+            return averages(stats["windows"].get(str(len(match_ids))))
+        return averages(aggregate([entry for entry in stats["recent"] if entry["match_id"] in match_ids]))
+
+    def recent_ids(self, puuid: str, queue: str = "competitive") -> List[str]:
+        """ Match ids already counted, newest first """
+        stats = self.__queue(puuid, queue)
+        return [entry["match_id"] for entry in stats["recent"]] if stats else []
+
+    def name(self, puuid: str, queue: str = "competitive") -> str:
+        stats = self.__queue(puuid, queue)
+        return stats.get("name", "") if stats else ""
+
+
+player_stats = PlayerStatsStore()
+
+
+@match_store.subscribe
+def __match_summarized(match_id: str, match_detail: Dict[str, Any], summary: Dict[str, Any]) -> None:
+    player_stats.record(match_id, match_detail, summary)
@@ -3,15 +3,19 @@ from __future__ import annotations
 from io import BytesIO
 from typing import Optional, TYPE_CHECKING
 
+import aiohttp
 import asyncio
+import collections
+import contextlib
+import hashlib
 import os
 import json
 import discord
-import requests
 import glob
+from PIL import Image
 
 import utils.config as Config
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Tuple
 from .local import LocalErrorResponse
 from ..errors import ValorantBotError
 
@@ -89,14 +93,42 @@ def get_item_type(uuid: str) -> Optional[str]:
     return item_type.get(uuid, None)
 
 
-def __url_to_image(url) -> Optional[bytes]:
-    session = requests.session()
-    
-    r = session.get(url)
-    image = BytesIO(r.content)
-    image_value = image.getvalue()
-    if r.status_code in range(200, 299):
-        return image_value
+# emoji limits of discord
+emoji_size = 128
+emoji_max_bytes = 256 * 1024
+# tries after a server or network error, discord.py paces the rate limits itself
+emoji_retries = 2
+progress_interval = 2.0
+
+
+def __normalize_emoji(data: bytes) -> Optional[bytes]:
+    """ Fit an image into the emoji limits, as PNG """
+    image = Image.open(BytesIO(data))
+    image.load()
+    image = image.convert("RGBA")
+
+    size = emoji_size
+    while True:
+        image.thumbnail((size, size), Image.LANCZOS)
+        buffer = BytesIO()
+        image.save(buffer, "PNG", optimize=True)
+        if buffer.tell() > emoji_max_bytes:
+            buffer = BytesIO()
+            image.quantize(256).save(buffer, "PNG", optimize=True)
+        if buffer.tell() <= emoji_max_bytes or size <= 32:
+            return buffer.getvalue()
+        size //= 2
+
+
+def __load_emoji(url: str) -> Optional[Tuple[bytes, str]]:
+    """ Download and normalize an emoji image, returns the image and its content hash """
+    from .assets import store
+
+    data = store.fetch(url)
+    if data is None:
+        return None
+    image = __normalize_emoji(data)
+    return image, hashlib.sha256(image).hexdigest()
 
 # FROM useful.py
 def json_save(filename: str, data: Dict) -> None:
@@ -122,12 +154,12 @@ def json_read(filename: str, force: bool = True) -> Dict:
         return data
 
 
-async def setup_emoji(bot: ValorantBot, guild: discord.Guild, local_code: str, force: bool = False, reset: bool = False) -> str:
+async def setup_emoji(bot: ValorantBot, guild: discord.Guild, local_code: str, force: bool = False, reset: bool = False, progress: Optional[Callable[[str], Awaitable[None]]] = None) -> str:
     response = LocalErrorResponse('SETUP_EMOJI', local_code)
     cache = json_read('cache')
     config = Config.LoadConfig()
 
-    main_server_id = config.get("emoji-server-id", [])
+    main_server_id = [int(i) for i in config.get("emoji-server-id", [])]
     emoji_mode = config.get("emojis", {})
     
     reg_emojis = []
@@ -155,60 +187,152 @@ async def setup_emoji(bot: ValorantBot, guild: discord.Guild, local_code: str, f
             if rank["icon"]!=None:
                 reg_emojis.append({"name": name, "url": rank["icon"], "animated": False})
 
+    # emojis are created in every configured server that the bot is in
+    guilds = [g for g in (bot.get_guild(i) for i in main_server_id) if g is not None]
+    if guild.id in main_server_id and guild not in guilds:
+        guilds.append(guild)
+    hashes = json_read('emoji_hashes')
+
+    status = {"done": 0, "created": 0, "skipped": 0, "failed": 0, "reported": 0.0}
+    loop = asyncio.get_running_loop()
+
+    async def report(final: bool = False) -> None:
+        if progress is None or (not final and loop.time() - status["reported"] < progress_interval):
+            return
+        status["reported"] = loop.time()
+        with contextlib.suppress(discord.HTTPException):
+            await progress(response.get('PROGRESS', '').format(total=len(reg_emojis), **status))
+
     # Remove Emoji
     if reset:
         print("------ REMOVE EMOJI ------")
-        emojis = await guild.fetch_emojis()
-        for emoji in emojis:
-            if bot.user==emoji.user:
+
+        async def remove(target: discord.Guild) -> None:
+            for emoji in await target.fetch_emojis():
+                if bot.user!=emoji.user:
+                    continue
                 try:
-                    await asyncio.wait_for(emoji.delete(reason="auto deletion"), timeout=1)
+                    await emoji.delete(reason="auto deletion")
                     print(f"Removed emoji \"{emoji.name}\", {emoji.id}.")
                 except discord.Forbidden:
                     if force:
                         raise ValorantBotError(response.get('MISSING_PERM'))
-                    continue
-                except discord.HTTPException:
+                    return
+                except (discord.HTTPException, aiohttp.ClientError, asyncio.TimeoutError):
                     print(response.get('FAILED_MANAGE_EMOJI'))
-                    pass
-                except asyncio.TimeoutError:
-                    print(f"Failed to remove emoji \"{name}\" from \"{url}\". (TIMEOUT)")
-                    pass
 
-    # Setup emoji
+        await asyncio.gather(*(remove(target) for target in guilds))
+        hashes = {}
+
+    # Download
     print("------ CREATE EMOJI ------")
-    ret_message = ""
+    images = await asyncio.gather(*(loop.run_in_executor(None, __load_emoji, e["url"]) for e in reg_emojis), return_exceptions=True)
+
     emoji_list = {}
+    existing = {}
+    for emoji in bot.emojis:
+        existing.setdefault(emoji.name, emoji)
 
-    for e in reg_emojis:
+    queue: Deque[Dict[str, Any]] = collections.deque()
+    for e, image in zip(reg_emojis, images):
         name = e["name"]
-        url = e["url"]
+        if image is None or isinstance(image, BaseException):
+            print(f"Failed to download emoji \"{name}\" from \"{e['url']}\".")
+            status["failed"] += 1
+            status["done"] += 1
+            continue
 
-        emoji = discord.utils.get(bot.emojis, name=name)
+        image, digest = image
+        emoji = existing.get(name)
+        if emoji is not None and not reset and hashes.get(name, digest) == digest:
+            # unchanged, emojis made before hashes were kept are adopted as they are
+            emoji_list[name] = str(emoji)
+            hashes[name] = digest
+            status["skipped"] += 1
+            status["done"] += 1
+            continue
 
-        if not emoji:
+        # a changed emoji of ours is replaced, reset already removed them
+        replace = emoji if emoji is not None and not reset and emoji.guild_id in main_server_id else None
+        queue.append({"name": name, "url": e["url"], "image": image, "hash": digest, "replace": replace, "retries": 0})
+
+    if len(queue) > 0 and len(guilds) == 0:
+        raise ValorantBotError(response.get('NOT_MAINSERVER'))
+    await report(True)
+
+    async def uploaded(target: discord.Guild, name: str) -> Optional[discord.Emoji]:
+        """ Get our emoji named name on a server, an upload can go through even though its request failed """
+        with contextlib.suppress(discord.HTTPException, aiohttp.ClientError, asyncio.TimeoutError):
+            for emoji in await target.fetch_emojis():
+                if emoji.name == name and (emoji.user is None or emoji.user == bot.user):
+                    return emoji
+        return None
+
+    # Create, one worker per server so the servers are filled side by side
+    async def provision(target: discord.Guild) -> None:
+        free = target.emoji_limit - len([emoji for emoji in target.emojis if not emoji.animated])
+
+        def created(e: Dict[str, Any], emoji: discord.Emoji) -> None:
+            nonlocal free
+            emoji_list[e["name"]] = str(emoji)
+            hashes[e["name"]] = e["hash"]
+            free -= 1
+            status["created"] += 1
+            print(f"Created emoji \"{e['name']}\" from \"{e['url']}\".")
+
+        while len(queue) > 0 and free > 0:
+            e = queue.popleft()
+            name = e["name"]
             try:
-                if int(str(guild.id)) in main_server_id:
-                    emoji = await asyncio.wait_for(guild.create_custom_emoji(name=name, image=__url_to_image(url), reason="auto creation"), timeout=1)
-                    
-                    emoji_list[e["name"]] = f"<:{name}:{emoji.id}>"
-                    ret_message += f"<:{name}:{emoji.id}> "
-                    print(f"Created emoji \"{name}\" from \"{url}\".")
-                else:
-                    raise ValorantBotError(response.get('NOT_MAINSERVER'))
+                replace = e["replace"]
+                if replace is not None:
+                    with contextlib.suppress(discord.NotFound):
+                        await replace.delete(reason="auto update")
+                    e["replace"] = None
+                    if replace.guild_id == target.id:
+                        free += 1
+
+                created(e, await target.create_custom_emoji(name=name, image=e["image"], reason="auto creation"))
             except discord.Forbidden:
                 if force:
                     raise ValorantBotError(response.get('MISSING_PERM'))
-                continue
-            except discord.HTTPException:
-                print(response.get('FAILED_MANAGE_EMOJI'))
-                pass
-            except asyncio.TimeoutError:
-                print(f"Failed to create emoji \"{name}\" from \"{url}\". (TIMEOUT)")
-                pass
-        else:
-            emoji_list[name] = f"<:{name}:{emoji.id}>"
-            ret_message += f"<:{name}:{emoji.id}> "
-
-    json_save("emoji", emoji_list)
-    return ret_message
+                queue.appendleft(e)
+                return
+            except (discord.HTTPException, aiohttp.ClientError, asyncio.TimeoutError) as error:
+                if getattr(error, "code", None) == 30008:  # maximum number of emojis reached
+                    queue.appendleft(e)
+                    return
+
+                # server and network errors, the emoji may exist anyway
+                if not isinstance(error, discord.HTTPException) or error.status >= 500:
+                    emoji = await uploaded(target, name) if e["replace"] is None else None
+                    if emoji is not None:
+                        created(e, emoji)
+                    elif e["retries"] < emoji_retries:
+                        e["retries"] += 1
+                        queue.append(e)
+                        continue
+                    else:
+                        print(f"Failed to create emoji \"{name}\" from \"{e['url']}\". ({error})")
+                        status["failed"] += 1
+                else:
+                    print(response.get('FAILED_MANAGE_EMOJI'))
+                    status["failed"] += 1
+
+            status["done"] += 1
+            await report()
+
+    try:
+        await asyncio.gather(*(provision(target) for target in guilds))
+    finally:
+        status["failed"] += len(queue)
+        status["done"] += len(queue)
+
+        json_save("emoji", emoji_list)
+        json_save("emoji_hashes", hashes)
+
+        from .emojis import registry
+        registry.invalidate()
+
+    await report(True)
+    return "".join(f"{emoji_list[e['name']]} " for e in reg_emojis if e["name"] in emoji_list)
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import bisect
+import difflib
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Set, Tuple
+
+from discord import app_commands
+
+from .catalog import Catalog, get_catalog
+
+# ---------- NORMALIZE ---------- #
+
+def normalize(text: Optional[str]) -> str:
+    """ Fold a name for matching: width, case, kana and punctuation """
+    if not text:
+        return ""
+
+    text = unicodedata.normalize("NFKC", str(text)).casefold()
+
+    folded = []
+    for char in text:
+        code = ord(char)
+        # katakana -> hiragana
+        if 0x30A1 <= code <= 0x30F6:
+            char = chr(code - 0x60)
+        # drop punctuation, symbols and spaces
+        elif unicodedata.category(char)[0] in ("P", "S", "Z") or char.isspace():
+            continue
+        folded.append(char)
+    return "".join(folded)
+
+
+def ngrams(text: str, size: int = 3) -> Set[str]:
+    """ Get the n-grams of a normalized text, short texts are their own gram """
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+# ---------- INDEX ---------- #
+
+class SearchIndex:
+    """ Name index of one catalog section in one locale """
+
+    def __init__(self, names: Dict[str, str]) -> None:
+        self.names: Dict[str, str] = names
+        self.keys: Dict[str, str] = {uuid: normalize(name) for uuid, name in names.items()}
+
+        # every 1-3 gram, so that queries of any length resolve through postings
+        self.postings: Dict[str, Set[str]] = {}
+        for uuid, key in self.keys.items():
+            for size in (1, 2, 3):
+                for gram in ngrams(key, size):
+                    self.postings.setdefault(gram, set()).add(uuid)
+
+        self.prefixes: List[Tuple[str, str]] = sorted((key, uuid) for uuid, key in self.keys.items())
+
+    def __rank(self, query: str, uuid: str) -> Tuple[int, int, str]:
+        key = self.keys[uuid]
+        if key == query:
+            order = 0
+        elif key.startswith(query):
+            order = 1
+        else:
+            order = 2
+        return (order, len(key), self.names[uuid])
+
+    def prefix(self, query: str) -> List[str]:
+        """ Get uuids whose name starts with query, in name order """
+        query = normalize(query)
+        start = bisect.bisect_left(self.prefixes, (query, ""))
+        ret = []
+        for key, uuid in self.prefixes[start:]:
+            if not key.startswith(query):
+                break
+            ret.append(uuid)
+        return ret
+
+    def search(self, query: str) -> List[str]:
+        """ Get uuids whose name contains query, best matches first """
+        query = normalize(query)
+        if not query:
+            return []
+
+        grams = ngrams(query)
+        candidates: Optional[Set[str]] = None
+        for gram in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+            posting = self.postings.get(gram, set())
+            candidates = posting if candidates is None else candidates & posting
+            if not candidates:
+                return []
+
+        found = [uuid for uuid in candidates if query in self.keys[uuid]]
+        return sorted(found, key=lambda uuid: self.__rank(query, uuid))
+
+    def closest(self, query: str, cutoff: float = 0.3) -> List[str]:
+        """ Get uuids ranked by trigram similarity, for misspelled names """
+        query = normalize(query)
+        grams = ngrams(query)
+        if not grams:
+            return []
+
+        scores: Dict[str, int] = {}
+        for gram in grams:
+            for uuid in self.postings.get(gram, ()):
+                scores[uuid] = scores.get(uuid, 0) + 1
+
+        ret = []
+        for uuid, shared in scores.items():
+            similarity = shared / len(grams | ngrams(self.keys[uuid]))
+            if similarity >= cutoff:
+                ret.append((-similarity, len(self.keys[uuid]), uuid))
+        return [uuid for _, _, uuid in sorted(ret)]
+
+
+    def similar(self, query: str, cutoff: float = 0.6) -> Optional[str]:
+        """ Get the uuid of the closest name like difflib.get_close_matches, names sharing no bigram are left out """
+        query = normalize(query)
+        if not query:
+            return None
+
+        candidates: Set[str] = set()
+        for gram in ngrams(query, 2):
+            candidates |= self.postings.get(gram, set())
+
+        keys: Dict[str, str] = {}
+        for uuid in sorted(candidates, key=lambda uuid: self.__rank(query, uuid)):
+            keys.setdefault(self.keys[uuid], uuid)
+        found = difflib.get_close_matches(query, keys, 1, cutoff)
+        return keys[found[0]] if found else None
+
+
+# ---------- CATALOG INDEXES ---------- #
+
+# sections searchable by name, "weapons" also covers gears like the /weapon command
+search_sections = {
+    "agents": ["agents"],
+    "bundles": ["bundles"],
+    "buddies": ["buddies"],
+    "playercards": ["playercards"],
+    "skins": ["skins"],
+    "sprays": ["sprays"],
+    "titles": ["titles"],
+    "weapons": ["weapons", "gears"],
+}
+
+__indexes: Dict[Tuple[int, str, str], SearchIndex] = {}
+__lock = threading.Lock()
+
+
+def get_index(section: str, locale: str, catalog: Catalog = None) -> SearchIndex:
+    """ Get the index of a section and locale for the current catalog generation """
+    catalog = catalog or get_catalog()
+    key = (catalog.generation, section, locale)
+
+    index = __indexes.get(key)
+    if index is None:
+        with __lock:
+            index = __indexes.get(key)
+            if index is None:
+                names = {}
+                for name in search_sections.get(section, [section]):
+                    for uuid, item in catalog.section(name).items():
+                        with_names = item.get("names")
+                        if with_names:
+                            names[uuid] = with_names[locale] or ""
+                index = SearchIndex(names)
+
+                # drop indexes of older generations
+                for old in [k for k in __indexes if k[0] != catalog.generation]:
+                    del __indexes[old]
+                __indexes[key] = index
+    return index
+
+
+def find(section: str, query: str, locale: str, default_language: str = "en-US") -> List[str]:
+    """ Find uuids by name, in the default language first and then the user's locale """
+    catalog = get_catalog()
+
+    # autocomplete choices pass the uuid itself
+    for name in search_sections.get(section, [section]):
+        if query in catalog.section(name):
+            return [query]
+
+    found = get_index(section, default_language, catalog).search(query)
+    if len(found) == 0 and locale != default_language:
+        found = get_index(section, locale, catalog).search(query)
+    return found
+
+
+def find_closest(section: str, query: str, locale: str) -> Optional[str]:
+    """ Find the uuid of a name, an exact or only match or else a close one like difflib.get_close_matches """
+    catalog = get_catalog()
+    if query in catalog.section(section):
+        return query
+
+    # unlike autocomplete, a loose match here would pick an unrelated item
+    index = get_index(section, locale, catalog)
+    found = index.search(query)
+    if len(found) == 1 or (len(found) > 1 and index.keys[found[0]] == normalize(query)):
+        return found[0]
+    return index.similar(query)
+
+
+def choices(section: str, current: str, locale: str, limit: int = 25) -> List[app_commands.Choice[str]]:
+    """ Build autocomplete choices, the value is the uuid of the item """
+    index = get_index(section, locale)
+
+    if len(normalize(current)) == 0:
+        found = index.prefix("")
+    else:
+        found = index.search(current) or index.closest(current)
+
+    ret = []
+    for uuid in found[:limit]:
+        name = index.names[uuid]
+        if name:
+            ret.append(app_commands.Choice(name=name[:100], value=uuid))
+    return ret
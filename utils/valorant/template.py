@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import string
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# ---------- TEMPLATE ---------- #
+
+class Template:
+    """ A localized format string, parsed once """
+
+    def __init__(self, source: str) -> None:
+        self.source: str = source
+        self.parts: List[Tuple[str, Optional[str], str, Optional[str]]] = list(string.Formatter().parse(source))
+
+        # plain `{name}` / `{name:spec}` fields render without str.format, anything else falls back to it
+        self.simple: bool = all(field is None or (field.isidentifier() and "{" not in spec) for _, field, spec, _ in self.parts)
+        self.fields: FrozenSet[str] = frozenset(self.__root(field) for _, field, _, _ in self.parts if field)
+
+    @staticmethod
+    def __root(field: str) -> str:
+        """ Get the argument name of a field like `name`, `name.attr` or `name[key]` """
+        for i, char in enumerate(field):
+            if char in ".[":
+                return field[:i]
+        return field
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """ Render with values, only the fields used by the template are looked up """
+        if not self.simple:
+            return self.source.format_map(values)
+
+        rendered = []
+        for literal, field, spec, conversion in self.parts:
+            rendered.append(literal)
+            if field is None:
+                continue
+            value = values[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            elif conversion == "a":
+                value = ascii(value)
+            rendered.append(format(value, spec))
+        return "".join(rendered)
+
+
+__templates: Dict[str, Template] = {}
+
+
+def get_template(source: str) -> Template:
+    """ Get the parsed template of a format string """
+    template = __templates.get(source)
+    if template is None:
+        template = Template(source)
+        # lang files can be reloaded, so stale sources are dropped instead of kept forever
+        if len(__templates) >= 4096:
+            __templates.clear()
+        __templates[source] = template
+    return template
+
+
+# ---------- LAZY FIELDS ---------- #
+
+class LazyFields(dict):
+    """ Format values computed on first use, memoized for every template rendered with them """
+
+    def __init__(self, **fields: Any) -> None:
+        super().__init__()
+        self.__fields: Dict[str, Any] = fields
+
+    def __missing__(self, key: str) -> Any:
+        value = self.__fields[key]
+        if callable(value):
+            value = value()
+        self[key] = value
+        return value
+
+    def resolve_all(self) -> LazyFields:
+        """ Compute every field, like passing them all to str.format """
+        for key in self.__fields:
+            self[key]
+        return self
+
+
+def render(source: Optional[str], fields: LazyFields) -> Optional[str]:
+    """ Render a format string with lazy fields, None stays None """
+    if source is None:
+        return None
+    return get_template(source).render(fields)
+
+
+def formatter(fields: LazyFields) -> Callable[[Optional[str]], Optional[str]]:
+    """ Get a render function bound to fields, for the `*_format` helpers of embeds """
+    return lambda source: render(source, fields)
+
+
+if __name__ == "__main__":
+    # micro-benchmark of the player templates of the career and match embeds,
+    # every field computed up front (the old keyword arguments) against lazy fields:
+    #   python -m utils.valorant.template
+    import timeit
+    import types
+
+    from .catalog import get_catalog
+    from .local import ResponseLanguage
+    from .useful import GetFormat
+
+    cache = get_catalog()
+    if not cache.section("agents") or not cache.section("competitive_tiers"):
+        raise SystemExit("Build the catalog first: python -m utils.valorant.catalog --fetch")
+
+    player = {
+        "name": "Player#0000", "rank": "", "rank_id": int(next(iter(cache["competitive_tiers"]))), "level": 100,
+        "agent": "", "agent_id": next(iter(cache["agents"])), "role": "",
+        "kills": 20, "deaths": 15, "assists": 5, "kd": 1.33, "kda": 1.67, "acs": 250, "eco_rating": 60, "damage": 3200, "adr": 150,
+        "headshots": 30, "bodyshots": 60, "legshots": 10, "hsrate": 30, "bsrate": 60, "lsrate": 10,
+        "firstblood": 3, "firstdeath": 2, "multikills": 1, "deathmatch": 1,
+    }
+    players = {"puuid": player}
+    bot = types.SimpleNamespace(emojis=[])
+    known = set(GetFormat.match_playerdata_fields(players, "puuid", "match_id", bot).resolve_all())
+
+    def strings(value):
+        if isinstance(value, dict):
+            for item in value.values():
+                yield from strings(item)
+        elif isinstance(value, str):
+            yield value
+
+    sources = []
+    for command in ("career", "match"):
+        for source in strings(ResponseLanguage(command, "en-US")):
+            template = get_template(source)
+            if template.fields and template.fields <= known:
+                sources.append(source)
+
+    def eager() -> None:
+        fields = GetFormat.match_playerdata_fields(players, "puuid", "match_id", bot).resolve_all()
+        for source in sources:
+            source.format(**fields)
+
+    def lazy() -> None:
+        fields = GetFormat.match_playerdata_fields(players, "puuid", "match_id", bot)
+        for source in sources:
+            render(source, fields)
+
+    number = 200
+    eager_time = timeit.timeit(eager, number=number)
+    lazy_time = timeit.timeit(lazy, number=number)
+    print(f"{len(sources)} player templates, {number} renders of each")
+    print(f"eager: {eager_time / number * 1000:.3f} ms/player")
+    print(f"lazy:  {lazy_time / number * 1000:.3f} ms/player ({eager_time / lazy_time:.1f}x)")
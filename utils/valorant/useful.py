@@ -3,8 +3,7 @@ from __future__ import annotations
 import contextlib
 from datetime import datetime, timezone, timedelta
 from turtle import title
-import dateutil.parser
-import json, os, io, concurrent.futures
+import json, os, io
 from PIL import Image, ImageDraw, ImageFont
 import matplotlib.colors, matplotlib.font_manager as fm
 from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
@@ -13,7 +12,12 @@ import uuid
 import discord
 
 import utils.config as Config
-from .resources import get_item_type, tiers as tiers_resources
+from .analytics import economy_series, heatmap
+from .catalog import get_catalog
+from .emojis import registry as emojis
+from .matches import match_store
+from .resources import get_item_type
+from .template import LazyFields, render
 from ..errors import ValorantBotError
 from ..locale_v2 import ValorantTranslator
 
@@ -172,19 +176,15 @@ class GetItems:
 
     def get_skin(uuid: str) -> Dict[str, Any]:
         """Get Skin data"""
-        try:
-
-            skin_data = JSON.read('cache')
-            skin = skin_data["skins"][uuid]
-        except KeyError:
+        skin = get_catalog().get_skin(uuid)
+        if skin is None:
             raise ValorantBotError('Some skin data is missing, plz use `/debug cache`')
         return skin
 
     def get_skin_price(uuid: str) -> str:
         """Get Skin price by skin uuid"""
 
-        data = JSON.read('cache')
-        price = data["prices"]
+        price = get_catalog().section("prices")
         try:
             cost = price[uuid]
         except:
@@ -194,7 +194,7 @@ class GetItems:
     def get_skin_tier_icon(skin: str) -> str:
         """Get Skin skin tier image"""
 
-        skindata = JSON.read('cache')
+        skindata = get_catalog()
         tier_uuid = skindata["skins"][skin]['tier']
         tier = skindata['tiers'][tier_uuid]["icon"]
         return tier
@@ -202,7 +202,7 @@ class GetItems:
     def get_spray(uuid: str) -> Dict[str, Any]:
         """Get Spray"""
 
-        data = JSON.read('cache')
+        data = get_catalog()
         spray = None
         with contextlib.suppress(Exception):
             spray = data["sprays"][uuid]
@@ -211,7 +211,7 @@ class GetItems:
     def get_title(uuid: str) -> Dict[str, Any]:
         """Get Title"""
 
-        data = JSON.read('cache')
+        data = get_catalog()
         title = None
         with contextlib.suppress(Exception):
             title = data["titles"][uuid]
@@ -220,7 +220,7 @@ class GetItems:
     def get_playercard(uuid: str) -> Dict[str, Any]:
         """Get Player card"""
 
-        data = JSON.read('cache')
+        data = get_catalog()
         title = None
         with contextlib.suppress(Exception):
             title = data["playercards"][uuid]
@@ -229,19 +229,13 @@ class GetItems:
     def get_buddie(uuid: str) -> Dict:
         """Get Buddie"""
 
-        data = JSON.read('cache')
-        title = None
-        with contextlib.suppress(Exception):
-            title = data["buddies"][uuid]
-        return title
+        return get_catalog().get_buddy(uuid)
 
     def get_skin_lvl_or_name(name: str, uuid: str) -> Dict[str, Any]:
         """Get Skin uuid by name"""
 
-        data = JSON.read('cache')
-        skin = None
-        with contextlib.suppress(Exception):
-            skin = data["skins"][uuid]
+        data = get_catalog()
+        skin = data.get_skin(uuid)
         with contextlib.suppress(Exception):
             if skin is None:
                 skin = [data["skins"][x] for x in data["skins"] if data["skins"][x]['name'] in name][0]
@@ -251,7 +245,7 @@ class GetItems:
         """ Get tier name by skin uuid """
 
         try:
-            data = JSON.read('cache')
+            data = get_catalog()
             uuid = data['skins'][skin_uuid]['tier']
             name = data['tiers'][uuid]['name']
         except KeyError:
@@ -263,7 +257,7 @@ class GetItems:
             locale = str(VLR_locale)
 
         try:
-            cache = JSON.read('cache')
+            cache = get_catalog()
             name = cache["titles"][title_uuid]["text"][locale] if cache["titles"][title_uuid]["text"]!=None else ""
 
             if is_block and len(name)>0:
@@ -275,7 +269,7 @@ class GetItems:
     def get_contract(uuid: str) -> Dict[str, Any]:
         """ Get contract by uuid """
 
-        data = JSON.read('cache')
+        data = get_catalog()
         contract = None
         with contextlib.suppress(Exception):
             contract = data["contracts"][uuid]
@@ -284,23 +278,14 @@ class GetItems:
     def get_bundle(uuid: str) -> Dict[str, Any]:
         """ Get bundle by uuid """
 
-        data = JSON.read('cache')
+        data = get_catalog()
         bundle = None
         with contextlib.suppress(Exception):
             bundle = data["bundles"][uuid]
         return bundle    
     
-    def get_current_event(date: datetime = datetime.now(timezone.utc)) -> List:
-        events = JSON.read("cache").get("events", {})
-
-        ret = []
-        for event in events.values():
-            start, end = dateutil.parser.parse(event["start"]), dateutil.parser.parse(event["end"])
-
-            if start <= date <= end:
-                ret.append(event["uuid"])
-
-        return ret
+    def get_current_event(date: datetime = None) -> List:
+        return get_catalog().get_current_events(date)
     
     def is_owns(entitlements: Dict, uuid: str, type_id: str) -> bool:
         for entitlement in entitlements[0].get("EntitlementsByTypes"):
@@ -363,99 +348,36 @@ class GetItems:
 
 class GetEmoji:
 
-    def tier(skin_uuid: str) -> discord.Emoji:
+    def tier(skin_uuid: str) -> str:
         """ Get tier emoji """
+        return emojis.get().skin_tier(skin_uuid)
 
-        data = JSON.read('cache')
-        emoji_list = JSON.read('emoji')
-        uuid = data['skins'][skin_uuid]['tier']
-        uuid = data['tiers'][uuid]['uuid']
-        emoji = emoji_list.get(tiers_resources[uuid]['emoji'], "")
-        return emoji
-
-    @classmethod
-    def tier_by_bot(cls, skin_uuid: str, bot: ValorantBot) -> discord.Emoji:
+    def tier_by_bot(skin_uuid: str, bot: ValorantBot) -> str:
         """ Get tier emoji from bot """
+        return emojis.get(bot).skin_tier(skin_uuid)
 
-        emoji = discord.utils.get(bot.emojis, name=GetItems.get_tier_name(skin_uuid) + 'Tier')
-        if emoji is None:
-            return cls.tier(skin_uuid)
-        return emoji
-
-    def point_by_bot(point: str, bot: ValorantBot) -> discord.Emoji:
+    def point_by_bot(point: str, bot: ValorantBot) -> Optional[str]:
         """ Get point emoji from bot"""
-        emoji_list = JSON.read("emoji")
-
-        emoji = discord.utils.get(bot.emojis, name=point)
-        if emoji is None:
-            return emoji_list.get(point)
-        return emoji
+        return emojis.get(bot).names.get(point)
     
-    def roundresult_by_bot(result: str, win: bool, bot: ValorantBot) -> discord.Emoji:
+    def roundresult_by_bot(result: str, win: bool, bot: ValorantBot) -> str:
         """ Get round result icon from bot"""
-        emoji_list = JSON.read("emoji")
-
-        if win:
-            name="Won"
-        else:
-            name="Lost"
-
-        if result == "Elimination":
-            name = result+name
-        elif result == "Defuse":
-            name = result+name
-        elif result == "Detonate":
-            name = result+name
-        elif result == "" or result=="Timeup":
-            name = "Timeup"+name
-
-        emoji = discord.utils.get(bot.emojis, name=name)
-        if emoji is None:
-            return emoji_list.get(name, "")
-        return emoji
+        return emojis.get(bot).round_result(result, win)
     
-    def agent_by_bot(agent_id: str, bot: ValorantBot) -> discord.Emoji:
+    def agent_by_bot(agent_id: str, bot: ValorantBot) -> Optional[str]:
         """ Get agent emoji from bot"""
-        agent = JSON.read("cache")["agents"]
-        emoji_list = JSON.read("emoji")
-
-        name = "Agent" + agent[agent_id]["names"]["en-US"].replace("/", "")
-
-        emoji = discord.utils.get(bot.emojis, name=name)
-        if emoji is None:
-            return emoji_list.get(name)
-        return emoji
+        return emojis.get(bot).agents.get(agent_id)
     
-    def role_by_bot(agent_id: str, bot: ValorantBot) -> discord.Emoji:
+    def role_by_bot(agent_id: str, bot: ValorantBot) -> Optional[str]:
         """ Get agent role from bot"""
-        agent = JSON.read("cache")["agents"]
-        emoji_list = JSON.read("emoji")
-
-        name = agent[agent_id]["role"]["names"]["en-US"]
-
-        emoji = discord.utils.get(bot.emojis, name=name)
-        if emoji is None:
-            return emoji_list.get(name)
-        return emoji
+        return emojis.get(bot).roles.get(agent_id)
     
-    def competitive_tier_by_bot(tier: int, bot: ValorantBot) -> discord.Emoji:
+    def competitive_tier_by_bot(tier: int, bot: ValorantBot) -> Optional[str]:
         """ Get agent emoji from bot"""
-        rank = JSON.read("cache")["competitive_tiers"]
-        emoji_list = JSON.read("emoji")
-
-        name = "Tier" + rank[str(tier)]["names"]["en-US"].replace(" ", "").capitalize()
-
-        emoji = discord.utils.get(bot.emojis, name=name)
-        if emoji is None:
-            return emoji_list.get(name)
-        return emoji
+        return emojis.get(bot).competitive_tiers.get(int(tier))
     
-    def get(name: str, bot: ValorantBot) -> discord.Emoji:
-        emoji_list = JSON.read("emoji")
-        emoji = discord.utils.get(bot.emojis, name=name)
-        if emoji is None:
-            return emoji_list.get(name)
-        return emoji
+    def get(name: str, bot: ValorantBot) -> Optional[str]:
+        return emojis.get(bot).names.get(name)
 
 
 
@@ -535,17 +457,22 @@ class GetFormat:
 
     # ---------- UTILS FOR MATCH EMBED ---------- #
 
-    def get_match_info(puuid: str, match_id: str, endpoint, response: Dict, locale: str = None) -> Dict:
+    def get_match_info(puuid: str, match_id: str, endpoint, response: Dict, locale: str = None, match_detail: Dict = None) -> Dict:
         # cache
-        import threading
-        cache = JSON.read("cache")
+        cache = get_catalog()
 
-        # match info
-        match_detail = endpoint.fetch_match_details(match_id)
+        # match info, unless it was fetched ahead
+        if match_detail==None:
+            match_detail = endpoint.fetch_match_details(match_id)
         if match_detail==None:
             raise ValorantBotError(response.get("NOT_FOUND"))
         match_info = {}
 
+        # numbers of every player and round at once, computed once per match
+        summary = match_store.summary(match_id, match_detail)
+        player_stats = summary["players"]
+        duel_lists = summary["duel_lists"]
+
         # detail
         is_played = False
         players = {}
@@ -622,9 +549,9 @@ class GetFormat:
                     "played_round": p["stats"]["roundsPlayed"],
                     "score": p["stats"]["score"],
 
-                    "kd": GetFormat.get_kdrate(p["stats"]["kills"], p["stats"]["deaths"]),
-                    "kda": GetFormat.get_kdarate(p["stats"]["kills"], p["stats"]["deaths"], p["stats"]["assists"]),
-                    "acs": round(float(p["stats"]["score"])/20.0),
+                    "kd": player_stats[p["subject"]]["kd"],
+                    "kda": player_stats[p["subject"]]["kda"],
+                    "acs": player_stats[p["subject"]]["acs"],
 
                     "team": p["teamId"],
                     "party": p["partyId"],
@@ -635,9 +562,9 @@ class GetFormat:
                     "agent": cache["agents"][p["characterId"]]["names"][locale],
                     "role": cache["agents"][p["characterId"]]["role"]["names"][locale],
 
-                    "firstblood": 0,
-                    "firstdeath": 0,
-                    "multikills": 0,
+                    "firstblood": player_stats[p["subject"]]["firstblood"],
+                    "firstdeath": player_stats[p["subject"]]["firstdeath"],
+                    "multikills": player_stats[p["subject"]]["multikills"],
 
                     "deathmatch": 0
                 }
@@ -654,18 +581,15 @@ class GetFormat:
                     player["ability"] = [ability["ability1Casts"], ability["ability2Casts"], ability["grenadeCasts"], ability["ultimateCasts"]],
                 
                 # damage
-                if p.get("roundDamage")!=None:
-                    for d in p.get("roundDamage"):
-                        if player.get("damage", None)==None:
-                            player["damage"] = {}
-                        if player["damage"].get(str(d["round"]), None)==None:
-                            player["damage"][str(d["round"])] = 0
-                        player["damage"][str(d["round"])] += d["damage"]
-                else:
-                    if player.get("damage")==None:
-                        player["damage"] = {}
-                    for i in range(len(match_detail["roundResults"])):
-                        player["damage"][str(i)] = 0
+                player["damage"] = summary["round_damage"][p["subject"]]
+
+                # eco rating, adr and shots
+                for key in ("eco_rating", "total_damage", "adr", "headshots", "bodyshots", "legshots", "shots", "hsrate", "bsrate", "lsrate"):
+                    if key in player_stats[p["subject"]]:
+                        player[key] = player_stats[p["subject"]][key]
+
+                # kill_list, killed_list, assist_list
+                player.update(duel_lists.get(p["subject"], {}))
 
                 players[p["subject"]] = player
 
@@ -674,7 +598,8 @@ class GetFormat:
         # round
         def set_round():
             raw_rounds = match_detail["roundResults"]
-            for r in raw_rounds:
+            team_economy = summary["team_economy"]
+            for i, r in enumerate(raw_rounds):
                 _round = {
                     "planter": r.get("bombPlanter", ""),
                     "defuser": r.get("bombDefuser", ""),
@@ -708,127 +633,12 @@ class GetFormat:
                         }
 
                 # stats
-                for stats in r.get("playerStats", []):
-                    teamid = players[stats["subject"]]["team"]
-
-                    # economy
-                    if _round["economy"].get(teamid, None)==None:
-                        _round["economy"][teamid] = {
-                            "loadout": stats["economy"]["loadoutValue"],
-                            "remain": stats["economy"]["remaining"],
-                            "spent": stats["economy"]["spent"]
-                        }
-                    else:
-                        _round["economy"][teamid]["loadout"] += stats["economy"]["loadoutValue"]
-                        _round["economy"][teamid]["remain"] += stats["economy"]["remaining"]
-                        _round["economy"][teamid]["spent"] += stats["economy"]["spent"]
-                    
-                    # stats
-                    if _round.get("stats", None)==None:
-                        _round["stats"] = {}
-                    _round["stats"][stats["subject"]] = {
-                        "kills": len(stats["kills"]),
-                        "score": stats["score"],
-                        "headshots": 0,
-                        "legshots": 0,
-                        "bodyshots": 0,
-                        "damage": 0
-                    }
-
-                    for d in stats.get("damage", []):
-                        _round["stats"][stats["subject"]]["headshots"] += d.get("headshots", 0)
-                        _round["stats"][stats["subject"]]["bodyshots"] += d.get("bodyshots", 0)
-                        _round["stats"][stats["subject"]]["legshots"] += d.get("legshots", 0)
-                        _round["stats"][stats["subject"]]["damage"] += d.get("damage", 0)
-                    
-                    # multikills (3kills+)
-                    if len(stats["kills"])>=3:
-                        players[stats["subject"]]["multikills"] += 1
+                _round["economy"].update(team_economy[i])
+                if summary["round_stats"][i] is not None:
+                    _round["stats"] = summary["round_stats"][i]
 
                 rounds.append(_round)
         
-        # eco rating
-        def calculate_eco_rating():
-            for t_puuid,p in players.items():
-                damage = 0
-                spent = 0
-                headshots = 0
-                bodyshots = 0
-                legshots = 0
-                eco_rating = 0
-
-                for i in range(len(rounds)):
-                    if rounds[i]["economy"].get("players")!=None:
-                        if rounds[i]["economy"]["players"].get(t_puuid, {}).get("spent", None)==None:
-                            spent += 0
-                        else:
-                            spent += rounds[i]["economy"]["players"][t_puuid]["spent"]
-
-                        damage += rounds[i]["stats"][t_puuid]["damage"]
-                        headshots += rounds[i]["stats"][t_puuid]["headshots"]
-                        bodyshots += rounds[i]["stats"][t_puuid]["bodyshots"]
-                        legshots += rounds[i]["stats"][t_puuid]["legshots"]
-
-                        if spent == 0:
-                            eco_rating = round(damage*1000/1)
-                        else:
-                            eco_rating = round(damage*1000/spent)
-
-                    players[t_puuid]["eco_rating"] = eco_rating
-                    players[t_puuid]["total_damage"] = damage
-                    players[t_puuid]["adr"] = round(damage / len(rounds), 1)
-                    players[t_puuid]["headshots"] = headshots
-                    players[t_puuid]["bodyshots"] = bodyshots
-                    players[t_puuid]["legshots"] = legshots
-                    players[t_puuid]["shots"] = headshots + bodyshots + legshots
-                    if (headshots + bodyshots + legshots)==0:
-                        players[t_puuid]["hsrate"] = 0.0
-                        players[t_puuid]["bsrate"] = 0.0
-                        players[t_puuid]["lsrate"] = 0.0
-                    else:
-                        players[t_puuid]["hsrate"] = round(headshots / (headshots + bodyshots + legshots) * 100, 1)
-                        players[t_puuid]["bsrate"] = round(bodyshots / (headshots + bodyshots + legshots) * 100, 1)
-                        players[t_puuid]["lsrate"] = round(legshots / (headshots + bodyshots + legshots) * 100, 1)
-        
-        # kills
-        def set_kill_list():
-            raw_killlist = match_detail["kills"]
-            roundtemp = -1
-            for k in raw_killlist:
-                if players[k["killer"]].get("kill_list", None) == None:
-                    players[k["killer"]]["kill_list"] = {}
-                if players[k["victim"]].get("killed_list", None) == None:
-                    players[k["victim"]]["killed_list"] = {}
-                
-                # kill
-                if players[k["killer"]]["kill_list"].get(k["victim"], None)==None:
-                    players[k["killer"]]["kill_list"][k["victim"]] = 1
-                else:
-                    players[k["killer"]]["kill_list"][k["victim"]] += 1
-                
-                # killed by
-                if players[k["victim"]]["killed_list"].get(k["killer"], None)==None:
-                    players[k["victim"]]["killed_list"][k["killer"]] = 1
-                else:
-                    players[k["victim"]]["killed_list"][k["killer"]] += 1
-                
-                # assist to
-                for a in k["assistants"]:
-                    if players[a].get("assist_list", None)==None:
-                        players[a]["assist_list"] = {}
-                    
-                    if players[a]["assist_list"].get(k["victim"], None)==None:
-                        players[a]["assist_list"][k["victim"]] = 1
-                    else:
-                        players[a]["assist_list"][k["victim"]] += 1
-                
-                # firstblood / firstdeath
-                if roundtemp!=k["round"]:
-                    players[k["victim"]]["firstdeath"] += 1
-                    players[k["killer"]]["firstblood"] += 1
-                    roundtemp=k["round"]
-
-
         # teams
         def set_teams():
             for t in match_detail["teams"]:
@@ -989,68 +799,76 @@ class GetFormat:
                 prev_player = t_puuid
                 i = i + 1
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            executor.submit(set_match_detail)
-            executor.submit(set_players)
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            executor.submit(set_round)
-            executor.submit(set_teams)
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            executor.submit(calculate_eco_rating)
-            executor.submit(calculate_points_and_results)
-            executor.submit(set_kill_list)
+        # the numbers are ready, the rest only formats them
+        set_match_detail()
+        set_players()
+        set_round()
+        set_teams()
+        calculate_points_and_results()
+
+        # economy graph and duel heatmap of the two teams
+        teamA, teamB = match_info["teamA"], match_info["teamB"]
+        if teamA and teamB:
+            match_info["economy"] = economy_series(summary, teamA, teamB)
+            match_info["heatmap"] = heatmap(summary, teams[teamA]["players"], teams[teamB]["players"])
 
         res = {"match_info": match_info, "players": players, "rounds": rounds, "teams": teams}
         return res
 
-    def format_match_playerdata(format: str, players: Dict, puuid: str, match_id: str, bot: ValorantBot):
-        if format==None:
-            return None
-        cache = JSON.read("cache")
-        return format.format(
-            tracker=GetFormat.get_trackergg_link(match_id),
+    def match_playerdata_fields(players: Dict, puuid: str, match_id: str, bot: ValorantBot) -> LazyFields:
+        """ Format fields of a player of a match, lookups and the stats of rounds with economies only run when a template uses them """
+        cache = get_catalog()
+        player = players[puuid]
+        return LazyFields(
+            tracker=lambda: GetFormat.get_trackergg_link(match_id),
 
             puuid=puuid,
-            name=players[puuid]["name"],
-            username=players[puuid]["name"].split("#", 1)[0],
-            tagline=players[puuid]["name"].split("#", 1)[1],
-            rank=players[puuid]["rank"],
-            rank_emoji=GetEmoji.competitive_tier_by_bot(players[puuid]["rank_id"], bot),
-            level=players[puuid]["level"],
-            agent=players[puuid]["agent"],
-            agent_en=cache["agents"][players[puuid]["agent_id"]]["names"]["en-US"],
-            agent_en_capital=cache["agents"][players[puuid]["agent_id"]]["names"]["en-US"].upper(),
-            agent_emoji=GetEmoji.agent_by_bot(players[puuid]["agent_id"], bot),
-            role=players[puuid]["role"],
-            role_en=cache["agents"][players[puuid]["agent_id"]]["role"]["names"]["en-US"],
-            role_en_capital=cache["agents"][players[puuid]["agent_id"]]["role"]["names"]["en-US"].upper(),
-            role_emoji=GetEmoji.role_by_bot(players[puuid]["agent_id"], bot),
-            kills=players[puuid]["kills"],
-            deaths=players[puuid]["deaths"],
-            assists=players[puuid]["assists"],
-            kd=players[puuid]["kd"],
-            kda=players[puuid]["kda"],
-            acs=players[puuid]["acs"],
-
-            eco_rating=players[puuid]["eco_rating"],
-            damage=players[puuid]["damage"],
-            adr=players[puuid]["adr"],
+            name=player["name"],
+            username=lambda: player["name"].split("#", 1)[0],
+            tagline=lambda: player["name"].split("#", 1)[1],
+            rank=player["rank"],
+            rank_emoji=lambda: GetEmoji.competitive_tier_by_bot(player["rank_id"], bot),
+            level=player["level"],
+            agent=player["agent"],
+            agent_en=lambda: cache["agents"][player["agent_id"]]["names"]["en-US"],
+            agent_en_capital=lambda: cache["agents"][player["agent_id"]]["names"]["en-US"].upper(),
+            agent_emoji=lambda: GetEmoji.agent_by_bot(player["agent_id"], bot),
+            role=player["role"],
+            role_en=lambda: cache["agents"][player["agent_id"]]["role"]["names"]["en-US"],
+            role_en_capital=lambda: cache["agents"][player["agent_id"]]["role"]["names"]["en-US"].upper(),
+            role_emoji=lambda: GetEmoji.role_by_bot(player["agent_id"], bot),
+            kills=player["kills"],
+            deaths=player["deaths"],
+            assists=player["assists"],
+            kd=player["kd"],
+            kda=player["kda"],
+            acs=player["acs"],
+
+            # only set when the match has economies
+            eco_rating=lambda: player["eco_rating"],
+            damage=player["damage"],
+            adr=lambda: player["adr"],
             
-            headshots=players[puuid]["headshots"],
-            bodyshots=players[puuid]["bodyshots"],
-            legshots=players[puuid]["legshots"],
-            hsrate=players[puuid]["hsrate"],
-            bsrate=players[puuid]["bsrate"],
-            lsrate=players[puuid]["lsrate"],
-
-            firstblood=players[puuid]["firstblood"],
-            firstdeath=players[puuid]["firstdeath"],
-            multikills=players[puuid]["multikills"],
-            deathmatch=players[puuid]["deathmatch"]
+            headshots=lambda: player["headshots"],
+            bodyshots=lambda: player["bodyshots"],
+            legshots=lambda: player["legshots"],
+            hsrate=lambda: player["hsrate"],
+            bsrate=lambda: player["bsrate"],
+            lsrate=lambda: player["lsrate"],
+
+            firstblood=player["firstblood"],
+            firstdeath=player["firstdeath"],
+            multikills=player["multikills"],
+            deathmatch=player["deathmatch"]
         )
 
+    def format_match_playerdata(format: str, players: Dict, puuid: str, match_id: str, bot: ValorantBot, fields: LazyFields = None):
+        if format==None:
+            return None
+        if fields is None:
+            fields = GetFormat.match_playerdata_fields(players, puuid, match_id, bot)
+        return render(format, fields)
+
 
     # ---------- UTILS FOR MISSION EMBED ---------- #
 
@@ -1069,7 +887,7 @@ class GetFormat:
             weekly_end = ''
 
         def get_mission_by_id(ID) -> Optional[str]:
-            data = JSON.read('cache')
+            data = get_catalog()
             mission = data['missions'][ID]
             return mission
 
@@ -1137,49 +955,49 @@ class GetFormat:
         """Get item battle pass by type and uuid"""
 
         if type == 'Currency':
-            data = JSON.read('cache')
+            data = get_catalog()
             name = data['currencies'][uuid]['names'][locale]
             icon = data['currencies'][uuid]['icon']
             item_type = response.get('POINT', 'Point')
             return {"success": True, "data": {'type': item_type, 'name': '10 ' + name, 'icon': icon}}
 
         elif type == 'PlayerCard':
-            data = JSON.read('cache')
+            data = get_catalog()
             name = data['playercards'][uuid]['names'][locale]
             icon = data['playercards'][uuid]['icon']['wide']
             item_type = response.get('PLAYER_CARD', 'Player Card')
             return {"success": True, "data": {'type': item_type, 'name': name, 'icon': icon}}
 
         elif type == 'Title':
-            data = JSON.read('cache')
+            data = get_catalog()
             name = data['titles'][uuid]['names'][locale]
             icon = GetItems.get_title_icon()
             item_type = response.get('PLAYER_TITLE', 'Title')
             return {"success": True, "data": {'type': item_type, 'name': name, 'icon': icon}}
 
         elif type == 'Spray':
-            data = JSON.read('cache')
+            data = get_catalog()
             name = data['sprays'][uuid]['names'][locale]
             icon = data['sprays'][uuid]['icon']
             item_type = response.get('SPRAY', 'Spray')
             return {"success": True, "data": {'type': item_type, 'name': name, 'icon': icon}}
 
         elif type == 'EquippableSkinLevel':
-            data = JSON.read('cache')
+            data = get_catalog()
             name = data['skins'][uuid]['names'][locale]
             icon = data['skins'][uuid]['icon']
             item_type = response.get('SKIN', 'Skin')
             return {"success": True, "data": {'type': item_type, 'name': name, 'icon': icon}}
 
         elif type == 'EquippableCharmLevel':
-            data = JSON.read('cache')
+            data = get_catalog()
             name = data['buddies'][uuid]['names'][locale]
             icon = data['buddies'][uuid]['icon']
             item_type = response.get('BUDDY', 'Buddie')
             return {"success": True, "data": {'type': item_type, 'name': name, 'icon': icon}}
         
         elif type== 'Character':
-            data = JSON.read('cache')
+            data = get_catalog()
             name = data['agents'][uuid]['names'][locale]
             icon = data['agents'][uuid]['portrait']
             item_type = response.get('CHARACTER', 'Character')
@@ -1249,7 +1067,7 @@ class GetFormat:
 
     def get_competitive_tier_name(tier: int, locale: str = None) -> str:
         """Get competitive tier name"""
-        ranks = JSON.read('cache')
+        ranks = get_catalog()
         if locale==None:
             locale = str(VLR_locale)
         return ranks['competitive_tiers'][str(tier)]['names'][locale]
@@ -1299,11 +1117,7 @@ class GetFormat:
 
     def get_mapuuid_from_mapid(mapid: str) -> str:
         """Get a map uuid from MapID"""
-        maps = JSON.read('cache')['maps']
-        
-        for key,map in maps.items():
-            if map['mapId'] == mapid:
-                return key
+        return get_catalog().get_map_uuid(mapid)
     
     def get_uuid_from_ceremony_id(ceremony: str, only_ingame: bool = True) -> str:
         if ceremony=="CeremonyDefault": # default
@@ -1329,7 +1143,7 @@ class GetFormat:
     @classmethod
     def contract_format(cls, data: Dict, contract_uuid: str, response: Dict, locale: str) -> Dict[str, Any]:
         data = data['Contracts']
-        cache = JSON.read("cache")
+        cache = get_catalog()
 
         tiers = 0
         ret = []
@@ -1378,7 +1192,7 @@ class GetFormat:
         """ Get battle pass format """
 
         data = data['Contracts']
-        contracts = JSON.read('cache')
+        contracts = get_catalog()
         # data_contracts['contracts'].pop('version')
 
         season_id = season['id']
@@ -1427,7 +1241,7 @@ class GetFormat:
         """ Get battle pass format """
 
         data = data['Contracts']
-        contracts = JSON.read('cache')
+        contracts = get_catalog()
         # data_contracts['contracts'].pop('version')
 
         tiers = 0
@@ -1508,6 +1322,7 @@ class GetImage:
                 list[family][style] = {"family": family, "style": style, "path": font}
         
         JSON.save("fonts", list)
+        Config.settings.load()  # font paths of the config are resolved against this list
 
     def find_font(family: str, style: str = "Regular") -> str:
         fonts = JSON.read("fonts")
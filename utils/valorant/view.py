@@ -19,6 +19,10 @@ from utils.valorant import endpoint
 from utils.valorant.embed import Embed
 
 from utils.valorant.endpoint import API_ENDPOINT
+from . import pipeline
+from .assets import require_image
+from .catalog import get_catalog
+from .local import ResponseLanguage
 from .resources import get_item_type
 # Local
 from .useful import GetFormat, format_relative, GetEmoji, GetItems, GetImage, JSON, load_file
@@ -48,30 +52,25 @@ class share_button(ui.View):
         await self.interaction.edit_original_response(content='\u200b', embed=None, view=None)
 
 
-class NotifyView(discord.ui.View):
-    def __init__(self, user_id: int, uuid: str, name: str, response: Dict) -> None:
-        self.user_id = user_id
+class RemoveNotifyButton(ui.DynamicItem[ui.Button], template=r"notify:remove:(?P<user_id>[0-9]+):(?P<uuid>[0-9a-f-]+)"):
+    """ The remove button of a skin notification, its custom_id keeps it working after a restart or when a notifier worker sent it """
+    
+    def __init__(self, user_id: int, uuid: str, label: str = 'Remove Notify', disabled: bool = False) -> None:
+        self.user_id = int(user_id)
         self.uuid = uuid
-        self.name = name
-        self.response = response
-        super().__init__(timeout=600)
-        self.remove_notify.label = response.get('REMOVE_NOTIFY')
+        super().__init__(ui.Button(label=label, emoji='✖️', style=ButtonStyle.red, disabled=disabled, custom_id=f"notify:remove:{self.user_id}:{uuid}"))
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: Interaction, item: ui.Button, match) -> RemoveNotifyButton:
+        return cls(int(match["user_id"]), match["uuid"], item.label)
     
     async def interaction_check(self, interaction: Interaction) -> bool:
-        if interaction.user.id == int(self.user_id):
+        if interaction.user.id == self.user_id:
             return True
         await interaction.response.send_message('This pagination menu cannot be controlled by you, sorry!', ephemeral=True)
         return False
     
-    async def on_timeout(self) -> None:
-        """ Called when the view times out """
-        
-        with contextlib.suppress(Exception):
-            self.remve_notify.disabled = True
-            await self.message.edit_original_message(view=self)
-    
-    @discord.ui.button(label='Remove Notify', emoji='✖️', style=ButtonStyle.red)
-    async def remove_notify(self, interaction: Interaction, button: ui.Button):
+    async def callback(self, interaction: Interaction) -> None:
         data = JSON.read('notifys')
         
         for i in range(len(data)):
@@ -81,11 +80,25 @@ class NotifyView(discord.ui.View):
         
         JSON.save('notifys', data)
         
-        self.remove_notify.disabled = True
-        await interaction.response.edit_message(view=self)
+        view = ui.View(timeout=None)
+        view.add_item(RemoveNotifyButton(self.user_id, self.uuid, self.item.label, disabled=True))
+        await interaction.response.edit_message(view=view)
         
-        removed_notify = self.response.get('REMOVED_NOTIFY')
-        await interaction.followup.send(removed_notify.format(skin=self.name), ephemeral=True)
+        response = ResponseLanguage('notify_add', interaction.locale)
+        name = GetItems.get_skin(self.uuid)['names'][str(VLR_locale)]
+        removed_notify = response.get('REMOVED_NOTIFY')
+        await interaction.followup.send(removed_notify.format(skin=name), ephemeral=True)
+
+
+class NotifyView(discord.ui.View):
+    def __init__(self, user_id: int, uuid: str, name: str, response: Dict) -> None:
+        self.user_id = user_id
+        self.uuid = uuid
+        self.name = name
+        self.response = response
+        # clicks are handled by RemoveNotifyButton, registered with the bot, whichever process sent the message
+        super().__init__(timeout=None)
+        self.add_item(RemoveNotifyButton(user_id, uuid, response.get('REMOVE_NOTIFY')))
 
 
 class _NotifyListButton(ui.Button):
@@ -121,7 +134,7 @@ class NotifyViewList(ui.View):
         self.interaction: Interaction = interaction
         self.response = response
         self.bot: ValorantBot = getattr(interaction, "client", interaction._state._get_client())
-        self.default_language = JSON.read("config", dir="config").get("default-language", "en-US")
+        self.default_language = Config.LoadConfig().get("default-language", "en-US")
         super().__init__(timeout=600)
     
     async def on_timeout(self) -> None:
@@ -381,10 +394,10 @@ class BaseBundle(ui.View):
             self.add_item(self.back_button)
             self.add_item(self.next_button)
     
-    def base_embed(self, title: str, description: str, icon: str, color: int = GetColor("items")) -> discord.Embed:
+    def base_embed(self, title: str, description: str, icon: str, color: int = None) -> discord.Embed:
         """ Base embed for the view """
         
-        embed = discord.Embed(title=title, description=description, color=color)
+        embed = discord.Embed(title=title, description=description, color=color if color is not None else GetColor("items"))
         embed.set_thumbnail(url=icon)
         return embed
     
@@ -653,8 +666,8 @@ class BaseAgent(ui.View):
 
     def build_file(self, agent: Dict) -> discord.File:
         # agent image
-        self.endpoint.download(agent['portrait'], "resources/temp/agent_portrait.png")
-        self.endpoint.download(agent["background"], "resources/temp/agent_background.png")
+        portrait = require_image(agent['portrait'])
+        text = require_image(agent["background"])
 
         # background
         color1 = GetImage.convert_color(agent['color'][0])
@@ -677,7 +690,6 @@ class BaseAgent(ui.View):
         background = Image.fromarray(np.uint8(array))
 
         # text
-        text = Image.open("resources/temp/agent_background.png")
         text = text.resize((int(text.width * 1.65), int(text.height * 1.65)))
         mask = text.copy()
         text.putalpha(40)
@@ -686,7 +698,6 @@ class BaseAgent(ui.View):
         background.paste(watermark, (int(-background.width*3/8 + watermark.width/2), int(-watermark.height/2 + background.height/2)), watermark)
 
         # agent
-        portrait = Image.open("resources/temp/agent_portrait.png")
         ratio = background.height / portrait.height
         portrait = portrait.resize((int(portrait.width*ratio), int(portrait.height*ratio)))
         background.paste(portrait, (int(-portrait.width/2 + background.width/2), 0), portrait)
@@ -700,15 +711,13 @@ class BaseAgent(ui.View):
             self.select_agent.add_option(label=agent['names'][self.language], value=agent["uuid"])
     
     def remove_cache(self) -> None:
-        if os.path.isfile(f"resources/temp/agent_background.png"): os.remove(f"resources/temp/agent_background.png")
-        if os.path.isfile(f"resources/temp/agent_portrait.png"): os.remove(f"resources/temp/agent_portrait.png")
         if os.path.isfile(f"resources/temp/agent_image.png"): os.remove(f"resources/temp/agent_image.png")
 
     @ui.select(placeholder='Select an agent:')
     async def select_agent(self, interaction: Interaction, select: ui.Select):
         #self.clear_items()
         try:
-            self.build_embeds(select.values[0], self.response)
+            await pipeline.run_blocking(self.build_embeds, select.values[0], self.response)
             self.remove_cache()
             await interaction.response.edit_message(embeds=self.embeds, view=self, attachments=[self.file])
         except Exception as e:
@@ -724,7 +733,7 @@ class BaseAgent(ui.View):
         """ Starts the agent view """
         
         if len(self.entries) == 1:
-            self.build_embeds(self.entries[0]["uuid"], self.response)
+            await pipeline.run_blocking(self.build_embeds, self.entries[0]["uuid"], self.response)
             self.remove_cache()
             return await self.interaction.followup.send(embeds=self.embeds, view=self, file=self.file, ephemeral=self.is_private_message)
         elif len(self.entries) != 0:
@@ -1020,10 +1029,10 @@ class BaseCollection(ui.View):
             self.add_item(self.back_button)
             self.add_item(self.next_button)
     
-    def base_embed(self, title: str, description: str, icon: str, color: int = GetColor("items")) -> discord.Embed:
+    def base_embed(self, title: str, description: str, icon: str, color: int = None) -> discord.Embed:
         """ Base embed for the view """
         
-        embed = discord.Embed(title=title, description=description, color=color)
+        embed = discord.Embed(title=title, description=description, color=color if color is not None else GetColor("items"))
         embed.set_thumbnail(url=icon)
         return embed
     
@@ -1034,8 +1043,7 @@ class BaseCollection(ui.View):
         embeds = []
         lang = self.response
 
-        cache = JSON.read('cache')
-        conv = JSON.read('conv')
+        cache = get_catalog()
 
         # Main
         embeds.append(
@@ -1108,7 +1116,7 @@ class BaseCollection(ui.View):
 
             for item in self.entries.get("Guns", []):
                 if item["ID"]==weapon_uuid:
-                    skin_uuid = conv["skins"][item["SkinID"]]
+                    skin_uuid = cache.skin_index[item["SkinID"]]
                     chroma_uuid = item["ChromaID"]
 
                     gun_embed = discord.Embed(
@@ -1132,7 +1140,7 @@ class BaseCollection(ui.View):
                     )
 
                     if item.get("CharmID")!=None:
-                        buddy_uuid = conv["buddies"][item["CharmID"]]
+                        buddy_uuid = cache.buddy_index[item["CharmID"]]
                         gun_embed.set_thumbnail(url=cache["buddies"][buddy_uuid]["icon"])
                         gun_embed.description = cache["buddies"][buddy_uuid]["names"][self.language]
 
@@ -1227,7 +1235,7 @@ class BaseSkin(ui.View):
         
         embeds = []
         uuid = selected
-        skin = JSON.read("cache")["skins"][uuid]
+        skin = get_catalog()["skins"][uuid]
 
         own, dont_own = response.get("OWN"), response.get("DONT_OWN")
 
@@ -1244,13 +1252,13 @@ class BaseSkin(ui.View):
 
         # skin embed
         # data
-        levels = list(skin["levels"].values())
+        levels = [dict(level) for level in skin["levels"].values()]
         for i in range(len(levels)):
             levels[i]["icon"] = levels[0]["icon"]
             if i!=0:
                 levels[i]["price"] = 10
         
-        chromas = list(skin["chromas"].values())
+        chromas = [dict(chroma) for chroma in skin["chromas"].values()]
         for i in range(len(chromas)):
             chromas[i]["price"] = 15
 
@@ -1331,7 +1339,7 @@ class BaseSpray(ui.View):
         
         embeds = []
         uuid = selected
-        spray = JSON.read("cache")["sprays"][uuid]
+        spray = get_catalog()["sprays"][uuid]
 
         own, dont_own = response.get("OWN"), response.get("DONT_OWN")
 
@@ -1404,7 +1412,7 @@ class BaseCard(ui.View):
         
         embeds = []
         uuid = selected
-        card = JSON.read("cache")["playercards"][uuid]
+        card = get_catalog()["playercards"][uuid]
 
         own, dont_own = response.get("OWN"), response.get("DONT_OWN")
 
@@ -1481,7 +1489,7 @@ class BaseBuddy(ui.View):
         
         embeds = []
         uuid = selected
-        card = JSON.read("cache")["buddies"][uuid]
+        card = get_catalog()["buddies"][uuid]
 
         own, dont_own = response.get("OWN"), response.get("DONT_OWN")
 
@@ -1554,7 +1562,7 @@ class BaseTitle(ui.View):
         
         embeds = []
         uuid = selected
-        card = JSON.read("cache")["titles"][uuid]
+        card = get_catalog()["titles"][uuid]
 
         own, dont_own = response.get("OWN"), response.get("DONT_OWN")
 
@@ -1630,7 +1638,7 @@ class BaseContract(ui.View):
         """ Builds the agent embeds """
         
         self.agent_uuid = selected_agent
-        cache = JSON.read("cache")
+        cache = get_catalog()
         embeds = []
 
         for contract in cache["contracts"].values():
@@ -1883,9 +1891,6 @@ class BaseRank(ui.View):
         embeds.append(embed)
         
         file = self.build_file(current_season.get(season_id, {}))
-        if os.path.isfile(f"resources/temp/triangle.png"): os.remove(f"resources/temp/triangle.png")
-        if os.path.isfile(f"resources/temp/triangle_down.png"): os.remove(f"resources/temp/triangle_down.png")
-        if os.path.isfile(f"resources/temp/border.png"): os.remove(f"resources/temp/border.png")
         
         self.embeds = embeds
         self.file = file
@@ -1952,8 +1957,7 @@ class BaseRank(ui.View):
         wins = current_mmr.get("NumberOfWins", 0)
         
         border = GetFormat.get_act_rank_border_level(wins)
-        self.endpoint.download(GetItems.get_act_rank_border(border), "resources/temp/border.png")
-        base = Image.open("resources/temp/border.png")
+        base = require_image(GetItems.get_act_rank_border(border))
 
         wins_by_rank = [0] * len(self.cache.get("competitive_tiers", {}))
         for rank, wins in current_mmr.get("WinsByTier", {}).items():
@@ -1966,17 +1970,17 @@ class BaseRank(ui.View):
             wins = wins_by_rank[rank]
 
             if wins > 0:
-                self.endpoint.download(self.cache.get("competitive_tiers", {}).get(str(rank), {}).get("triangle"), "resources/temp/triangle.png")
-                self.endpoint.download(self.cache.get("competitive_tiers", {}).get(str(rank), {}).get("triangle_down"), "resources/temp/triangle_down.png")
+                triangle_up = require_image(self.cache.get("competitive_tiers", {}).get(str(rank), {}).get("triangle"))
+                triangle_down = require_image(self.cache.get("competitive_tiers", {}).get(str(rank), {}).get("triangle_down"))
 
                 for j in range(wins):
                     if rendered_tier>=49:
                         break
 
                     if triangle_pos[rendered_tier]["angle"]=="up":
-                        triangle = Image.open("resources/temp/triangle.png")
+                        triangle = triangle_up
                     else:
-                        triangle = Image.open("resources/temp/triangle_down.png")
+                        triangle = triangle_down
                     triangle = triangle.resize(size=(int(triangle.width * 0.35), int(triangle.height * 0.35)), resample=Image.ANTIALIAS)
 
                     base.paste(triangle, (int(triangle_pos[rendered_tier]["x"] + base.width/2 - triangle.width/2), int(triangle_pos[rendered_tier]["y"] + base.height/2 - triangle.height/2)), triangle)
@@ -1992,7 +1996,7 @@ class BaseRank(ui.View):
     @ui.select(placeholder='Select a season:')
     async def select_season(self, interaction: Interaction, select: ui.Select):
         try:
-            self.build_embeds(select.values[0])
+            await pipeline.run_blocking(self.build_embeds, select.values[0])
             await interaction.response.edit_message(embeds=self.embeds, view=self, attachments=[self.file])
         except Exception as e:
             print(e)
@@ -2013,7 +2017,7 @@ class BaseRank(ui.View):
             current_season = self.endpoint.__get_live_season()
 
         self.add_item(self.select_season)
-        self.build_embeds(current_season)
+        await pipeline.run_blocking(self.build_embeds, current_season)
         self.build_select()
         placeholder = self.response.get('DROPDOWN_CHOICE_TITLE')
         self.select_season.placeholder = placeholder